@@ -1,25 +1,46 @@
+import argparse
+import os
+import sys
+from itertools import count
 from random import seed, random
-from typing import List
 
-seed(42)
+# The packing algorithms live next to the online algorithm exercises
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "..", "test-6", "online-algoritmer"))
+
+from bin_packing import first_fit_compact
+from bounded_packing import BoundedSpacePacker, FileSink
 
-values = [random() for _ in range(50)]
-containers:List[List[float]] = []
+parser = argparse.ArgumentParser(description="First fit packing of random items")
+parser.add_argument("--items", type=int, default=50,
+                    help="number of items, 0 for an endless stream")
+parser.add_argument("--open-bins", type=int, default=None, metavar="K",
+                    help="keep at most K bins open and write closed bins out")
+parser.add_argument("--close-rule", choices=["oldest", "fullest"], default="oldest")
+parser.add_argument("--output", default=None,
+                    help="file for closed bins (default: standard output)")
+args = parser.parse_args()
 
-for input in values:
-        x = 0
-        while x < len(containers):
-            container = containers[x]
-            if sum(container) + input <= 1:
-                container.append(input)
-                break
-            x += 1
-        else:
-            containers.append([input])
+seed(42)
 
+if args.open_bins is None:
+    values = [random() for _ in range(args.items)]
+    # Pack in units of 10^-9 so the capacity checks are exact
+    result = first_fit_compact(values, 1, scale=10**9)
 
-print(len(containers))
-print("All heights: ")
-print([sum(inner) for inner in containers])
+    print(result.num_bins)
+    print("All heights: ")
+    print([sum(values[i] for i in result.items_in(b)) for b in range(result.num_bins)])
+else:
+    # Bounded-space mode: items are generated lazily and bins are written
+    # out as they close, so the stream may run forever
+    n = count() if args.items == 0 else range(args.items)
+    values = (random() for _ in n)
 
+    with FileSink(args.output) as sink:
+        packer = BoundedSpacePacker(1, args.open_bins, sink,
+                                    close_rule=args.close_rule)
+        packer.extend(values)
 
+    print(f"{packer.num_bins} bins for {packer.num_items} items",
+          file=sys.stderr)
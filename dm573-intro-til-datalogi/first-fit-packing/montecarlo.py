@@ -0,0 +1,216 @@
+"""
+Monte Carlo estimate of the performance ratio of the packing algorithms.
+
+Random instances are drawn from several item distributions, packed by
+every policy, and compared against a lower bound on the optimal number
+of bins. Instances are generated in worker processes with independent
+NumPy random streams, and each worker only sends back running
+statistics, so the number of instances is limited by time, not memory.
+
+Example:
+    python montecarlo.py --instances 100000 --items 1000 --workers 8
+"""
+
+import argparse
+import math
+import os
+import sys
+from multiprocessing import Pool
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "..", "test-6", "online-algoritmer"))
+
+from optimal_packing import lower_bound
+from packers import (BestFitPacker, FirstFitDecreasingPacker, FirstFitPacker,
+                     HarmonicPacker, NextFitPacker, WorstFitPacker)
+
+POLICIES = {
+    "next-fit": NextFitPacker,
+    "first-fit": FirstFitPacker,
+    "best-fit": BestFitPacker,
+    "worst-fit": WorstFitPacker,
+    "harmonic": HarmonicPacker,
+    "first-fit-decreasing": FirstFitDecreasingPacker,
+}
+
+
+def uniform_items(rng, n):
+    """Item sizes uniform on (0, 1]."""
+    return 1.0 - rng.random(n)
+
+
+def small_items(rng, n):
+    """Mostly small items: 90% uniform on (0, 0.2], 10% uniform on (0, 1]."""
+    sizes = 1.0 - rng.random(n)
+    small = rng.random(n) < 0.9
+    sizes[small] *= 0.2
+    return sizes
+
+
+def adversarial_items(rng, n):
+    """
+    Mixture built around the classic First Fit worst case.
+
+    Items are just above 1/7, 1/3 or 1/2 of the capacity in equal shares,
+    mixed with 10% uniform noise.
+    """
+    eps = 1e-3 * rng.random(n)
+    sizes = np.array([1 / 7, 1 / 3, 1 / 2])[rng.integers(0, 3, n)] + eps
+    noise = rng.random(n) < 0.1
+    sizes[noise] = 1.0 - rng.random(int(noise.sum()))
+    return sizes
+
+
+DISTRIBUTIONS = {
+    "uniform": uniform_items,
+    "small": small_items,
+    "adversarial": adversarial_items,
+}
+
+
+class RunningStats:
+    """
+    Count, mean, variance, min and max of a stream of numbers.
+
+    Uses Welford's update, and Chan's formula to merge the statistics of
+    two streams, so partial results from workers can be combined.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def confidence_interval(self, z=1.96):
+        """Normal approximation interval for the mean (95% by default)."""
+        half = z * math.sqrt(self.variance / self.count) if self.count else math.nan
+        return self.mean - half, self.mean + half
+
+
+def run_chunk(task):
+    """
+    Pack a chunk of random instances in a worker process.
+
+    Args:
+        task: Tuple (seed_sequence, distribution, n_instances, n_items, policies)
+
+    Returns:
+        distribution, {policy: (bin count stats, ratio stats)}
+    """
+    seed_seq, distribution, n_instances, n_items, policies = task
+    rng = np.random.default_rng(seed_seq)
+    draw = DISTRIBUTIONS[distribution]
+
+    results = {name: (RunningStats(), RunningStats()) for name in policies}
+    for _ in range(n_instances):
+        items = draw(rng, n_items).tolist()
+        bound = max(lower_bound(items, 1.0), 1)
+        for name in policies:
+            packer = POLICIES[name](1.0).extend(items)
+            bins, ratios = results[name]
+            bins.add(packer.num_bins)
+            ratios.add(packer.num_bins / bound)
+    return distribution, results
+
+
+def make_tasks(n_instances, n_items, distributions, policies, chunk_size, seed):
+    """Split the experiment into chunks, each with its own random stream."""
+    n_chunks = math.ceil(n_instances / chunk_size)
+    streams = np.random.SeedSequence(seed).spawn(n_chunks * len(distributions))
+
+    tasks = []
+    for d, distribution in enumerate(distributions):
+        for c in range(n_chunks):
+            size = min(chunk_size, n_instances - c * chunk_size)
+            tasks.append((streams[d * n_chunks + c], distribution, size,
+                          n_items, policies))
+    return tasks
+
+
+def run_experiment(n_instances, n_items, distributions=None, policies=None,
+                   workers=None, chunk_size=100, seed=42):
+    """
+    Run the experiment and return the aggregated statistics.
+
+    Args:
+        n_instances: Number of instances per distribution
+        n_items: Number of items per instance
+        distributions: Names from DISTRIBUTIONS (default: all)
+        policies: Names from POLICIES (default: all)
+        workers: Number of worker processes (default: CPU count)
+        chunk_size: Instances per task sent to a worker
+        seed: Root seed; every chunk gets an independent child stream
+
+    Returns:
+        {distribution: {policy: (bin count stats, ratio stats)}}
+    """
+    distributions = list(distributions or DISTRIBUTIONS)
+    policies = list(policies or POLICIES)
+    tasks = make_tasks(n_instances, n_items, distributions, policies,
+                       chunk_size, seed)
+
+    totals = {d: {p: (RunningStats(), RunningStats()) for p in policies}
+              for d in distributions}
+    with Pool(workers) as pool:
+        for distribution, results in pool.imap_unordered(run_chunk, tasks):
+            for name, (bins, ratios) in results.items():
+                totals[distribution][name][0].merge(bins)
+                totals[distribution][name][1].merge(ratios)
+    return totals
+
+
+def print_report(totals):
+    """Print mean bins and the ratio with its 95% confidence interval."""
+    for distribution, results in totals.items():
+        print(f"Distribution: {distribution}")
+        for name, (bins, ratios) in results.items():
+            low, high = ratios.confidence_interval()
+            print(f"  {name:<22} bins {bins.mean:10.2f}  "
+                  f"ratio {ratios.mean:.4f} [{low:.4f}, {high:.4f}]  "
+                  f"max {ratios.max:.4f}  (n={ratios.count})")
+        print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--instances", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--distributions", nargs="+", choices=list(DISTRIBUTIONS))
+    parser.add_argument("--policies", nargs="+", choices=list(POLICIES))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    totals = run_experiment(args.instances, args.items, args.distributions,
+                            args.policies, args.workers, args.chunk_size,
+                            args.seed)
+    print_report(totals)
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from montecarlo import (DISTRIBUTIONS, RunningStats, make_tasks, run_chunk,
+                        run_experiment)
+
+
+def stats_of(values):
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    return stats
+
+
+def test_running_stats_merge_matches_numpy():
+    values = np.random.default_rng(0).normal(5.0, 2.0, 1000)
+    merged = RunningStats()
+    for part in np.array_split(values, 7):
+        merged.merge(stats_of(part))
+    merged.merge(RunningStats())
+    assert merged.count == len(values)
+    assert merged.mean == pytest.approx(values.mean())
+    assert merged.variance == pytest.approx(values.var(ddof=1))
+    assert (merged.min, merged.max) == (values.min(), values.max())
+
+
+def test_distributions_in_range():
+    rng = np.random.default_rng(1)
+    for draw in DISTRIBUTIONS.values():
+        sizes = draw(rng, 10_000)
+        assert np.all((sizes > 0) & (sizes <= 1))
+
+
+def test_tasks_cover_all_instances():
+    tasks = make_tasks(250, 10, ["uniform", "small"], ["first-fit"], 100, seed=3)
+    assert [task[2] for task in tasks] == [100, 100, 50] * 2
+    # Every chunk has its own random stream
+    assert len({tuple(task[0].spawn_key) for task in tasks}) == len(tasks)
+
+
+def test_chunk_is_reproducible_and_above_bound():
+    task = make_tasks(20, 30, ["adversarial"], ["next-fit", "first-fit"], 20, seed=4)[0]
+    _, first = run_chunk(task)
+    _, second = run_chunk(task)
+    for name in ("next-fit", "first-fit"):
+        bins, ratios = first[name]
+        assert (bins.mean, ratios.mean) == (second[name][0].mean, second[name][1].mean)
+        assert ratios.count == 20
+        assert ratios.min >= 1.0
+
+
+def test_experiment_totals():
+    totals = run_experiment(30, 20, ["uniform"], ["first-fit", "best-fit"],
+                            workers=2, chunk_size=7, seed=5)
+    for bins, ratios in totals["uniform"].values():
+        assert bins.count == ratios.count == 30
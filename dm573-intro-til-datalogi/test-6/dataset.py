@@ -0,0 +1,278 @@
+"""
+Compact on-disk datasets that open through numpy.memmap.
+
+A dataset mirrors the list of tuples used by the exercises: a row
+(x, y) or (x, y, label) becomes float64 columns plus an optional label
+column. Labels are dictionary encoded as int32 codes. The file layout is
+
+    magic (8 bytes) | header length (uint64) | JSON header | padding
+    column 0 (rows float64) | column 1 | ... | label codes (rows int32)
+
+with the data starting at a multiple of 64 bytes. Opening a file only
+reads the header; the columns are memory mapped, so nothing is copied
+until it is used.
+
+Example:
+    python dataset.py points.csv points.dmc --label-column label
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+from itertools import islice
+
+import numpy as np
+
+MAGIC = b"DM573COL"
+# Bumped whenever the layout changes; files of another version are refused
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+
+def encode_labels(values, vocabulary=None):
+    """
+    Dictionary encode labels, numbering new labels in order of first appearance.
+
+    Parameters:
+    -----------
+    values : sequence
+        Labels to encode
+    vocabulary : dict, optional
+        Existing label -> code mapping; new labels are added to it
+
+    Returns:
+    --------
+    tuple (codes, vocabulary)
+    """
+    vocabulary = {} if vocabulary is None else vocabulary
+    unique, first, inverse = np.unique(np.asarray(values), return_index=True,
+                                       return_inverse=True)
+    mapping = np.empty(len(unique), dtype=np.int32)
+    for k in np.argsort(first, kind="stable"):
+        label = unique[k].item()
+        mapping[k] = vocabulary.setdefault(label, len(vocabulary))
+    return mapping[inverse.ravel()], vocabulary
+
+
+class Dataset:
+    """
+    A memory-mapped columnar dataset.
+
+    Attributes:
+        columns: Names of the float64 columns, in row order
+        label_names: Label of every code, or None without a label column
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a dataset file")
+            length = int(np.frombuffer(file.read(8), dtype=np.uint64)[0])
+            header = json.loads(file.read(length))
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path} has format version {header.get('version')}, "
+                             f"expected {FORMAT_VERSION}")
+
+        self.columns = header["columns"]
+        self.label_names = header["labels"]
+        self._rows = header["rows"]
+
+        offset = _data_offset(length)
+        self._data = {}
+        for name in self.columns:
+            self._data[name] = _memmap(path, np.float64, offset, self._rows)
+            offset += 8 * self._rows
+        self.label_codes = None
+        if self.label_names is not None:
+            self.label_codes = _memmap(path, np.int32, offset, self._rows)
+
+    def __len__(self):
+        return self._rows
+
+    @property
+    def dimensions(self):
+        return len(self.columns)
+
+    def column(self, name_or_index):
+        """Return one float column as a read-only memmap."""
+        if isinstance(name_or_index, int):
+            name_or_index = self.columns[name_or_index]
+        return self._data[name_or_index]
+
+    def labels(self, start=0, stop=None):
+        """Return the decoded labels of a range of rows as a list."""
+        if self.label_codes is None:
+            return None
+        names = self.label_names
+        return [names[code] for code in self.label_codes[start:stop].tolist()]
+
+    def iter_blocks(self, block_rows=1 << 20, columns=None):
+        """
+        Read the float columns in blocks of rows.
+
+        Yields:
+        -------
+        ndarray of shape (rows, d), one row per point
+        """
+        data = [self.column(c) for c in (columns or self.columns)]
+        for start in range(0, self._rows, block_rows):
+            yield np.column_stack([c[start:start + block_rows] for c in data])
+
+    def to_array(self):
+        """Return all float columns as one (rows, d) array (a copy)."""
+        return np.column_stack([self._data[name] for name in self.columns])
+
+    def rows(self, block_rows=1 << 16):
+        """Iterate the rows as tuples, like the list-of-tuples datasets."""
+        for start, block in zip(range(0, self._rows, block_rows),
+                                self.iter_blocks(block_rows)):
+            labels = self.labels(start, start + len(block))
+            if labels is None:
+                yield from map(tuple, block.tolist())
+            else:
+                for row, label in zip(block.tolist(), labels):
+                    yield (*row, label)
+
+
+def _data_offset(header_length):
+    end = len(MAGIC) + 8 + header_length
+    return -(-end // ALIGNMENT) * ALIGNMENT
+
+
+def _memmap(path, dtype, offset, rows):
+    if rows == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(rows,))
+
+
+def _write_header(file, rows, columns, label_names):
+    header = json.dumps({"version": FORMAT_VERSION, "rows": rows,
+                         "columns": columns, "labels": label_names}).encode()
+    file.write(MAGIC)
+    file.write(np.uint64(len(header)).tobytes())
+    file.write(header)
+    file.write(b"\0" * (_data_offset(len(header)) - file.tell()))
+
+
+def write_dataset(path, columns, labels=None, names=None):
+    """
+    Write arrays to a dataset file.
+
+    Parameters:
+    -----------
+    path : str
+        Output file
+    columns : sequence of array_like or ndarray of shape (rows, d)
+        The float columns, or the points one per row
+    labels : sequence, optional
+        One label per row
+    names : list of str, optional
+        Column names (default: x, y, then x2, x3, ...)
+    """
+    if isinstance(columns, np.ndarray) and columns.ndim == 2:
+        columns = columns.T
+    columns = [np.ascontiguousarray(c, dtype=np.float64) for c in columns]
+    rows = len(columns[0]) if columns else 0
+    names = names or _default_names(len(columns))
+
+    label_names = None
+    if labels is not None:
+        codes, vocabulary = encode_labels(labels)
+        label_names = list(vocabulary)
+
+    with open(path, "wb") as file:
+        _write_header(file, rows, names, label_names)
+        for column in columns:
+            column.tofile(file)
+        if labels is not None:
+            codes.astype(np.int32).tofile(file)
+    return Dataset(path)
+
+
+def from_tuples(path, S, names=None):
+    """Write a list of (x, y, ...) or (x, y, ..., label) tuples to a dataset file."""
+    has_label = bool(S) and isinstance(S[0][-1], str)
+    width = len(S[0]) - has_label if S else 0
+    columns = [[row[k] for row in S] for k in range(width)]
+    labels = [row[-1] for row in S] if has_label else None
+    return write_dataset(path, columns, labels, names)
+
+
+def _default_names(d):
+    return ["x", "y"][:d] + [f"x{k}" for k in range(2, d)]
+
+
+def convert_csv(csv_path, path, label_column=None, delimiter=",",
+                chunk_rows=1_000_000):
+    """
+    Convert a CSV file with a header row to a dataset file.
+
+    The CSV is read in chunks and every column is spooled to a temporary
+    file, so memory use is bounded by chunk_rows whatever the file size.
+
+    Parameters:
+    -----------
+    label_column : str, optional
+        Name of the column holding labels; all other columns must be numbers
+    """
+    with open(csv_path) as file:
+        header = [name.strip() for name in next(file).split(delimiter)]
+        label_index = header.index(label_column) if label_column is not None else None
+        value_indices = [k for k in range(len(header)) if k != label_index]
+        names = [header[k] for k in value_indices]
+
+        vocabulary = {}
+        rows = 0
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(path))) as tmp:
+            spools = [open(os.path.join(tmp, str(k)), "wb")
+                      for k in range(len(names) + (label_index is not None))]
+            while True:
+                lines = list(islice(file, chunk_rows))
+                if not lines:
+                    break
+                # Blank lines (e.g. at the end of the file) hold no row
+                lines = [line for line in lines if line.strip()]
+                if not lines:
+                    continue
+                block = np.loadtxt(lines, delimiter=delimiter, usecols=value_indices,
+                                   ndmin=2, dtype=np.float64)
+                for spool, column in zip(spools, block.T):
+                    np.ascontiguousarray(column).tofile(spool)
+                if label_index is not None:
+                    labels = [line.split(delimiter)[label_index].strip() for line in lines]
+                    codes, vocabulary = encode_labels(labels, vocabulary)
+                    codes.astype(np.int32).tofile(spools[-1])
+                rows += len(lines)
+            for spool in spools:
+                spool.close()
+
+            with open(path, "wb") as out:
+                _write_header(out, rows, names,
+                              list(vocabulary) if label_index is not None else None)
+                for spool in spools:
+                    with open(spool.name, "rb") as part:
+                        shutil.copyfileobj(part, out, 1 << 24)
+    return Dataset(path)
+
+
+def open_dataset(path):
+    """Open a dataset file; only the header is read."""
+    return Dataset(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a CSV file to a dataset file")
+    parser.add_argument("csv_path")
+    parser.add_argument("path")
+    parser.add_argument("--label-column", default=None)
+    parser.add_argument("--delimiter", default=",")
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    dataset = convert_csv(args.csv_path, args.path, args.label_column,
+                          args.delimiter, args.chunk_rows)
+    print(f"{len(dataset)} rows, columns {dataset.columns}"
+          + (f", {len(dataset.label_names)} labels" if dataset.label_names else ""))
@@ -0,0 +1,351 @@
+from array import array
+
+
+class _Empty:
+    """
+    Load of an unused leaf for loads of any numeric type.
+
+    float('inf') cannot be added to a Decimal, so untyped trees use this
+    instead: it stays infinite when an item is added and compares greater
+    than every load.
+    """
+
+    def __add__(self, other):
+        return self
+
+    __radd__ = __add__
+
+    def __lt__(self, other):
+        return False
+
+    def __le__(self, other):
+        return self is other
+
+    def __gt__(self, other):
+        return self is not other
+
+    def __ge__(self, other):
+        return True
+
+
+_EMPTY = _Empty()
+
+
+class MinLoadTree:
+    """
+    Segment tree over bin loads that finds the leftmost bin an item fits in.
+
+    Every internal node holds the smallest load in its subtree, so a bin
+    with room for an item exists below a node exactly when
+    `node_min + item_size <= bin_capacity`. Unused leaves hold infinity.
+    The fit test is the same float comparison `first_fit` has always made,
+    so the chosen bins are identical, but each lookup costs O(log bins).
+
+    With a typecode the loads are stored in a typed array: 'd' for float64
+    loads, 'q' for integer (fixed-point) loads. Without one they are a
+    plain list and keep the type of the sizes, e.g. int, Fraction or
+    Decimal. The tree itself is always a list: reading a typed array
+    creates a new Python number on every access, which made the descent
+    several times slower.
+    """
+
+    def __init__(self, bin_capacity, size_hint=1, typecode=None):
+        self.bin_capacity = bin_capacity
+        # Value of an unused leaf; larger than any real load
+        if typecode == 'q':
+            self._empty = 2 ** 63 - 1
+        elif typecode == 'd':
+            self._empty = float('inf')
+        else:
+            self._empty = _EMPTY
+        self.loads = [] if typecode is None else array(typecode)
+
+        # Number of leaves, always a power of two
+        self._size = 1
+        while self._size < size_hint:
+            self._size *= 2
+        self._tree = [self._empty] * (2 * self._size)
+
+        # Last bin place() used and the smallest load of the bins before it
+        self._last = -1
+        self._left_min = self._empty
+        # The ancestors of the last bin have not seen its newest load yet
+        self._stale = False
+
+    def __len__(self):
+        return len(self.loads)
+
+    def find(self, item_size):
+        """Return the index of the leftmost bin that fits the item, or -1."""
+        self._flush()
+        tree = self._tree
+        capacity = self.bin_capacity
+        if tree[1] + item_size > capacity:
+            return -1
+
+        node = 1
+        size = self._size
+        while node < size:
+            node *= 2
+            if tree[node] + item_size > capacity:
+                node += 1
+        return node - size
+
+    def place(self, item_size):
+        """
+        Put an item into the leftmost bin that fits it and return the bin.
+
+        Same result as find() followed by add() or open_bin(). No bin
+        before the last one used has a load below the smallest load seen
+        left of it on the way down, so while that load leaves no room for
+        the item and the last bin does, the item goes there without a
+        search. Only the leaf of the bin is updated; its ancestors catch
+        up before the next search, so runs of items filling the same bin
+        cost O(1) each.
+        """
+        tree = self._tree
+        capacity = self.bin_capacity
+        size = self._size
+        bin_idx = self._last
+        if not (bin_idx >= 0 and self._left_min + item_size > capacity
+                and tree[size + bin_idx] + item_size <= capacity):
+            if self._stale:
+                # _flush, inlined
+                self._stale = False
+                node = size + bin_idx
+                load = tree[node]
+                while node > 1:
+                    sibling = tree[node ^ 1]
+                    if sibling < load:
+                        load = sibling
+                    node //= 2
+                    if tree[node] == load:
+                        break
+                    tree[node] = load
+            if tree[1] + item_size > capacity:
+                # Every bin is now to the left of the new one
+                self._left_min = tree[1]
+                self._last = self._open(item_size)
+                return self._last
+
+            left_min = self._empty
+            node = 1
+            while node < size:
+                node *= 2
+                child = tree[node]
+                if child + item_size > capacity:
+                    if child < left_min:
+                        left_min = child
+                    node += 1
+            bin_idx = node - size
+            self._left_min = left_min
+            self._last = bin_idx
+
+        load = tree[size + bin_idx] + item_size
+        tree[size + bin_idx] = load
+        self.loads[bin_idx] = load
+        self._stale = True
+        return bin_idx
+
+    def add(self, bin_idx, item_size):
+        """Add an item to an existing bin and return its new load."""
+        self._flush()
+        load = self.loads[bin_idx] + item_size
+        self.loads[bin_idx] = load
+        self._update(bin_idx, load)
+        self._last = -1
+        return load
+
+    def open_bin(self, item_size):
+        """Open a new bin holding one item and return its index."""
+        self._flush()
+        self._last = -1
+        return self._open(item_size)
+
+    def remove(self, bin_idx):
+        """Take a bin out of the search for good; its load stays in loads."""
+        self._flush()
+        self._last = -1
+        self._update(bin_idx, self._empty)
+
+    def _open(self, item_size):
+        bin_idx = len(self.loads)
+        if bin_idx == self._size:
+            self._grow()
+        # Start from 0 so the running total matches sum() over the bin
+        load = 0 + item_size
+        self.loads.append(load)
+        self._update(bin_idx, load)
+        return bin_idx
+
+    def _flush(self):
+        if self._stale:
+            self._stale = False
+            self._update(self._last, self._tree[self._size + self._last])
+
+    def _update(self, bin_idx, load):
+        # Walk up with the minimum of the node and its sibling, until a
+        # parent already holds that minimum
+        tree = self._tree
+        node = bin_idx + self._size
+        tree[node] = load
+        while node > 1:
+            sibling = tree[node ^ 1]
+            if sibling < load:
+                load = sibling
+            node //= 2
+            if tree[node] == load:
+                break
+            tree[node] = load
+
+    def _grow(self):
+        # Double the number of leaves and rebuild the internal nodes; the
+        # old leaves are copied, not the loads, so removed bins stay out
+        old, old_size = self._tree, self._size
+        self._size *= 2
+        tree = [self._empty] * (2 * self._size)
+        tree[self._size:self._size + len(self.loads)] = old[old_size:old_size + len(self.loads)]
+        for node in range(self._size - 1, 0, -1):
+            tree[node] = min(tree[2 * node], tree[2 * node + 1])
+        self._tree = tree
+
+
+class PackingResult:
+    """
+    Compact result of a bin packing.
+
+    Instead of a list of (item_id, item_size) tuples per bin, the result
+    keeps one typed array with the bin of every item and one with the load
+    of every bin. The bin -> items view is built on demand in CSR form:
+    the items of bin b are item_ids[offsets[b]:offsets[b + 1]].
+
+    If `scale` is set, sizes, loads and capacity are integers in units of
+    1/scale, so every capacity check was exact. Loads of float sizes are a
+    float64 array; loads of other sizes (int, Fraction, Decimal) are a
+    list of the same type.
+    """
+
+    def __init__(self, assignment, loads, bin_capacity, scale=None):
+        self.assignment = assignment
+        self.loads = loads
+        self.bin_capacity = bin_capacity
+        self.scale = scale
+        self._csr = None
+
+    @property
+    def num_items(self):
+        return len(self.assignment)
+
+    @property
+    def num_bins(self):
+        return len(self.loads)
+
+    def heights(self):
+        """Return the load of every bin as a float in the original units."""
+        if self.scale is None:
+            return list(self.loads)
+        return [load / self.scale for load in self.loads]
+
+    def csr(self):
+        """Return (offsets, item_ids), grouping the items by bin in id order."""
+        if self._csr is None:
+            # Counting sort of the items by bin
+            offsets = array('q', [0]) * (self.num_bins + 1)
+            for bin_idx in self.assignment:
+                offsets[bin_idx + 1] += 1
+            for bin_idx in range(self.num_bins):
+                offsets[bin_idx + 1] += offsets[bin_idx]
+
+            fill = array('q', offsets)
+            item_ids = array(self.assignment.typecode, [0]) * self.num_items
+            for item_id, bin_idx in enumerate(self.assignment):
+                item_ids[fill[bin_idx]] = item_id
+                fill[bin_idx] += 1
+            self._csr = (offsets, item_ids)
+        return self._csr
+
+    def items_in(self, bin_idx):
+        """Return the ids of the items in one bin."""
+        offsets, item_ids = self.csr()
+        return item_ids[offsets[bin_idx]:offsets[bin_idx + 1]]
+
+    def to_bins(self, items):
+        """Return the bins as lists of (item_id, item_size) tuples, as first_fit does."""
+        offsets, item_ids = self.csr()
+        return [[(item_id, items[item_id])
+                 for item_id in item_ids[offsets[b]:offsets[b + 1]]]
+                for b in range(self.num_bins)]
+
+    def nbytes(self):
+        """Memory held by the typed arrays, in bytes (list loads not counted)."""
+        arrays = [self.assignment, self.loads]
+        if self._csr is not None:
+            arrays.extend(self._csr)
+        return sum(len(a) * a.itemsize for a in arrays if isinstance(a, array))
+
+
+def first_fit_compact(items, bin_capacity, scale=None):
+    """
+    First Fit bin packing into a PackingResult.
+
+    Args:
+        items: Iterable of item sizes
+        bin_capacity: Capacity of every bin
+        scale: If given, sizes and capacity are rounded to integer multiples
+            of 1/scale (e.g. scale=10**9) and packed with exact integer
+            arithmetic instead of floats. Without it float sizes are packed
+            in float64 and all other sizes in their own arithmetic
+
+    Returns:
+        PackingResult with the bin of every item and the load of every bin
+    """
+    if not hasattr(items, '__len__'):
+        items = list(items)
+    if scale is None:
+        sizes, capacity = items, bin_capacity
+        # Only float sizes go in a float64 array; other numbers keep their
+        # exact type in a plain list
+        typecode = 'd' if all(type(size) is float for size in sizes) else None
+    else:
+        sizes = [round(size * scale) for size in items]
+        capacity, typecode = round(bin_capacity * scale), 'q'
+
+    # The tree grows with the bins, so it is only as deep as it needs to be
+    tree = MinLoadTree(capacity, typecode=typecode)
+    assignment = array('i' if len(sizes) < 2 ** 31 else 'q')
+    place = tree.place
+    assignment.extend(place(item_size) for item_size in sizes)
+
+    return PackingResult(assignment, tree.loads, capacity, scale)
+
+
+def first_fit(items, bin_capacity):
+    """
+    First Fit (FF) bin packing.
+
+    Each item goes into the leftmost bin with enough room left, or into a
+    new bin if none fits. Bin loads are kept as running totals in a
+    MinLoadTree, so each item is placed in O(log bins). This returns the
+    classic list-of-tuples shape; use first_fit_compact for large inputs.
+
+    Args:
+        items: List of item sizes
+        bin_capacity: Capacity of every bin
+
+    Returns:
+        bins: List of bins, each a list of (item_id, item_size) tuples
+        num_bins: Number of bins used
+    """
+    result = first_fit_compact(items, bin_capacity)
+    return result.to_bins(items), result.num_bins
+
+
+def print_bins(bins, bin_capacity):
+    """Print the bin packing result in a readable format."""
+    print(f"Bin capacity: {bin_capacity}")
+    print(f"Number of bins used: {len(bins)}\n")
+
+    for bin_idx, bin_items in enumerate(bins):
+        total = sum(size for _, size in bin_items)
+        items_str = ", ".join([f"item{item_id}({size})" for item_id, size in bin_items])
+        print(f"Bin {bin_idx}: [{items_str}] -> Total: {total}/{bin_capacity}")
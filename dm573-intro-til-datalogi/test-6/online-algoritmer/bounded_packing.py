@@ -0,0 +1,173 @@
+import sys
+from array import array
+from collections import namedtuple
+
+from packers import BestFitPacker, FirstFitPacker, Packer
+
+
+# A bin that has been closed and will never receive another item
+ClosedBin = namedtuple("ClosedBin", ["bin_id", "load", "item_ids"])
+
+
+class FileSink:
+    """
+    Writes closed bins to a text file, one line per bin.
+
+    Each line is `bin_id<TAB>load<TAB>item_id,item_id,...`. The sink can
+    be passed anywhere a callback is expected.
+    """
+
+    def __init__(self, file=None):
+        if file is None:
+            file = sys.stdout
+        self._owns_file = isinstance(file, str)
+        self._file = open(file, "w") if self._owns_file else file
+
+    def __call__(self, closed):
+        ids = ",".join(map(str, closed.item_ids))
+        self._file.write(f"{closed.bin_id}\t{closed.load!r}\t{ids}\n")
+
+    def close(self):
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Unbounded packers that place items among the open bins
+POLICIES = {
+    "first-fit": FirstFitPacker,
+    "best-fit": BestFitPacker,
+}
+
+
+class BoundedSpacePacker(Packer):
+    """
+    Online bin packing that keeps at most `max_open` bins open.
+
+    When an item fits in no open bin and the limit is reached, one open
+    bin is closed and handed to the sink as a ClosedBin record. Only the
+    open bins are kept in memory, so memory use and the cost of a push
+    depend on `max_open` and not on how long the stream has run. Unlike
+    the unbounded packers it keeps no assignment or loads: every item id
+    reaches the sink with the bin it was closed in.
+
+    The open bins are placed by the policy's own packer (FirstFitPacker
+    or BestFitPacker), whose bins are positions in the order the bins
+    were opened, so the oldest bin wins ties. Closed bins are taken out
+    of it, and once it has used 2 * max_open positions the open bins are
+    moved to a fresh one.
+
+    Args:
+        bin_capacity: Capacity of every bin
+        max_open: Maximum number of open bins (K)
+        sink: Callable receiving each ClosedBin, e.g. a FileSink
+        policy: "first-fit" (oldest open bin with room) or
+            "best-fit" (fullest open bin with room)
+        close_rule: Which bin to close when the limit is hit: "oldest",
+            "fullest", or a callable taking {bin_id: load} and returning
+            the bin_id to close
+        close_below: If given, a bin is closed as soon as its free space
+            drops to this value or below
+    """
+
+    def __init__(self, bin_capacity, max_open, sink, policy="first-fit",
+                 close_rule="oldest", close_below=None):
+        if max_open < 1:
+            raise ValueError("max_open must be at least 1")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy: {policy}")
+        if close_rule not in ("oldest", "fullest") and not callable(close_rule):
+            raise ValueError(f"Unknown close rule: {close_rule}")
+
+        super().__init__(bin_capacity)
+        self.max_open = max_open
+        self.sink = sink
+        self.policy = policy
+        self.close_rule = close_rule
+        self.close_below = close_below
+
+        self.name = f"bounded-{policy}-{max_open}"
+        self.num_items = 0
+        self.num_closed = 0
+        self._num_bins = 0
+
+        # Packer over the open bins, and per position the bin id and,
+        # while the bin is open, its item ids
+        self._packer = POLICIES[policy](bin_capacity)
+        self._bin_ids = []
+        self._item_ids = {}
+
+    @property
+    def num_bins(self):
+        return self._num_bins
+
+    def push(self, item_size):
+        """Pack one item and return the id of its bin."""
+        # Opening a bin may move the bins to new positions, so look up
+        # the id only after the push
+        position = super().push(item_size)
+        return self._bin_ids[position]
+
+    def finish(self):
+        """Close every open bin, oldest first."""
+        for position in list(self._item_ids):
+            self._close(position)
+
+    def open_bins(self):
+        """Return {bin_id: load} for the bins that are still open."""
+        loads = self._packer.loads
+        return {self._bin_ids[p]: loads[p] for p in self._item_ids}
+
+    def _place(self, item_size):
+        return self._packer._place(item_size)
+
+    def _add(self, position, item_size):
+        self._packer._add(position, item_size)
+
+    def _open_bin(self, item_size):
+        if len(self._item_ids) >= self.max_open:
+            self._close(self._choose_victim())
+        if len(self._bin_ids) >= 2 * self.max_open:
+            self._compact()
+        position = self._packer._open_bin(item_size)
+        self._bin_ids.append(self._num_bins)
+        self._item_ids[position] = array("q")
+        self._num_bins += 1
+        return position
+
+    def _record(self, position):
+        self._item_ids[position].append(self.num_items)
+        self.num_items += 1
+        if (self.close_below is not None
+                and self.bin_capacity - self._packer.loads[position] <= self.close_below):
+            self._close(position)
+
+    def _choose_victim(self):
+        if self.close_rule == "oldest":
+            return next(iter(self._item_ids))
+        if self.close_rule == "fullest":
+            return max(self._item_ids, key=self._packer.loads.__getitem__)
+        positions = {self._bin_ids[p]: p for p in self._item_ids}
+        return positions[self.close_rule(self.open_bins())]
+
+    def _close(self, position):
+        item_ids = self._item_ids.pop(position)
+        self._packer._close_bin(position)
+        self.num_closed += 1
+        self.sink(ClosedBin(self._bin_ids[position], self._packer.loads[position], item_ids))
+
+    def _compact(self):
+        # Move the open bins, in order, to the first positions of a new packer
+        packer = POLICIES[self.policy](self.bin_capacity)
+        bin_ids, item_ids = [], {}
+        for position, ids in self._item_ids.items():
+            item_ids[packer._open_bin(self._packer.loads[position])] = ids
+            bin_ids.append(self._bin_ids[position])
+        self._packer, self._bin_ids, self._item_ids = packer, bin_ids, item_ids
@@ -0,0 +1,129 @@
+import heapq
+
+import numpy as np
+
+
+class ColumnarSchedule:
+    """
+    A schedule stored as four NumPy columns instead of a list of tuples.
+
+    Row k is the tuple (machine[k], start[k], end[k], job[k]) of the usual
+    schedule format. Grouping by machine uses a stable argsort and an
+    offsets array that are built once, on first use: the rows of machine i
+    are rows order[offsets[i]:offsets[i + 1]], in schedule order.
+    """
+
+    def __init__(self, machine, start, end, job, m=None):
+        self.machine = np.asarray(machine, dtype=np.int64)
+        self.start = np.asarray(start)
+        self.end = np.asarray(end)
+        self.job = np.asarray(job, dtype=np.int64)
+        if m is None:
+            m = int(self.machine.max()) + 1 if len(self.machine) else 0
+        self.m = m
+        self._order = None
+        self._offsets = None
+
+    @classmethod
+    def from_tuples(cls, schedule, m=None):
+        """Build from a list of (machine_id, start_time, end_time, job_id)."""
+        if not schedule:
+            return cls([], [], [], [], m or 0)
+        machine, start, end, job = zip(*schedule)
+        return cls(machine, start, end, job, m)
+
+    def __len__(self):
+        return len(self.job)
+
+    def to_tuples(self):
+        """Return the schedule as a list of tuples again."""
+        return list(zip(self.machine.tolist(), self.start.tolist(),
+                        self.end.tolist(), self.job.tolist()))
+
+    def _index(self):
+        if self._order is None:
+            self._order = np.argsort(self.machine, kind="stable")
+            counts = np.bincount(self.machine, minlength=self.m)
+            self._offsets = np.zeros(self.m + 1, dtype=np.int64)
+            np.cumsum(counts, out=self._offsets[1:])
+        return self._order, self._offsets
+
+    def machine_rows(self, machine_id):
+        """Return the row numbers of one machine's jobs, in schedule order."""
+        order, offsets = self._index()
+        return order[offsets[machine_id]:offsets[machine_id + 1]]
+
+    def machine_jobs(self, machine_id):
+        """Return (start, end, job) arrays for one machine."""
+        rows = self.machine_rows(machine_id)
+        return self.start[rows], self.end[rows], self.job[rows]
+
+    def makespan(self):
+        return self.end.max() if len(self) else 0
+
+    def busy_time(self):
+        """Total processing time per machine."""
+        return np.bincount(self.machine, weights=self.end - self.start,
+                           minlength=self.m)
+
+    def utilization(self):
+        """Fraction of the makespan each machine spends working."""
+        makespan = self.makespan()
+        if not makespan:
+            return np.zeros(self.m)
+        return self.busy_time() / makespan
+
+    def gantt(self):
+        """
+        Return the rows sorted by machine and start time, for plotting.
+
+        Returns:
+            Structured array with fields machine, job, start, end
+        """
+        order = np.lexsort((self.start, self.machine))
+        rows = np.empty(len(self), dtype=[("machine", np.int64), ("job", np.int64),
+                                          ("start", self.start.dtype),
+                                          ("end", self.end.dtype)])
+        rows["machine"] = self.machine[order]
+        rows["job"] = self.job[order]
+        rows["start"] = self.start[order]
+        rows["end"] = self.end[order]
+        return rows
+
+    def save_gantt(self, path):
+        """Write the Gantt rows to a CSV file."""
+        rows = self.gantt()
+        with open(path, "w") as file:
+            file.write("machine,job,start,end\n")
+            np.savetxt(file, np.column_stack([rows[name] for name in rows.dtype.names]),
+                       delimiter=",", fmt="%.10g")
+
+
+def list_scheduling_columnar(jobs, m):
+    """
+    List Scheduling (LS) that returns a ColumnarSchedule.
+
+    Same assignment as list_scheduling, with the machine finish times in a
+    heap, but the result goes straight into columns.
+
+    Args:
+        jobs: Sequence of job processing times
+        m: Number of machines
+
+    Returns:
+        ColumnarSchedule with one row per job, in job order
+    """
+    times = np.asarray(jobs)
+    n = len(times)
+
+    machines = [(0, machine_id) for machine_id in range(m)]
+    machine = [0] * n
+    start = [0] * n
+    for job_id, job_time in enumerate(times.tolist()):
+        start_time, machine_id = machines[0]
+        heapq.heapreplace(machines, (start_time + job_time, machine_id))
+        machine[job_id] = machine_id
+        start[job_id] = start_time
+
+    start = np.array(start, dtype=np.result_type(times.dtype, np.int64))
+    return ColumnarSchedule(machine, start, start + times, np.arange(n), m)
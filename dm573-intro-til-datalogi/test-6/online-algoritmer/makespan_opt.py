@@ -0,0 +1,301 @@
+import heapq
+import time
+from collections import namedtuple
+from multiprocessing import Pool
+
+from optimal_packing import lower_bound as packing_lower_bound
+from scheduling import list_scheduling
+
+MakespanResult = namedtuple(
+    "MakespanResult", ["makespan", "assignment", "optimal", "lower_bound", "lpt_makespan"])
+
+
+class _Timeout(Exception):
+    pass
+
+
+def lower_bound(jobs, m):
+    """
+    Lower bound on the optimal makespan for integer job times.
+
+    The largest of: the longest job, the average load rounded up, and the
+    two shortest of the m + 1 longest jobs (two of them share a machine).
+    """
+    if not jobs:
+        return 0
+    times = sorted(jobs, reverse=True)
+    bound = max(times[0], -(-sum(times) // m))
+    if len(times) > m:
+        bound = max(bound, times[m - 1] + times[m])
+    return bound
+
+
+def lpt(jobs, m):
+    """
+    Longest Processing Time first: list scheduling on the sorted jobs.
+
+    Returns:
+        assignment: Machine of every job, by job id
+        makespan: Makespan of the LPT schedule
+    """
+    order = sorted(range(len(jobs)), key=lambda j: -jobs[j])
+    machines = [(0, machine_id) for machine_id in range(m)]
+    assignment = [0] * len(jobs)
+    for job_id in order:
+        load, machine_id = machines[0]
+        heapq.heapreplace(machines, (load + jobs[job_id], machine_id))
+        assignment[job_id] = machine_id
+    return assignment, max(load for load, _ in machines)
+
+
+# Subset sums are tracked as bit sets of at most about 2**REACH_BITS bits;
+# longer jobs are counted in coarser units
+REACH_BITS = 16
+
+
+class _Feasibility:
+    """
+    Can the jobs be scheduled on m machines within makespan C?
+
+    Bin completion (Korf): the machines are filled one at a time, and the
+    next machine always gets the longest job that is left, so machines are
+    interchangeable. The rest of the machine is one of the maximal sets of
+    remaining jobs that fit, because a job that still fits can always be
+    moved there. The idle time below C summed over all machines cannot
+    exceed m * C - total time, which rules out nearly all sets when C is
+    close to the average load. Equal jobs are interchangeable as well: a
+    set never skips a job and takes an equal one after it. A set of
+    remaining jobs that failed with k machines left is remembered.
+
+    While a set is being chosen, the subset sums of the jobs not yet
+    considered (a bit set per position) tell whether any completion can
+    still end within the allowed idle time, so dead branches are cut
+    before they are walked. Capacities that the bin packing lower bound
+    (L2) already rules out are rejected without a search.
+    """
+
+    def __init__(self, times, m, deadline):
+        self.times = times
+        self.m = m
+        self.deadline = deadline
+        self.nodes = 0
+
+    def run(self, capacity):
+        """Return a machine for every job (in `times` order), or None."""
+        self.capacity = capacity
+        self.failed = set()
+        self.assignment = [None] * len(self.times)
+        budget = self.m * capacity - sum(self.times)
+        if budget < 0 or (self.times and self.times[0] > capacity):
+            return None
+        # Jobs longer than half the capacity need a machine each, and so on
+        if packing_lower_bound(self.times, capacity) > self.m:
+            return None
+        if self._fill(list(range(len(self.times))), 0, budget):
+            return list(self.assignment)
+        return None
+
+    def _fill(self, remaining, machine_id, budget):
+        """Put the jobs `remaining` (longest first) on machines machine_id..m-1."""
+        if not remaining:
+            return True
+        if machine_id == self.m - 1:
+            # The idle time budget guarantees that the rest fits
+            for i in remaining:
+                self.assignment[i] = machine_id
+            return True
+
+        times = self.times
+        key = (machine_id, tuple(times[i] for i in remaining))
+        if key in self.failed:
+            return False
+
+        first, rest = remaining[0], remaining[1:]
+        self.assignment[first] = machine_id
+        room = self.capacity - times[first]
+        # reach[k]: bit s is set if some subset of rest[k:] takes time
+        # s * scale (rounded down per job) <= room; exact when scale is 1
+        scale = max(1, room >> REACH_BITS)
+        mask = (2 << (room // scale)) - 1
+        reach = [1] * (len(rest) + 1)
+        for k in range(len(rest) - 1, -1, -1):
+            reach[k] = (reach[k + 1] | (reach[k + 1] << (times[rest[k]] // scale))) & mask
+
+        exact = next((i for i in rest if times[i] == room), None)
+        if exact is not None:
+            # Filling the machine exactly is never worse
+            if self._complete(rest, [exact], machine_id, budget, 0):
+                return True
+        elif self._choose(rest, reach, scale, 0, room, budget, [], None, machine_id):
+            return True
+
+        self.failed.add(key)
+        return False
+
+    def _choose(self, rest, reach, scale, k, free, budget, chosen, skipped, machine_id):
+        """Pick a maximal set of rest[k:] for the machine, with free time left."""
+        self.nodes += 1
+        if self.nodes % 1024 == 0 and time.perf_counter() > self.deadline:
+            raise _Timeout()
+        # The machine may end with at most `budget` idle time, and with
+        # less than a skipped job (else the set is not maximal); give up
+        # when no subset of the remaining jobs gets it there
+        slack = budget if skipped is None else min(budget, skipped - 1)
+        if slack < 0:
+            return False
+        # Rounding loses less than `scale` per job
+        lowest = max(free - slack - (len(rest) - k) * (scale - 1), 0)
+        lowest, highest = -(-lowest // scale), free // scale
+        if highest < lowest or not (reach[k] >> lowest) & ((2 << (highest - lowest)) - 1):
+            return False
+        if k == len(rest):
+            return self._complete(rest, chosen, machine_id, budget, free)
+
+        job_time = self.times[rest[k]]
+        if job_time <= free:
+            chosen.append(rest[k])
+            if self._choose(rest, reach, scale, k + 1, free - job_time, budget, chosen,
+                            skipped, machine_id):
+                return True
+            chosen.pop()
+            # Leaving this job out means leaving out the equal ones after it
+            following = k + 1
+            while following < len(rest) and self.times[rest[following]] == job_time:
+                following += 1
+            return self._choose(rest, reach, scale, following, free, budget, chosen,
+                                job_time, machine_id)
+        return self._choose(rest, reach, scale, k + 1, free, budget, chosen, skipped, machine_id)
+
+    def _complete(self, rest, chosen, machine_id, budget, free):
+        """Close the machine with `chosen` on it and fill the next ones."""
+        taken = set(chosen)
+        for i in chosen:
+            self.assignment[i] = machine_id
+        left = [i for i in rest if i not in taken]
+        return self._fill(left, machine_id + 1, budget - free)
+
+
+def solve_makespan(jobs, m, time_limit=10.0):
+    """
+    Optimal makespan for P||Cmax with integer job times.
+
+    LPT gives the incumbent upper bound. The makespan is then searched
+    between lower_bound() and the incumbent, where each step asks whether
+    the jobs fit on m machines of that capacity (a bin packing question,
+    answered by bin completion). Capacities just above the lower bound are
+    tried first, in doubling steps, and the range is bisected once a
+    schedule has been found.
+
+    Instances of 30-40 jobs on up to 8 machines with times up to 1000
+    are solved in well under a second. Longer times leave fewer equal
+    jobs and exact fits to exploit: up to 10000 most instances still take
+    well under a second, but with times in the millions the question is
+    close to number partitioning and some instances run into time_limit.
+
+    Args:
+        jobs: List of integer job processing times
+        m: Number of machines
+        time_limit: Seconds before giving up with the best schedule found
+
+    Returns:
+        MakespanResult(makespan, assignment, optimal, lower_bound, lpt_makespan)
+        where assignment[job_id] is the machine of every job
+    """
+    deadline = time.perf_counter() + time_limit
+    assignment, lpt_makespan = lpt(jobs, m)
+    low, high = lower_bound(jobs, m), lpt_makespan
+
+    order = sorted(range(len(jobs)), key=lambda j: -jobs[j])
+    search = _Feasibility([jobs[j] for j in order], m, deadline)
+
+    # Tight capacities are the cheap ones to decide, so probe upwards from
+    # the lower bound in growing steps until a schedule is found, and only
+    # then bisect
+    optimal = True
+    step = 1
+    bracketed = False
+    while low < high:
+        if bracketed:
+            middle = (low + high) // 2
+        else:
+            middle = min(low + step - 1, high - 1)
+            step *= 2
+        try:
+            found = search.run(middle)
+        except _Timeout:
+            optimal = False
+            break
+        if found is None:
+            low = middle + 1
+        else:
+            bracketed = True
+            loads = [0] * m
+            for position, job_id in enumerate(order):
+                assignment[job_id] = found[position]
+                loads[found[position]] += jobs[job_id]
+            high = max(loads)
+
+    return MakespanResult(high, assignment, optimal, low, lpt_makespan)
+
+
+def to_schedule(jobs, assignment, m):
+    """
+    Turn a job -> machine assignment into the list_scheduling format.
+
+    Jobs on a machine run back to back in job id order.
+
+    Returns:
+        schedule: List of tuples (machine_id, start_time, end_time, job_id)
+        makespan: Total completion time
+    """
+    machines = [0] * m
+    schedule = []
+    for job_id, (job_time, machine_id) in enumerate(zip(jobs, assignment)):
+        start_time = machines[machine_id]
+        machines[machine_id] = start_time + job_time
+        schedule.append((machine_id, start_time, start_time + job_time, job_id))
+    return schedule, max(machines, default=0)
+
+
+def _ratio_task(task):
+    jobs, m, time_limit = task
+    result = solve_makespan(jobs, m, time_limit)
+    _, ls_makespan = list_scheduling(jobs, m)
+    return ls_makespan, result
+
+
+def list_scheduling_ratios(instances, time_limit=10.0, workers=None):
+    """
+    Compare list_scheduling against the optimum on many instances at once.
+
+    Args:
+        instances: List of (jobs, m) pairs
+        time_limit: Seconds per instance
+        workers: Number of worker processes (default: CPU count)
+
+    Returns:
+        List of (ratio, MakespanResult) in instance order; the ratio is
+        LS makespan / optimal makespan (or / lower bound if not proven)
+    """
+    tasks = [(jobs, m, time_limit) for jobs, m in instances]
+    results = []
+    with Pool(workers) as pool:
+        for ls_makespan, result in pool.imap(_ratio_task, tasks):
+            reference = result.makespan if result.optimal else result.lower_bound
+            results.append((ls_makespan / reference if reference else 1.0, result))
+    return results
+
+
+if __name__ == "__main__":
+    jobs = [1, 2, 1, 4, 3, 2]
+    m = 3
+
+    result = solve_makespan(jobs, m)
+    schedule, makespan = to_schedule(jobs, result.assignment, m)
+    _, ls_makespan = list_scheduling(jobs, m)
+
+    print(f"Jobs: {jobs}, machines: {m}")
+    print(f"LS makespan: {ls_makespan}")
+    print(f"LPT makespan: {result.lpt_makespan}")
+    print(f"Optimal makespan: {makespan}")
+    print(f"Ratio LS / OPT: {ls_makespan / makespan:.4f}")
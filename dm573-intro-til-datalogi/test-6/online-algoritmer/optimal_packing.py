@@ -0,0 +1,415 @@
+import math
+import time
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from multiprocessing import Pool, Value
+
+from bin_packing import MinLoadTree
+
+# Float tolerance used when rounding bounds and testing for exact fits
+EPS = 1e-9
+
+
+# ============================================================================
+# LOWER BOUNDS
+# ============================================================================
+
+def _ceil(x):
+    """Round up, ignoring float noise just above an integer."""
+    return max(0, math.ceil(x - EPS))
+
+
+def l1_bound(items, bin_capacity):
+    """
+    Continuous lower bound L1 = ⌈Σ s_i / C⌉.
+
+    Example: l1_bound([0.6, 0.6, 0.6], 1) returns 2
+    """
+    return _ceil(math.fsum(items) / bin_capacity)
+
+
+def l2_bound(items, bin_capacity):
+    """
+    Martello-Toth lower bound L2, in O(n log n).
+
+    For a threshold K <= C/2 the items are split into
+        J1: s > C - K          (one bin each, nothing of size >= K fits)
+        J2: C/2 < s <= C - K   (one bin each)
+        J3: K <= s <= C/2      (must go in the space J2 leaves, or new bins)
+    and L(K) = |J1| + |J2| + max(0, ⌈(ΣJ3 - (|J2|·C - ΣJ2)) / C⌉).
+    L2 is the largest L(K) over all item sizes K <= C/2 (and K = 0).
+
+    Example: l2_bound([0.6, 0.6, 0.6], 1) returns 3
+    """
+    sizes = sorted(items)
+    prefix = [0.0]
+    for size in sizes:
+        prefix.append(prefix[-1] + size)
+
+    half = bin_capacity / 2
+    n_small = bisect_right(sizes, half)
+    best = n_large = len(sizes) - n_small
+
+    for k in [0.0] + sizes[:n_small]:
+        j1_start = bisect_right(sizes, bin_capacity - k)
+        j3_start = bisect_left(sizes, k)
+        n_j2 = j1_start - n_small
+        sum_j2 = prefix[j1_start] - prefix[n_small]
+        sum_j3 = prefix[n_small] - prefix[j3_start]
+
+        spare = n_j2 * bin_capacity - sum_j2
+        bound = n_large + _ceil((sum_j3 - spare) / bin_capacity)
+        best = max(best, bound)
+    return best
+
+
+def _fekete_schepers(x, k, bin_capacity):
+    # u^(k)(x) = x if (k+1)x/C is an integer, else ⌊(k+1)x/C⌋ · C/k
+    t = (k + 1) * x / bin_capacity
+    if abs(t - round(t)) < EPS:
+        return x
+    return math.floor(t) * bin_capacity / k
+
+
+def dff_bound(items, bin_capacity, max_k=10):
+    """
+    Lower bound from dual feasible functions.
+
+    Applies the Fekete-Schepers functions u^(k) for k = 1..max_k on top
+    of the Martello-Toth function U^(ε) (sizes above C - ε count as C,
+    sizes below ε count as 0) and takes the best ⌈Σ f(s_i) / C⌉. With
+    prefix sums each (k, ε) pair costs O(log n).
+    """
+    sizes = sorted(items)
+    n = len(sizes)
+    half = bin_capacity / 2
+    thresholds = [0.0] + sizes[:bisect_right(sizes, half)]
+
+    best = 0
+    for k in range(1, max_k + 1):
+        prefix = [0.0]
+        for size in sizes:
+            prefix.append(prefix[-1] + _fekete_schepers(size, k, bin_capacity))
+
+        for eps in thresholds:
+            low = bisect_left(sizes, eps)
+            high = bisect_right(sizes, bin_capacity - eps)
+            total = (n - high) * bin_capacity + prefix[high] - prefix[low]
+            best = max(best, _ceil(total / bin_capacity))
+    return best
+
+
+def lower_bound(items, bin_capacity):
+    """Best of the L1, L2 and dual feasible function bounds."""
+    if not items:
+        return 0
+    return max(l1_bound(items, bin_capacity),
+               l2_bound(items, bin_capacity),
+               dff_bound(items, bin_capacity))
+
+
+# ============================================================================
+# EXACT SOLVER
+# ============================================================================
+
+ExactResult = namedtuple(
+    "ExactResult", ["num_bins", "assignment", "optimal", "lower_bound", "nodes"])
+
+
+class _Timeout(Exception):
+    pass
+
+
+class _Stopped(Exception):
+    pass
+
+
+class _Search:
+    """
+    Bin completion search for a packing into a fixed number of bins.
+
+    Each level fills one bin: it takes the largest remaining item and tries
+    every maximal set of other items that fits beside it (nothing left out
+    would still fit), fullest first. Equal sizes are grouped so the same
+    multiset is never tried twice. Branches are cut when
+    - the space wasted so far exceeds bins * C - Σ s_i,
+    - L2 of the remaining items needs more bins than are left,
+    - the multiset of remaining items already failed with as many bins
+      left (memoization).
+    Completions that a single larger left-out item could improve on are
+    skipped, and an item that fits exactly with one other item is always
+    paired with it.
+    """
+
+    def __init__(self, sizes, bin_capacity, num_bins, deadline, stop=None):
+        self.sizes = sizes
+        self.bin_capacity = bin_capacity
+        self.num_bins = num_bins
+        self.deadline = deadline
+        self.stop = stop
+        self.nodes = 0
+        # Remaining sizes -> most bins they were known not to fit in
+        self.failed = {}
+
+    def run(self, remaining=None, bins_left=None):
+        """
+        Return a packing as a list of bins of positions into `sizes`, or None.
+
+        `remaining` are positions in increasing order (decreasing size).
+        """
+        if remaining is None:
+            remaining = tuple(range(len(self.sizes)))
+        if bins_left is None:
+            bins_left = self.num_bins
+        return self._fill(remaining, bins_left)
+
+    def _fill(self, remaining, bins_left):
+        self.nodes += 1
+        if self.nodes % 32 == 0:
+            if time.perf_counter() > self.deadline:
+                raise _Timeout()
+            if self.stop is not None and self.stop.value:
+                raise _Stopped()
+
+        if not remaining:
+            return []
+        if bins_left == 0:
+            return None
+
+        sizes = self.sizes
+        key = tuple(sizes[p] for p in remaining)
+        if self.failed.get(key, -1) >= bins_left:
+            return None
+        waste_left = bins_left * self.bin_capacity - math.fsum(key)
+        if waste_left < -EPS or l2_bound(key, self.bin_capacity) > bins_left:
+            self.failed[key] = bins_left
+            return None
+
+        for chosen in self.completions(remaining, waste_left):
+            taken = set(chosen)
+            rest = tuple(p for p in remaining if p not in taken)
+            packing = self._fill(rest, bins_left - 1)
+            if packing is not None:
+                packing.append(chosen)
+                return packing
+
+        self.failed[key] = bins_left
+        return None
+
+    def completions(self, remaining, waste_left):
+        """Maximal bins holding remaining[0], fullest first."""
+        sizes = self.sizes
+        capacity = self.bin_capacity
+        first = remaining[0]
+
+        # Group the other items by size, largest first
+        groups = []
+        for p in remaining[1:]:
+            if groups and sizes[groups[-1][-1]] == sizes[p]:
+                groups[-1].append(p)
+            else:
+                groups.append([p])
+
+        # Dominance: a partner that fills the bin exactly is always best
+        for group in groups:
+            if sizes[first] + sizes[group[0]] == capacity:
+                return [(first, group[0])]
+
+        available = [0.0] * (len(groups) + 1)
+        for j in range(len(groups) - 1, -1, -1):
+            available[j] = available[j + 1] + sizes[groups[j][0]] * len(groups[j])
+
+        found = []
+        chosen = [first]
+        left_out = []
+
+        def dominated(total):
+            # Swapping one or two packed items for a single larger item
+            # that was left out gives a bin at least as good
+            packed = [sizes[p] for p in chosen[1:]]
+            for i, y in enumerate(packed):
+                for z in left_out:
+                    if z > y and total - y + z <= capacity:
+                        return True
+                for y2 in packed[i + 1:]:
+                    for z in left_out:
+                        if z >= y + y2 and total - y - y2 + z <= capacity:
+                            return True
+            return False
+
+        def extend(j, total, smallest_left_out):
+            if capacity - (total + available[j]) > waste_left + EPS:
+                return
+            if j == len(groups):
+                # Keep only maximal sets that waste no more than allowed
+                if (total + smallest_left_out > capacity
+                        and capacity - total <= waste_left + EPS
+                        and not dominated(total)):
+                    found.append((total, tuple(chosen)))
+                return
+
+            group = groups[j]
+            size = sizes[group[0]]
+            totals = [total]
+            while len(totals) <= len(group) and totals[-1] + size <= capacity:
+                totals.append(totals[-1] + size)
+
+            for count in range(len(totals) - 1, -1, -1):
+                if count < len(group):
+                    left_out.append(size)
+                chosen.extend(group[:count])
+                extend(j + 1, totals[count], size if count < len(group) else smallest_left_out)
+                del chosen[len(chosen) - count:]
+                if count < len(group):
+                    left_out.pop()
+
+        extend(0, sizes[first], math.inf)
+        found.sort(key=lambda entry: -entry[0])
+        return [bin_items for _, bin_items in found]
+
+
+def _first_fit_decreasing(sizes, bin_capacity):
+    tree = MinLoadTree(bin_capacity, len(sizes))
+    assignment = [tree.place(size) for size in sizes]
+    return len(tree), assignment
+
+
+_stop = None
+
+
+def _init_worker(stop):
+    global _stop
+    _stop = stop
+
+
+def _solve_subtree(task):
+    sizes, bin_capacity, num_bins, deadline, chosen = task
+    search = _Search(sizes, bin_capacity, num_bins, deadline, _stop)
+    taken = set(chosen)
+    rest = tuple(p for p in range(len(sizes)) if p not in taken)
+    packing, timed_out = None, False
+    try:
+        packing = search.run(rest, num_bins - 1)
+    except _Timeout:
+        timed_out = True
+    except _Stopped:
+        pass
+    if packing is not None:
+        packing.append(chosen)
+        _stop.value = 1
+    return packing, timed_out, search.nodes
+
+
+def _feasible(sizes, bin_capacity, num_bins, deadline, pool, stop):
+    """
+    Search for a packing into num_bins bins.
+
+    With a pool, every completion of the first bin is searched as its own
+    subtree; the first worker to succeed stops the others.
+    """
+    search = _Search(sizes, bin_capacity, num_bins, deadline)
+    if pool is None:
+        try:
+            return search.run(), False, search.nodes
+        except _Timeout:
+            return None, True, search.nodes
+
+    if not sizes:
+        return [], False, 0
+    waste_left = num_bins * bin_capacity - math.fsum(sizes)
+    if waste_left < -EPS:
+        return None, False, 0
+
+    stop.value = 0
+    tasks = [(sizes, bin_capacity, num_bins, deadline, chosen)
+             for chosen in search.completions(tuple(range(len(sizes))), waste_left)]
+    result, timed_out, nodes = None, False, 0
+    for packing, stopped, count in pool.imap_unordered(_solve_subtree, tasks):
+        nodes += count
+        timed_out = timed_out or stopped
+        if packing is not None:
+            result = packing
+            break
+    if result is not None:
+        timed_out = False
+    return result, timed_out, nodes
+
+
+def solve_exact(items, bin_capacity, time_limit=10.0, workers=1):
+    """
+    Find an optimal bin packing by branch and bound.
+
+    First Fit Decreasing gives the incumbent. If it does not match
+    lower_bound(), the solver asks for a packing into lower_bound(),
+    lower_bound() + 1, ... bins until one is found, which is then optimal.
+    With workers > 1 the subtrees below the first bin are searched in a
+    process pool.
+
+    Args:
+        items: List of item sizes
+        bin_capacity: Capacity of every bin
+        time_limit: Seconds before giving up and returning the incumbent
+        workers: Number of processes searching subtrees
+
+    Returns:
+        ExactResult(num_bins, assignment, optimal, lower_bound, nodes) where
+        assignment[item_id] is the bin of each item and optimal tells
+        whether num_bins is proven optimal
+    """
+    deadline = time.perf_counter() + time_limit
+    bound = lower_bound(items, bin_capacity)
+
+    order = sorted(range(len(items)), key=lambda i: -items[i])
+    sizes = [items[i] for i in order]
+    best, best_sorted = _first_fit_decreasing(sizes, bin_capacity)
+
+    nodes = 0
+    optimal = best <= bound
+    if not optimal:
+        pool = stop = None
+        if workers > 1:
+            stop = Value("i", 0)
+            pool = Pool(workers, initializer=_init_worker, initargs=(stop,))
+        try:
+            timed_out = False
+            for target in range(bound, best):
+                packing, timed_out, count = _feasible(
+                    sizes, bin_capacity, target, deadline, pool, stop)
+                nodes += count
+                if timed_out:
+                    break
+                if packing is not None:
+                    best = len(packing)
+                    for b, positions in enumerate(packing):
+                        for position in positions:
+                            best_sorted[position] = b
+                    break
+            optimal = not timed_out
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+    assignment = [0] * len(items)
+    for position, item_id in enumerate(order):
+        assignment[item_id] = best_sorted[position]
+
+    # Number the bins in order of their first item
+    renumber = {}
+    assignment = [renumber.setdefault(b, len(renumber)) for b in assignment]
+
+    return ExactResult(best, assignment, optimal, bound, nodes)
+
+
+def performance_ratio(items, bin_capacity, num_bins, time_limit=10.0):
+    """
+    Ratio of a packing's bin count to the optimum.
+
+    Returns (ratio, exact): when the solver cannot prove optimality within
+    the time limit the ratio is taken against the lower bound instead, so
+    it is an upper estimate of the true ratio.
+    """
+    result = solve_exact(items, bin_capacity, time_limit)
+    if result.optimal:
+        return num_bins / result.num_bins, True
+    return num_bins / max(result.lower_bound, 1), False
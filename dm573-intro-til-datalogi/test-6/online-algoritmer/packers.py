@@ -0,0 +1,366 @@
+import random
+from abc import ABC, abstractmethod
+
+from bin_packing import MinLoadTree
+
+
+class Packer(ABC):
+    """
+    Base class for online bin packing policies.
+
+    Items arrive one at a time through push(), which returns the index of
+    the bin the item was put in. A packer only keeps the bin loads and the
+    item -> bin assignment, never the items themselves, so the same item
+    stream can drive several packers at once (see drive()).
+
+    Subclasses implement _place(item_size), which returns the index of
+    the chosen bin or -1 to open a new one. Packers that can close bins
+    (used by bounded_packing.BoundedSpacePacker) also implement
+    _close_bin(bin_idx), after which _place never returns that bin.
+    """
+
+    name = "packer"
+
+    def __init__(self, bin_capacity):
+        self.bin_capacity = bin_capacity
+        self.loads = []
+        self.assignment = []
+
+    @property
+    def num_bins(self):
+        return len(self.loads)
+
+    def push(self, item_size):
+        """Pack one item and return the index of its bin."""
+        bin_idx = self._place(item_size)
+        if bin_idx < 0:
+            bin_idx = self._open_bin(item_size)
+        else:
+            self._add(bin_idx, item_size)
+        self._record(bin_idx)
+        return bin_idx
+
+    def extend(self, items):
+        """Pack every item of an iterable."""
+        for item_size in items:
+            self.push(item_size)
+        self.finish()
+        return self
+
+    def finish(self):
+        """Called when the stream ends. Only offline packers need it."""
+
+    def bins(self, items):
+        """
+        Rebuild the bins in the format used by first_fit and print_bins.
+
+        Args:
+            items: The item sizes that were pushed, in order
+
+        Returns:
+            List of bins, each a list of (item_id, item_size) tuples
+        """
+        bins = [[] for _ in range(self.num_bins)]
+        for item_id, (bin_idx, item_size) in enumerate(zip(self.assignment, items)):
+            bins[bin_idx].append((item_id, item_size))
+        return bins
+
+    @abstractmethod
+    def _place(self, item_size):
+        """Return the index of the bin for the item, or -1 to open a new one."""
+
+    def _record(self, bin_idx):
+        # Called with the bin of every pushed item, once it is packed
+        self.assignment.append(bin_idx)
+
+    def _open_bin(self, item_size):
+        # Start from 0 so the running total matches sum() over the bin
+        self.loads.append(0 + item_size)
+        return len(self.loads) - 1
+
+    def _add(self, bin_idx, item_size):
+        self.loads[bin_idx] += item_size
+
+
+class NextFitPacker(Packer):
+    """Next Fit (NF): only the most recently opened bin is considered."""
+
+    name = "next-fit"
+
+    def _place(self, item_size):
+        if self.loads and self.loads[-1] + item_size <= self.bin_capacity:
+            return len(self.loads) - 1
+        return -1
+
+
+class FirstFitPacker(Packer):
+    """First Fit (FF): the leftmost bin with room, found in O(log bins)."""
+
+    name = "first-fit"
+
+    def __init__(self, bin_capacity):
+        super().__init__(bin_capacity)
+        self._tree = MinLoadTree(bin_capacity)
+        # The tree keeps the running totals, so share its list of loads
+        self.loads = self._tree.loads
+
+    def _place(self, item_size):
+        return self._tree.find(item_size)
+
+    def _open_bin(self, item_size):
+        return self._tree.open_bin(item_size)
+
+    def _add(self, bin_idx, item_size):
+        self._tree.add(bin_idx, item_size)
+
+    def _close_bin(self, bin_idx):
+        self._tree.remove(bin_idx)
+
+
+class OrderedLoadIndex:
+    """
+    Bins ordered by (load, bin index), stored as a treap.
+
+    The tree is kept in flat lists indexed by bin, with bin i stored in
+    node i, so insert, remove and the fit queries all take O(log bins)
+    expected time without allocating a node object per bin.
+    """
+
+    def __init__(self, seed=0):
+        self._rng = random.Random(seed)
+        self._keys = []
+        self._priority = []
+        self._left = []
+        self._right = []
+        self._root = -1
+
+    def insert(self, bin_idx, load):
+        """Add a new bin. Bins must be inserted in index order."""
+        self._keys.append((load, bin_idx))
+        self._priority.append(self._rng.random())
+        self._left.append(-1)
+        self._right.append(-1)
+        self._link(bin_idx)
+
+    def update(self, bin_idx, load):
+        """Move a bin to its new load."""
+        self._unlink(bin_idx)
+        self._keys[bin_idx] = (load, bin_idx)
+        self._link(bin_idx)
+
+    def remove(self, bin_idx):
+        """Take a bin out of the index for good."""
+        self._unlink(bin_idx)
+
+    def tightest_fit(self, item_size, bin_capacity):
+        """
+        Return the fullest bin that still fits the item, or -1.
+
+        Ties go to the lowest bin index.
+        """
+        keys, left, right = self._keys, self._left, self._right
+
+        # Largest load L with L + item_size <= bin_capacity
+        best_load = None
+        node = self._root
+        while node != -1:
+            load = keys[node][0]
+            if load + item_size <= bin_capacity:
+                best_load = load
+                node = right[node]
+            else:
+                node = left[node]
+        if best_load is None:
+            return -1
+
+        # Lowest bin index holding that load
+        found = -1
+        node = self._root
+        while node != -1:
+            if keys[node][0] >= best_load:
+                found = node
+                node = left[node]
+            else:
+                node = right[node]
+        return found
+
+    def emptiest(self):
+        """Return the bin with the smallest load (lowest index on ties), or -1."""
+        node = self._root
+        if node == -1:
+            return -1
+        left = self._left
+        while left[node] != -1:
+            node = left[node]
+        return node
+
+    def _link(self, node):
+        lower, upper = self._split(self._root, self._keys[node])
+        self._left[node] = self._right[node] = -1
+        self._root = self._merge(self._merge(lower, node), upper)
+
+    def _unlink(self, node):
+        load, bin_idx = self._keys[node]
+        lower, rest = self._split(self._root, (load, bin_idx))
+        _, upper = self._split(rest, (load, bin_idx + 1))
+        self._root = self._merge(lower, upper)
+
+    def _split(self, node, key):
+        # Split into (keys < key, keys >= key)
+        if node == -1:
+            return -1, -1
+        if self._keys[node] < key:
+            lower, upper = self._split(self._right[node], key)
+            self._right[node] = lower
+            return node, upper
+        lower, upper = self._split(self._left[node], key)
+        self._left[node] = upper
+        return lower, node
+
+    def _merge(self, lower, upper):
+        if lower == -1:
+            return upper
+        if upper == -1:
+            return lower
+        if self._priority[lower] > self._priority[upper]:
+            self._right[lower] = self._merge(self._right[lower], upper)
+            return lower
+        self._left[upper] = self._merge(lower, self._left[upper])
+        return upper
+
+
+class _IndexedPacker(Packer):
+    """Packer that keeps its bins in an OrderedLoadIndex."""
+
+    def __init__(self, bin_capacity):
+        super().__init__(bin_capacity)
+        self._index = OrderedLoadIndex()
+
+    def _open_bin(self, item_size):
+        bin_idx = super()._open_bin(item_size)
+        self._index.insert(bin_idx, self.loads[bin_idx])
+        return bin_idx
+
+    def _add(self, bin_idx, item_size):
+        super()._add(bin_idx, item_size)
+        self._index.update(bin_idx, self.loads[bin_idx])
+
+    def _close_bin(self, bin_idx):
+        self._index.remove(bin_idx)
+
+
+class BestFitPacker(_IndexedPacker):
+    """Best Fit (BF): the fullest bin that still has room."""
+
+    name = "best-fit"
+
+    def _place(self, item_size):
+        return self._index.tightest_fit(item_size, self.bin_capacity)
+
+
+class WorstFitPacker(_IndexedPacker):
+    """Worst Fit (WF): the emptiest bin, if the item fits in it."""
+
+    name = "worst-fit"
+
+    def _place(self, item_size):
+        bin_idx = self._index.emptiest()
+        if bin_idx >= 0 and self.loads[bin_idx] + item_size <= self.bin_capacity:
+            return bin_idx
+        return -1
+
+
+class HarmonicPacker(Packer):
+    """
+    Harmonic-k: items are split into k size classes.
+
+    Class j < k holds items in (C/(j+1), C/j] and packs exactly j of them
+    per bin. Class k holds items of size at most C/k and packs them with
+    Next Fit. Every class has a single open bin.
+    """
+
+    name = "harmonic"
+
+    def __init__(self, bin_capacity, k=6):
+        super().__init__(bin_capacity)
+        self.k = k
+        self.name = f"harmonic-{k}"
+        # Open bin and the number of items in it, per class
+        self._open = {}
+
+    def _size_class(self, item_size):
+        if item_size <= 0:
+            return self.k
+        return max(1, min(self.k, int(self.bin_capacity / item_size)))
+
+    def _place(self, item_size):
+        j = self._size_class(item_size)
+        if j not in self._open:
+            return -1
+
+        bin_idx, count = self._open[j]
+        if j < self.k:
+            fits = count < j and self.loads[bin_idx] + item_size <= self.bin_capacity
+        else:
+            fits = self.loads[bin_idx] + item_size <= self.bin_capacity
+        if fits:
+            self._open[j] = (bin_idx, count + 1)
+            return bin_idx
+        return -1
+
+    def _open_bin(self, item_size):
+        bin_idx = super()._open_bin(item_size)
+        self._open[self._size_class(item_size)] = (bin_idx, 1)
+        return bin_idx
+
+
+class FirstFitDecreasingPacker(FirstFitPacker):
+    """
+    First Fit Decreasing (FFD).
+
+    FFD is an offline algorithm: it needs all items before it can place
+    any of them. push() only records the item and returns None; the items
+    are packed largest first when finish() is called, and calling it
+    again repacks everything pushed so far.
+    """
+
+    name = "first-fit-decreasing"
+
+    def __init__(self, bin_capacity):
+        super().__init__(bin_capacity)
+        self._pending = []
+
+    def push(self, item_size):
+        self._pending.append(item_size)
+        return None
+
+    def finish(self):
+        pending = self._pending
+        order = sorted(range(len(pending)), key=lambda i: -pending[i])
+
+        self._tree = MinLoadTree(self.bin_capacity, len(pending))
+        self.loads = self._tree.loads
+        assignment = [0] * len(pending)
+        for item_id in order:
+            assignment[item_id] = self._tree.place(pending[item_id])
+        self.assignment = assignment
+
+
+def drive(items, packers):
+    """
+    Feed one item stream to several packers in a single pass.
+
+    Args:
+        items: Iterable of item sizes, e.g. a generator reading a live feed
+        packers: List of Packer instances
+
+    Returns:
+        The packers, after finish() has been called on each of them
+    """
+    for item_size in items:
+        for packer in packers:
+            packer.push(item_size)
+
+    for packer in packers:
+        packer.finish()
+    return packers
@@ -0,0 +1,59 @@
+import heapq
+
+
+def iter_list_scheduling(jobs, m):
+    """
+    Streaming List Scheduling (LS).
+
+    Machines are kept in a binary heap of (finish_time, machine_id), so
+    each job is assigned in O(log m). On equal finish times the machine
+    with the lowest index wins, exactly like min(range(m), ...).
+
+    Args:
+        jobs: Iterable of job processing times
+        m: Number of machines
+
+    Yields:
+        Tuples (machine_id, start_time, end_time, job_id) as jobs arrive
+    """
+    machines = [(0, machine_id) for machine_id in range(m)]
+
+    for job_id, job_time in enumerate(jobs):
+        start_time, machine_id = machines[0]
+        end_time = start_time + job_time
+        heapq.heapreplace(machines, (end_time, machine_id))
+        yield machine_id, start_time, end_time, job_id
+
+
+def list_scheduling(jobs, m):
+    """
+    List Scheduling (LS) algorithm.
+
+    Args:
+        jobs: List of job processing times
+        m: Number of machines
+
+    Returns:
+        schedule: List of tuples (machine_id, start_time, end_time, job_id)
+        makespan: Total completion time
+    """
+    schedule = list(iter_list_scheduling(jobs, m))
+    makespan = max((end for _, _, end, _ in schedule), default=0)
+    return schedule, makespan
+
+
+def print_schedule(schedule, makespan, m):
+    """Print the schedule in a readable format."""
+    print(f"Number of machines: {m}")
+    print(f"Makespan: {makespan}\n")
+
+    # Group by machine in a single pass over the schedule
+    machine_jobs = [[] for _ in range(m)]
+    for s in schedule:
+        machine_jobs[s[0]].append(s)
+
+    for machine_id in range(m):
+        print(f"Machine {machine_id}:")
+        for _, start, end, job_id in machine_jobs[machine_id]:
+            print(f"  Job {job_id}: [{start}, {end})")
+        print()
@@ -0,0 +1,253 @@
+import heapq
+import math
+from bisect import bisect_right
+from collections import namedtuple
+
+
+# The first four fields are the schedule tuple used by list_scheduling
+JobRecord = namedtuple(
+    "JobRecord",
+    ["machine_id", "start", "end", "job_id", "release", "wait", "flow"])
+
+
+# Priority of a waiting job under each queue policy (smallest first)
+QUEUE_POLICIES = {
+    "ls": lambda job_id, release, job_time: (release, job_id),
+    "lpt": lambda job_id, release, job_time: (-job_time, release, job_id),
+    "spt": lambda job_id, release, job_time: (job_time, release, job_id),
+}
+
+POLICIES = list(QUEUE_POLICIES) + ["least-loaded"]
+
+
+class Availability:
+    """
+    Availability windows of the machines.
+
+    windows[i] is a sorted list of non-overlapping (start, end) intervals
+    in which machine i may work. Jobs are not preempted, so a job has to
+    fit completely inside one window.
+    """
+
+    def __init__(self, windows):
+        self.windows = windows
+        self._ends = [[end for _, end in machine] for machine in windows]
+
+    def earliest_start(self, machine_id, time, job_time):
+        """Return the first time >= `time` the job can run on the machine."""
+        windows = self.windows[machine_id]
+        k = bisect_right(self._ends[machine_id], time)
+        for start, end in windows[k:]:
+            start = max(start, time)
+            if start + job_time <= end:
+                return start
+        return math.inf
+
+
+def simulate(jobs, m, policy="ls", windows=None):
+    """
+    Discrete-event simulation of online scheduling on m machines.
+
+    Jobs arrive over time. The event loop keeps the next release and the
+    running jobs in priority queues and jumps from event to event. Under
+    the queue policies ("ls", "lpt", "spt") released jobs wait in a
+    priority queue and an idle machine takes the first job in it. Under
+    "least-loaded" every job is committed to a machine the moment it is
+    released: the machine whose queue of committed work ends first, so the
+    policy looks ahead at the work already promised to each machine. With
+    availability windows it is the machine that can start the job first.
+    A job that fits in no idle machine's windows waits for a busy one;
+    ValueError is raised only if no machine has a window long enough.
+    ValueError is also raised when a job is released before the job
+    read before it.
+
+    Args:
+        jobs: Iterable of (release_time, job_time) in order of release;
+            it is read lazily, so it may be a generator
+        m: Number of machines
+        policy: One of POLICIES
+        windows: Optional list with a list of (start, end) availability
+            windows per machine
+
+    Yields:
+        A JobRecord for every job, as soon as its start time is decided
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy: {policy}")
+    availability = Availability(windows) if windows is not None else None
+    jobs = _in_release_order(jobs)
+
+    if policy == "least-loaded":
+        yield from _simulate_least_loaded(jobs, m, availability)
+    else:
+        yield from _simulate_queue(jobs, m, QUEUE_POLICIES[policy], availability)
+
+
+def _in_release_order(jobs):
+    # The stream is read lazily, so it is checked instead of sorted
+    last = -math.inf
+    for job_id, job in enumerate(jobs):
+        if job[0] < last:
+            raise ValueError(f"Job {job_id} is released at {job[0]}, before job "
+                             f"{job_id - 1} at {last}")
+        last = job[0]
+        yield job
+
+
+def _simulate_queue(jobs, m, priority, availability):
+    jobs = enumerate(jobs)
+    next_job = next(jobs, None)
+
+    idle = list(range(m))        # Heap of idle machine ids
+    running = []                 # Heap of (end_time, machine_id)
+    waiting = []                 # Heap of (priority, job_id, release, job_time)
+
+    while next_job is not None or running or waiting:
+        next_release = next_job[1][0] if next_job is not None else math.inf
+        next_finish = running[0][0] if running else math.inf
+        now = min(next_release, next_finish)
+        if now == math.inf:
+            raise ValueError("Some jobs fit in no availability window")
+
+        while running and running[0][0] == now:
+            _, machine_id = heapq.heappop(running)
+            heapq.heappush(idle, machine_id)
+
+        while next_job is not None and next_job[1][0] == now:
+            job_id, (release, job_time) = next_job
+            heapq.heappush(waiting, (priority(job_id, release, job_time),
+                                     job_id, release, job_time))
+            next_job = next(jobs, None)
+
+        deferred = []
+        while waiting:
+            # Zero-length jobs started just now have already finished
+            while running and running[0][0] == now:
+                _, machine_id = heapq.heappop(running)
+                heapq.heappush(idle, machine_id)
+            if not idle:
+                break
+
+            entry = heapq.heappop(waiting)
+            _, job_id, release, job_time = entry
+            machine_id, start = _pick_idle(idle, availability, now, job_time)
+            if start == math.inf:
+                # A busy machine may still have a window for it later
+                if not any(availability.earliest_start(k, now, job_time) < math.inf
+                           for k in range(m)):
+                    raise ValueError(f"Job {job_id} fits in no availability window")
+                deferred.append(entry)
+                continue
+            end = start + job_time
+            heapq.heappush(running, (end, machine_id))
+            yield JobRecord(machine_id, start, end, job_id, release,
+                            start - release, end - release)
+        for entry in deferred:
+            heapq.heappush(waiting, entry)
+
+
+def _pick_idle(idle, availability, now, job_time):
+    """Take the idle machine that can start the job first, if any can."""
+    # Without windows every idle machine can start now: take the lowest id
+    if availability is None:
+        return heapq.heappop(idle), now
+
+    best = min(range(len(idle)), key=lambda i: (
+        availability.earliest_start(idle[i], now, job_time), idle[i]))
+    machine_id = idle[best]
+    start = availability.earliest_start(machine_id, now, job_time)
+    if start == math.inf:
+        return None, start
+    idle[best] = idle[-1]
+    idle.pop()
+    heapq.heapify(idle)
+    return machine_id, start
+
+
+def _simulate_least_loaded(jobs, m, availability):
+    if availability is not None:
+        yield from _simulate_least_loaded_windows(jobs, m, availability)
+        return
+
+    # Heap of (time the committed work ends, machine_id)
+    ready = [(0, machine_id) for machine_id in range(m)]
+
+    for job_id, (release, job_time) in enumerate(jobs):
+        free_at, machine_id = ready[0]
+        start = max(free_at, release)
+        end = start + job_time
+        heapq.heapreplace(ready, (end, machine_id))
+        yield JobRecord(machine_id, start, end, job_id, release,
+                        start - release, end - release)
+
+
+def _simulate_least_loaded_windows(jobs, m, availability):
+    # With windows the machine whose work ends first may have no room for
+    # the job, so every machine is asked for its earliest possible start
+    free_at = [0] * m
+
+    for job_id, (release, job_time) in enumerate(jobs):
+        start, machine_id = min(
+            (availability.earliest_start(k, max(free_at[k], release), job_time), k)
+            for k in range(m))
+        if start == math.inf:
+            raise ValueError(f"Job {job_id} fits in no availability window")
+        end = start + job_time
+        free_at[machine_id] = end
+        yield JobRecord(machine_id, start, end, job_id, release,
+                        start - release, end - release)
+
+
+def simulate_schedule(jobs, m, policy="ls", windows=None):
+    """
+    Run simulate() and collect the result like list_scheduling does.
+
+    Returns:
+        schedule: List of tuples (machine_id, start_time, end_time, job_id)
+        makespan: Total completion time
+    """
+    schedule = [record[:4] for record in simulate(jobs, m, policy, windows)]
+    makespan = max((end for _, _, end, _ in schedule), default=0)
+    return schedule, makespan
+
+
+class Metrics:
+    """Running summary of a stream of JobRecords."""
+
+    def __init__(self):
+        self.jobs = 0
+        self.makespan = 0
+        self.total_wait = 0
+        self.total_flow = 0
+        self.max_flow = 0
+
+    def add(self, record):
+        self.jobs += 1
+        self.makespan = max(self.makespan, record.end)
+        self.total_wait += record.wait
+        self.total_flow += record.flow
+        self.max_flow = max(self.max_flow, record.flow)
+        return record
+
+    def __str__(self):
+        if not self.jobs:
+            return "No jobs"
+        return (f"Jobs: {self.jobs}, makespan: {self.makespan}, "
+                f"mean wait: {self.total_wait / self.jobs:.3f}, "
+                f"mean flow: {self.total_flow / self.jobs:.3f}, "
+                f"max flow: {self.max_flow}")
+
+
+if __name__ == "__main__":
+    # (release_time, job_time)
+    jobs = [(0, 3), (0, 2), (1, 4), (2, 1), (2, 2), (5, 3)]
+    m = 2
+
+    for policy in POLICIES:
+        metrics = Metrics()
+        print(f"Policy: {policy}")
+        for record in simulate(jobs, m, policy):
+            metrics.add(record)
+            print(f"  Job {record.job_id} -> Machine {record.machine_id} "
+                  f"[{record.start}, {record.end})")
+        print(f"  {metrics}\n")
@@ -0,0 +1,92 @@
+import random
+from decimal import Decimal
+from fractions import Fraction
+
+from bin_packing import MinLoadTree, first_fit, first_fit_compact
+
+
+def baseline_first_fit(items, bin_capacity):
+    # The original quadratic First Fit
+    bins = []
+    for item_id, item_size in enumerate(items):
+        for bin_items in bins:
+            if sum(size for _, size in bin_items) + item_size <= bin_capacity:
+                bin_items.append((item_id, item_size))
+                break
+        else:
+            bins.append([(item_id, item_size)])
+    return bins, len(bins)
+
+
+def test_floats_match_baseline():
+    rng = random.Random(0)
+    for _ in range(200):
+        items = [round(rng.uniform(0.01, 1.0), rng.choice([1, 2, 6]))
+                 for _ in range(rng.randint(0, 80))]
+        assert first_fit(items, 1.0) == baseline_first_fit(items, 1.0)
+
+
+def test_tree_grows_past_size_hint():
+    tree = MinLoadTree(10, size_hint=1)
+    for size in [6, 6, 6, 3, 3, 3, 5]:
+        bin_idx = tree.find(size)
+        if bin_idx < 0:
+            tree.open_bin(size)
+        else:
+            tree.add(bin_idx, size)
+    assert list(tree.loads) == [9, 9, 9, 5]
+    assert tree.find(1) == 0
+    assert tree.find(5) == 3
+    assert tree.find(6) == -1
+
+
+def test_exact_types_match_baseline():
+    rng = random.Random(1)
+    for _ in range(50):
+        fractions = [Fraction(rng.randint(1, 12), 12) for _ in range(rng.randint(1, 60))]
+        decimals = [Decimal(rng.randint(1, 10)) / 10 for _ in range(rng.randint(1, 60))]
+        for items, capacity in [(fractions, 1), (decimals, Decimal(1)), (decimals, 1),
+                                ([rng.randint(1, 10) for _ in range(40)], 10)]:
+            assert first_fit(items, capacity) == baseline_first_fit(items, capacity)
+
+
+def test_exact_types_are_not_converted_to_float():
+    # 0.1 summed ten times as a float is below 1, as Decimal it is exactly 1
+    items = [Decimal("0.1")] * 10 + [Decimal("0.1")]
+    result = first_fit_compact(items, Decimal(1))
+    assert result.num_bins == 2
+    assert result.heights() == [Decimal(1), Decimal("0.1")]
+    assert all(type(load) is Fraction
+               for load in first_fit_compact([Fraction(1, 3)] * 4, 1).loads)
+
+
+def test_fixed_point_scale():
+    items = [0.1] * 30
+    result = first_fit_compact(items, 1.0, scale=10 ** 9)
+    assert result.num_bins == 3
+    assert result.heights() == [1.0, 1.0, 1.0]
+    assert [list(result.items_in(b)) for b in range(3)] == [
+        list(range(0, 10)), list(range(10, 20)), list(range(20, 30))]
+
+
+def test_place_matches_find_and_add():
+    rng = random.Random(2)
+    for sizes in ([rng.uniform(0, 0.1) for _ in range(500)],
+                  [rng.random() for _ in range(500)],
+                  [Fraction(rng.randint(1, 9), 10) for _ in range(200)]):
+        placed = MinLoadTree(1)
+        searched = MinLoadTree(1)
+        for i, size in enumerate(sizes):
+            if i % 50 == 49:
+                # find(), add() and open_bin() see the bins place() filled
+                assert placed.find(size) == searched.find(size)
+                placed.open_bin(size)
+                searched.open_bin(size)
+                continue
+            bin_idx = searched.find(size)
+            if bin_idx >= 0:
+                searched.add(bin_idx, size)
+            else:
+                bin_idx = searched.open_bin(size)
+            assert placed.place(size) == bin_idx
+        assert list(placed.loads) == list(searched.loads)
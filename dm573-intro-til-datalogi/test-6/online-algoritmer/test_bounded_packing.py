@@ -0,0 +1,72 @@
+import io
+import random
+
+import pytest
+
+from bounded_packing import BoundedSpacePacker, FileSink
+from packers import BestFitPacker, FirstFitPacker, NextFitPacker
+
+
+def random_items(seed, n=500):
+    rng = random.Random(seed)
+    return [rng.randint(1, 100) for _ in range(n)]
+
+
+def pack(items, max_open, **options):
+    closed = []
+    BoundedSpacePacker(100, max_open, closed.append, **options).extend(items)
+    assignment = [None] * len(items)
+    for record in closed:
+        for item_id in record.item_ids:
+            assignment[item_id] = record.bin_id
+    return closed, assignment
+
+
+@pytest.mark.parametrize("policy, unbounded", [("first-fit", FirstFitPacker),
+                                               ("best-fit", BestFitPacker)])
+def test_unbounded_limit_matches_packer(policy, unbounded):
+    items = random_items(0)
+    _, assignment = pack(items, len(items), policy=policy)
+    assert assignment == unbounded(100).extend(items).assignment
+
+
+def test_one_open_bin_is_next_fit():
+    items = random_items(1)
+    _, assignment = pack(items, 1)
+    assert assignment == NextFitPacker(100).extend(items).assignment
+
+
+@pytest.mark.parametrize("options", [
+    {}, {"close_rule": "fullest"}, {"policy": "best-fit", "close_below": 5},
+    {"close_rule": lambda loads: min(loads, key=loads.get)}])
+def test_every_item_in_one_closed_bin(options):
+    items = random_items(2)
+    closed, assignment = pack(items, 3, **options)
+    assert None not in assignment
+    assert sorted(record.bin_id for record in closed) == list(range(len(closed)))
+    for record in closed:
+        assert record.load == sum(items[i] for i in record.item_ids) <= 100
+
+
+def test_file_sink():
+    buffer = io.StringIO()
+    with FileSink(buffer) as sink:
+        BoundedSpacePacker(10, 2, sink).extend([6, 6, 3, 5])
+    lines = buffer.getvalue().splitlines()
+    assert lines == ["0\t9\t0,2", "1\t6\t1", "2\t5\t3"]
+
+
+@pytest.mark.parametrize("policy", ["first-fit", "best-fit"])
+def test_state_stays_bounded(policy):
+    items = random_items(3, 5000)
+    closed = []
+    packer = BoundedSpacePacker(100, 4, closed.append, policy=policy, close_rule="fullest")
+    pushed = []
+    for item_size in items:
+        pushed.append(packer.push(item_size))
+        assert len(packer.open_bins()) <= 4
+        assert len(packer._bin_ids) <= 2 * 4
+    packer.finish()
+    assert packer.num_bins == len(closed)
+    for record in closed:
+        assert all(pushed[item_id] == record.bin_id for item_id in record.item_ids)
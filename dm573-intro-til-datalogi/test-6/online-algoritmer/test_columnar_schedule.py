@@ -0,0 +1,52 @@
+import random
+
+import numpy as np
+
+from columnar_schedule import ColumnarSchedule, list_scheduling_columnar
+from scheduling import list_scheduling
+
+
+def random_jobs(seed, n=200):
+    rng = random.Random(seed)
+    return [rng.randint(1, 50) for _ in range(n)]
+
+
+def test_matches_list_scheduling():
+    for seed in range(5):
+        jobs = random_jobs(seed)
+        schedule, makespan = list_scheduling(jobs, 7)
+        columnar = list_scheduling_columnar(jobs, 7)
+        assert columnar.to_tuples() == schedule
+        assert columnar.makespan() == makespan
+
+
+def test_machine_view_matches_filter():
+    jobs = random_jobs(5)
+    schedule, _ = list_scheduling(jobs, 4)
+    columnar = ColumnarSchedule.from_tuples(schedule, 4)
+    for machine_id in range(4):
+        rows = [row for row in schedule if row[0] == machine_id]
+        start, end, job = columnar.machine_jobs(machine_id)
+        assert list(zip(start.tolist(), end.tolist(), job.tolist())) == [
+            row[1:] for row in rows]
+        assert columnar.busy_time()[machine_id] == sum(end - start)
+
+
+def test_gantt_and_utilization(tmp_path):
+    columnar = list_scheduling_columnar([3, 1, 2, 2], 2)
+    rows = columnar.gantt()
+    assert rows["machine"].tolist() == [0, 0, 1, 1]
+    assert rows["start"].tolist() == [0, 3, 0, 1]
+    assert columnar.utilization().tolist() == [1.0, 0.6]
+
+    path = tmp_path / "gantt.csv"
+    columnar.save_gantt(path)
+    saved = np.loadtxt(path, delimiter=",", skiprows=1)
+    assert saved.tolist() == [[0, 0, 0, 3], [0, 3, 3, 5], [1, 1, 0, 1], [1, 2, 1, 3]]
+
+
+def test_empty():
+    columnar = ColumnarSchedule.from_tuples([], 3)
+    assert len(columnar) == 0
+    assert columnar.makespan() == 0
+    assert columnar.utilization().tolist() == [0.0, 0.0, 0.0]
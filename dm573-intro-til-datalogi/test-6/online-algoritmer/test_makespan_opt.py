@@ -0,0 +1,54 @@
+import itertools
+import random
+import time
+
+from makespan_opt import lower_bound, solve_makespan, to_schedule
+
+
+def brute_force(jobs, m):
+    best = None
+    for assignment in itertools.product(range(m), repeat=len(jobs)):
+        loads = [0] * m
+        for job_time, machine_id in zip(jobs, assignment):
+            loads[machine_id] += job_time
+        if best is None or max(loads) < best:
+            best = max(loads)
+    return best
+
+
+def test_matches_brute_force():
+    rng = random.Random(0)
+    for _ in range(1500):
+        m = rng.randint(1, 3)
+        jobs = [rng.randint(1, rng.choice([5, 30])) for _ in range(rng.randint(1, 8))]
+        result = solve_makespan(jobs, m)
+        assert result.optimal
+        assert result.makespan == brute_force(jobs, m), (jobs, m)
+        _, makespan = to_schedule(jobs, result.assignment, m)
+        assert makespan == result.makespan
+        assert lower_bound(jobs, m) <= result.makespan <= result.lpt_makespan
+
+
+def test_equal_jobs_with_exact_fit():
+    # The two jobs of length 3 once made a feasible capacity look infeasible
+    result = solve_makespan([18, 3, 21, 25, 1, 22, 2, 26, 3, 5], 2)
+    assert result.optimal
+    assert result.makespan == 63
+
+
+def test_empty():
+    assert solve_makespan([], 3).makespan == 0
+
+
+def test_mid_sized_instances_within_a_second():
+    rng = random.Random(1)
+    for _ in range(60):
+        m = rng.randint(2, 8)
+        high = rng.choice([100, 1000])
+        jobs = [rng.randint(1, high) for _ in range(rng.randint(30, 40))]
+        started = time.perf_counter()
+        result = solve_makespan(jobs, m, time_limit=1.0)
+        assert result.optimal, (jobs, m)
+        assert time.perf_counter() - started < 1.0
+        _, makespan = to_schedule(jobs, result.assignment, m)
+        assert makespan == result.makespan >= lower_bound(jobs, m)
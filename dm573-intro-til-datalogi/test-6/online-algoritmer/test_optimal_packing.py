@@ -0,0 +1,77 @@
+import random
+from fractions import Fraction
+
+from optimal_packing import (dff_bound, l1_bound, l2_bound, lower_bound,
+                             performance_ratio, solve_exact)
+
+
+def brute_force(items, capacity):
+    # Every item goes into a used bin or the next new one, in exact
+    # arithmetic so the float order of summation does not matter
+    items = [Fraction(str(size)) for size in items]
+    capacity = Fraction(str(capacity))
+    best = len(items)
+
+    def place(i, loads):
+        nonlocal best
+        if len(loads) >= best:
+            return
+        if i == len(items):
+            best = len(loads)
+            return
+        for b in range(len(loads)):
+            if loads[b] + items[i] <= capacity:
+                loads[b] += items[i]
+                place(i + 1, loads)
+                loads[b] -= items[i]
+        loads.append(items[i])
+        place(i + 1, loads)
+        loads.pop()
+
+    place(0, [])
+    return best
+
+
+def random_instance(rng):
+    if rng.random() < 0.5:
+        return [rng.randint(1, 20) / 20 for _ in range(rng.randint(1, 10))]
+    # Sizes around a third often leave FFD above the lower bound
+    return [rng.randint(25, 45) / 100 for _ in range(rng.randint(4, 12))]
+
+
+def test_bounds_below_brute_force():
+    rng = random.Random(0)
+    for _ in range(300):
+        items = random_instance(rng)
+        optimum = brute_force(items, 1.0)
+        for bound in (l1_bound, l2_bound, dff_bound, lower_bound):
+            assert bound(items, 1.0) <= optimum, (bound.__name__, items)
+
+
+def test_solve_exact_matches_brute_force():
+    rng = random.Random(1)
+    for _ in range(300):
+        items = random_instance(rng)
+        result = solve_exact(items, 1.0)
+        assert result.optimal
+        assert result.num_bins == brute_force(items, 1.0), items
+        loads = [0.0] * result.num_bins
+        for item_size, b in zip(items, result.assignment):
+            loads[b] += item_size
+        assert max(loads) <= 1.0 + 1e-9
+
+
+def test_solve_exact_in_parallel():
+    rng = random.Random(1)
+    items = [rng.randint(20, 50) / 100 for _ in range(30)]
+    serial = solve_exact(items, 1.0)
+    parallel = solve_exact(items, 1.0, workers=2)
+    assert serial.optimal and parallel.optimal
+    assert serial.nodes > 0
+    assert serial.num_bins == parallel.num_bins
+
+
+def test_examples():
+    assert l1_bound([0.6, 0.6, 0.6], 1) == 2
+    assert l2_bound([0.6, 0.6, 0.6], 1) == 3
+    assert performance_ratio([0.5, 0.5, 0.5, 0.5], 1.0, 3) == (1.5, True)
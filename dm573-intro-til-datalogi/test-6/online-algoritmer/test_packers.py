@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from bin_packing import first_fit
+from packers import (BestFitPacker, FirstFitDecreasingPacker, FirstFitPacker,
+                     HarmonicPacker, NextFitPacker, Packer, WorstFitPacker, drive)
+
+
+def reference(items, capacity, choose):
+    # Linear scan over all bins; choose(loads, size) returns a bin or -1
+    loads, assignment = [], []
+    for size in items:
+        bin_idx = choose(loads, size, capacity)
+        if bin_idx < 0:
+            loads.append(size)
+            bin_idx = len(loads) - 1
+        else:
+            loads[bin_idx] += size
+        assignment.append(bin_idx)
+    return assignment
+
+
+def next_fit(loads, size, capacity):
+    return len(loads) - 1 if loads and loads[-1] + size <= capacity else -1
+
+
+def first(loads, size, capacity):
+    return next((b for b, load in enumerate(loads) if load + size <= capacity), -1)
+
+
+def best(loads, size, capacity):
+    fitting = [(-load, b) for b, load in enumerate(loads) if load + size <= capacity]
+    return min(fitting)[1] if fitting else -1
+
+
+def worst(loads, size, capacity):
+    if not loads:
+        return -1
+    load, b = min((load, b) for b, load in enumerate(loads))
+    return b if load + size <= capacity else -1
+
+
+def random_items(rng, n=300):
+    return [rng.randint(1, 100) for _ in range(n)]
+
+
+@pytest.mark.parametrize("packer, choose", [
+    (NextFitPacker, next_fit), (FirstFitPacker, first),
+    (BestFitPacker, best), (WorstFitPacker, worst)])
+def test_matches_linear_scan(packer, choose):
+    rng = random.Random(0)
+    for _ in range(20):
+        items = random_items(rng)
+        assert packer(100).extend(items).assignment == reference(items, 100, choose)
+
+
+def test_harmonic_classes():
+    rng = random.Random(1)
+    items = random_items(rng, 1000)
+    packer = HarmonicPacker(100, k=4).extend(items)
+    for bin_items in packer.bins(items):
+        sizes = [size for _, size in bin_items]
+        classes = {packer._size_class(size) for size in sizes}
+        assert len(classes) == 1
+        j = classes.pop()
+        assert sum(sizes) <= 100
+        if j < 4:
+            assert len(sizes) <= j
+
+
+def test_first_fit_decreasing():
+    rng = random.Random(2)
+    items = random_items(rng)
+    packer = FirstFitDecreasingPacker(100).extend(items)
+    _, num_bins = first_fit(sorted(items, reverse=True), 100)
+    assert packer.num_bins == num_bins
+    assert sum(packer.loads) == sum(items)
+    for bin_items in packer.bins(items):
+        assert sum(size for _, size in bin_items) <= 100
+
+
+def test_drive_matches_separate_runs():
+    rng = random.Random(3)
+    items = random_items(rng)
+    driven = drive(iter(items), [cls(100) for cls in (NextFitPacker, FirstFitPacker,
+                                                       BestFitPacker, WorstFitPacker)])
+    for packer in driven:
+        assert packer.assignment == type(packer)(100).extend(items).assignment
+
+
+def test_packer_needs_a_policy():
+    with pytest.raises(TypeError):
+        Packer(100)
+
+    class Incomplete(Packer):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(100)
@@ -0,0 +1,37 @@
+import random
+
+from scheduling import iter_list_scheduling, list_scheduling
+
+
+def baseline_list_scheduling(jobs, m):
+    # The original O(n·m) version: scan for the earliest free machine
+    machines = [0] * m
+    schedule = []
+    for job_id, job_time in enumerate(jobs):
+        earliest_machine = min(range(m), key=lambda i: machines[i])
+        start_time = machines[earliest_machine]
+        end_time = start_time + job_time
+        schedule.append((earliest_machine, start_time, end_time, job_id))
+        machines[earliest_machine] = end_time
+    return schedule, max(machines)
+
+
+def test_matches_baseline():
+    rng = random.Random(0)
+    for _ in range(300):
+        m = rng.randint(1, 8)
+        # Small integer times give many ties between machines
+        jobs = [rng.choice([rng.randint(0, 5), rng.uniform(0, 5)])
+                for _ in range(rng.randint(1, 60))]
+        assert list_scheduling(jobs, m) == baseline_list_scheduling(jobs, m)
+
+
+def test_streaming():
+    jobs = (t for t in [3, 1, 2, 2])
+    stream = iter_list_scheduling(jobs, 2)
+    assert next(stream) == (0, 0, 3, 0)
+    assert list(stream) == [(1, 0, 1, 1), (1, 1, 3, 2), (0, 3, 5, 3)]
+
+
+def test_no_jobs():
+    assert list_scheduling([], 3) == ([], 0)
@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from scheduling import list_scheduling
+from simulator import POLICIES, simulate, simulate_schedule
+
+
+def check_schedule(records, jobs, windows):
+    assert sorted(record.job_id for record in records) == list(range(len(jobs)))
+    by_machine = {}
+    for record in records:
+        release, job_time = jobs[record.job_id]
+        assert record.start >= release
+        assert record.end - record.start == job_time
+        assert any(start <= record.start and record.end <= end
+                   for start, end in windows[record.machine_id])
+        by_machine.setdefault(record.machine_id, []).append((record.start, record.end))
+    for intervals in by_machine.values():
+        intervals.sort()
+        for (_, end), (start, _) in zip(intervals, intervals[1:]):
+            assert end <= start
+
+
+def test_ls_without_releases_matches_list_scheduling():
+    rng = random.Random(0)
+    for _ in range(50):
+        times = [rng.randint(1, 20) for _ in range(rng.randint(1, 30))]
+        m = rng.randint(1, 5)
+        _, makespan = simulate_schedule([(0, t) for t in times], m, "ls")
+        assert makespan == list_scheduling(times, m)[1]
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+def test_job_waits_for_busy_machine(policy):
+    # Only machine 0 can hold the jobs, one after the other
+    schedule, makespan = simulate_schedule([(0, 50), (0, 5)], 2, policy,
+                                           windows=[[(0, 100)], [(0, 1)]])
+    assert [machine_id for machine_id, _, _, _ in schedule] == [0, 0]
+    assert makespan == 55
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+def test_job_that_fits_nowhere(policy):
+    with pytest.raises(ValueError):
+        simulate_schedule([(0, 50), (0, 500)], 2, policy, windows=[[(0, 100)], [(0, 1)]])
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+def test_random_windows(policy):
+    rng = random.Random(1)
+    for _ in range(30):
+        m = rng.randint(1, 4)
+        windows = []
+        for _ in range(m):
+            edges = sorted(rng.sample(range(200), 6))
+            windows.append(list(zip(edges[::2], edges[1::2])) + [(300, 10_000)])
+        jobs = sorted((rng.randint(0, 100), rng.randint(0, 30)) for _ in range(20))
+        check_schedule(list(simulate(jobs, m, policy, windows)), jobs, windows)
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+def test_releases_out_of_order(policy):
+    jobs = [(0, 3), (5, 1), (2, 4)]
+    records = simulate(iter(jobs), 2, policy)
+    with pytest.raises(ValueError, match="Job 2"):
+        list(records)
+    # Equal release times are fine
+    assert len(simulate_schedule([(1, 2), (1, 3), (4, 1)], 2, policy)[0]) == 3
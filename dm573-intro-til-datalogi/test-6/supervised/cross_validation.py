@@ -0,0 +1,140 @@
+"""
+k-fold and leave-one-out validation of the closed-form fit without refitting.
+
+The fit of find_optimal_parameters only depends on the sums
+Σx, Σy, Σx², Σxy and Σy². They are computed once for the whole dataset
+and once per fold (a single bincount pass); the training set of a fold is
+then the totals minus the fold, and the held-out loss
+
+    (1/m) Σ (a·x + b - y)²
+        = (a²·Σx² + 2ab·Σx + m·b² - 2a·Σxy - 2b·Σy + Σy²) / m
+
+is evaluated from the fold's sums. Every fold costs O(1), so leave-one-out
+over n points costs about as much as one fit. The data are centered on
+the global means first, which keeps the subtractions accurate.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+CVResult = namedtuple("CVResult", ["a_best", "b_best", "loss", "sizes", "mean_loss"])
+
+
+def _center(x, y):
+    x = np.asarray(x, dtype=np.float64).ravel()
+    y = np.asarray(y, dtype=np.float64).ravel()
+    if len(x) < 2:
+        raise ValueError("Cross-validation needs at least two points")
+    x_bar = x.mean()
+    y_bar = y.mean()
+    return x - x_bar, y - y_bar, x_bar, y_bar
+
+
+def _fold_scores(sums, totals, x_bar, y_bar):
+    """Fit on totals - fold and score on the fold, for every fold at once."""
+    n_f, sx_f, sy_f, sxx_f, sxy_f, syy_f = sums
+    n_t, sx_t, sy_t, sxx_t, sxy_t = (total - fold for total, fold
+                                     in zip(totals, (n_f, sx_f, sy_f, sxx_f, sxy_f)))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Fit on the training part, in centered coordinates
+        mx = sx_t / n_t
+        my = sy_t / n_t
+        var_x = sxx_t - n_t * mx * mx
+        a = np.where(var_x > 0, (sxy_t - n_t * mx * my) / var_x, np.nan)
+        b = my - a * mx
+
+        loss = (a * a * sxx_f + 2 * a * b * sx_f + n_f * b * b
+                - 2 * a * sxy_f - 2 * b * sy_f + syy_f) / n_f
+
+    # Back to the original coordinates: y - ȳ = a(x - x̄) + b
+    b_best = b + y_bar - a * x_bar
+    # Empty folds (possible with explicit fold numbers) hold out nothing
+    used = n_f > 0
+    mean_loss = (np.average(loss[used], weights=n_f[used])
+                 if np.all(np.isfinite(loss[used])) else np.nan)
+    return CVResult(a, b_best, np.maximum(loss, 0.0), n_f.astype(np.int64), mean_loss)
+
+
+def k_fold(x, y, k=5, folds=None, shuffle=False, seed=None):
+    """
+    k-fold cross-validation of the least squares line.
+
+    Parameters:
+    -----------
+    x, y : array_like, shape (n,)
+        The data (e.g. two columns of a Dataset)
+    k : int
+        Number of folds
+    folds : array_like of int, shape (n,), optional
+        Fold number 0..k-1 of every point. By default the points are cut
+        into k contiguous blocks of (almost) equal size, which needs
+        2 <= k <= n; empty folds of explicit fold numbers are left out of
+        mean_loss.
+    shuffle : bool
+        Assign the points to the k blocks in random order
+    seed : int, optional
+        Seed for shuffle
+
+    Returns:
+    --------
+    CVResult(a_best, b_best, loss, sizes, mean_loss)
+        Per fold: the parameters fitted without the fold, the mean squared
+        error on the fold (as calculate_loss) and its size. mean_loss is
+        the average over all held-out points. A training set whose x
+        values are all equal gives nan.
+    """
+    dx, dy, x_bar, y_bar = _center(x, y)
+    n = len(dx)
+
+    if folds is None:
+        if not 2 <= k <= n:
+            raise ValueError(f"k must be between 2 and the number of points ({n})")
+        folds = np.arange(n) * k // n
+        if shuffle:
+            folds = np.random.default_rng(seed).permutation(folds)
+    else:
+        folds = np.asarray(folds).ravel()
+        k = int(folds.max()) + 1
+
+    sums = (np.bincount(folds, minlength=k).astype(np.float64),
+            np.bincount(folds, dx, k), np.bincount(folds, dy, k),
+            np.bincount(folds, dx * dx, k), np.bincount(folds, dx * dy, k),
+            np.bincount(folds, dy * dy, k))
+    totals = tuple(s.sum() for s in sums[:5])
+    return _fold_scores(sums, totals, x_bar, y_bar)
+
+
+def leave_one_out(x, y):
+    """
+    Leave-one-out cross-validation of the least squares line.
+
+    Every point is its own fold, so the fold sums are the point's own
+    values and all n fits are computed with a few array operations.
+
+    Returns:
+    --------
+    CVResult with one entry per point; loss[i] is the squared error on
+    point i of the line fitted to all other points
+    """
+    dx, dy, x_bar, y_bar = _center(x, y)
+    sums = (np.ones_like(dx), dx, dy, dx * dx, dx * dy, dy * dy)
+    totals = (len(dx), dx.sum(), dy.sum(), sums[3].sum(), sums[4].sum())
+    return _fold_scores(sums, totals, x_bar, y_bar)
+
+
+if __name__ == "__main__":
+    # Define the dataset
+    S = [(2, 3), (4, 8), (6, 7), (8, 10), (10, 11)]
+    x, y = zip(*S)
+
+    result = leave_one_out(x, y)
+    print(f"Dataset S: {S}")
+    print("Leave-one-out:")
+    for point, a, b, loss in zip(S, result.a_best, result.b_best, result.loss):
+        print(f"  without {point}: a = {a:.4f}, b = {b:.4f}, held-out loss = {loss:.4f}")
+    print(f"  mean loss = {result.mean_loss:.4f}")
+
+    result = k_fold(x, y, k=2)
+    print(f"2-fold mean loss = {result.mean_loss:.4f}")
@@ -0,0 +1,340 @@
+"""
+Single pass least squares fit of y = a*x + b for data that do not fit in memory.
+
+The accumulator keeps the count, the means and the centered co-moments
+Σ(x - x̄)², Σ(x - x̄)(y - ȳ) and Σ(y - ȳ)², updated with Welford's method,
+and the smallest and largest x to tell when the slope is undefined.
+Two accumulators are combined with Chan's formula, so a file can be split
+into parts that are fitted in parallel and merged afterwards.
+
+Example:
+    python least_squares.py data.bin --workers 8
+"""
+
+import argparse
+import os
+from collections import namedtuple
+from itertools import islice
+from multiprocessing import Pool
+
+import numpy as np
+
+
+class LeastSquaresAccumulator:
+    """
+    Running sufficient statistics of a stream of (x, y) pairs.
+
+    result() gives the same a_best and b_best as find_optimal_parameters,
+    but the data are seen once and memory use is constant.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.x_bar = 0.0
+        self.y_bar = 0.0
+        self.sxx = 0.0
+        self.sxy = 0.0
+        self.syy = 0.0
+        # Σ(x - x̄)² of equal x values is rounding noise, not zero, so
+        # degenerate data are recognised by the range of x instead
+        self.x_min = np.inf
+        self.x_max = -np.inf
+
+    def update(self, x, y):
+        """Add a single point."""
+        self.n += 1
+        dx = x - self.x_bar
+        dy = y - self.y_bar
+        self.x_bar += dx / self.n
+        self.y_bar += dy / self.n
+        # One old and one new deviation, as in Welford's variance update
+        self.sxx += dx * (x - self.x_bar)
+        self.sxy += dx * (y - self.y_bar)
+        self.syy += dy * (y - self.y_bar)
+        self.x_min = min(self.x_min, x)
+        self.x_max = max(self.x_max, x)
+        return self
+
+    def update_batch(self, x, y=None):
+        """
+        Add a block of points.
+
+        Parameters:
+        -----------
+        x : array_like, shape (n,) or (n, 2)
+            x values, or the (x, y) pairs as two columns if y is None
+        y : array_like, shape (n,), optional
+            y values
+        """
+        if y is None:
+            pairs = np.asarray(x, dtype=np.float64).reshape(-1, 2)
+            x, y = pairs[:, 0], pairs[:, 1]
+        else:
+            x = np.asarray(x, dtype=np.float64).ravel()
+            y = np.asarray(y, dtype=np.float64).ravel()
+        if len(x) == 0:
+            return self
+
+        batch = LeastSquaresAccumulator()
+        batch.n = len(x)
+        batch.x_bar = x.mean()
+        batch.y_bar = y.mean()
+        dx = x - batch.x_bar
+        dy = y - batch.y_bar
+        batch.sxx = dx @ dx
+        batch.sxy = dx @ dy
+        batch.syy = dy @ dy
+        batch.x_min = x.min()
+        batch.x_max = x.max()
+        return self.merge(batch)
+
+    def merge(self, other):
+        """Add the statistics of another accumulator to this one."""
+        if other.n == 0:
+            return self
+        total = self.n + other.n
+        dx = other.x_bar - self.x_bar
+        dy = other.y_bar - self.y_bar
+        weight = self.n * other.n / total
+        self.sxx += other.sxx + dx * dx * weight
+        self.sxy += other.sxy + dx * dy * weight
+        self.syy += other.syy + dy * dy * weight
+        self.x_bar += dx * other.n / total
+        self.y_bar += dy * other.n / total
+        self.x_min = min(self.x_min, other.x_min)
+        self.x_max = max(self.x_max, other.x_max)
+        self.n = total
+        return self
+
+    def result(self):
+        """
+        Return the least squares parameters.
+
+        Returns:
+        --------
+        tuple (a_best, b_best)
+            The optimal slope and intercept values
+        """
+        if self.n == 0:
+            raise ValueError("No data points")
+        if self.x_min == self.x_max or self.sxx == 0:
+            raise ValueError("All x values are equal, the slope is undefined")
+        a_best = self.sxy / self.sxx
+        b_best = self.y_bar - a_best * self.x_bar
+        return float(a_best), float(b_best)
+
+    def loss(self):
+        """Return calculate_loss at the optimal parameters."""
+        a_best, _ = self.result()
+        return (self.syy - a_best * self.sxy) / self.n
+
+
+def read_csv_chunks(path, chunk_size=1_000_000, columns=(0, 1), skip_header=0,
+                    delimiter=","):
+    """
+    Read the x and y columns of a CSV file in blocks of rows.
+
+    Yields:
+    -------
+    tuple (x, y) of float64 arrays with at most chunk_size rows
+    """
+    with open(path) as file:
+        for _ in range(skip_header):
+            next(file, None)
+        while True:
+            # Read the lines first: np.loadtxt warns when it gets no data
+            lines = list(islice(file, chunk_size))
+            if not lines:
+                return
+            if not any(line.strip() for line in lines):
+                continue
+            block = np.loadtxt(lines, delimiter=delimiter, usecols=columns, ndmin=2)
+            yield block[:, 0], block[:, 1]
+
+
+def read_binary_chunks(path, chunk_size=1_000_000, start=0, stop=None):
+    """
+    Read a binary file of float64 (x, y) pairs in blocks of rows.
+
+    Parameters:
+    -----------
+    start, stop : int
+        Range of rows to read (default: the whole file)
+
+    Yields:
+    -------
+    tuple (x, y) of float64 arrays with at most chunk_size rows
+    """
+    rows = os.path.getsize(path) // 16
+    stop = rows if stop is None else min(stop, rows)
+    with open(path, "rb") as file:
+        file.seek(start * 16)
+        for row in range(start, stop, chunk_size):
+            count = min(chunk_size, stop - row)
+            pairs = np.fromfile(file, dtype=np.float64, count=2 * count)
+            yield pairs[0::2], pairs[1::2]
+
+
+def fit_chunks(chunks):
+    """Fit a stream of (x, y) blocks, e.g. from read_csv_chunks."""
+    accumulator = LeastSquaresAccumulator()
+    for x, y in chunks:
+        accumulator.update_batch(x, y)
+    return accumulator
+
+
+def _fit_binary_range(task):
+    path, start, stop, chunk_size = task
+    return fit_chunks(read_binary_chunks(path, chunk_size, start, stop))
+
+
+def fit_binary_parallel(path, workers=None, chunk_size=1_000_000):
+    """
+    Fit a binary file of (x, y) pairs with one row range per worker.
+
+    Every worker fits its part of the file and the partial results are
+    merged, which gives the same statistics as a single pass.
+
+    Returns:
+    --------
+    LeastSquaresAccumulator
+    """
+    workers = workers or os.cpu_count()
+    rows = os.path.getsize(path) // 16
+    step = -(-rows // workers) if rows else 1
+    tasks = [(path, start, min(start + step, rows), chunk_size)
+             for start in range(0, rows, step)]
+
+    accumulator = LeastSquaresAccumulator()
+    with Pool(workers) as pool:
+        for part in pool.imap(_fit_binary_range, tasks):
+            accumulator.merge(part)
+    return accumulator
+
+
+GroupedFit = namedtuple("GroupedFit", ["keys", "a_best", "b_best", "counts"])
+
+
+def _group_moments(task):
+    """Count, means, centered co-moments and x range of every group in one block."""
+    groups, x, y, n_groups = task
+    counts = np.bincount(groups, minlength=n_groups).astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_bar = np.bincount(groups, x, n_groups) / counts
+        y_bar = np.bincount(groups, y, n_groups) / counts
+    x_bar[counts == 0] = 0.0
+    y_bar[counts == 0] = 0.0
+    dx = x - x_bar[groups]
+    dy = y - y_bar[groups]
+    x_min = np.full(n_groups, np.inf)
+    x_max = np.full(n_groups, -np.inf)
+    np.minimum.at(x_min, groups, x)
+    np.maximum.at(x_max, groups, x)
+    return (counts, x_bar, y_bar, np.bincount(groups, dx * dx, n_groups),
+            np.bincount(groups, dx * dy, n_groups), x_min, x_max)
+
+
+def _merge_moments(left, right):
+    """Chan's formula for every group at once, as in LeastSquaresAccumulator.merge."""
+    n1, x1, y1, sxx1, sxy1, min1, max1 = left
+    n2, x2, y2, sxx2, sxy2, min2, max2 = right
+    total = n1 + n2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        share = np.where(total > 0, n2 / total, 0.0)
+    dx = x2 - x1
+    dy = y2 - y1
+    weight = n1 * share
+    return (total, x1 + dx * share, y1 + dy * share,
+            sxx1 + sxx2 + dx * dx * weight, sxy1 + sxy2 + dx * dy * weight,
+            np.minimum(min1, min2), np.maximum(max1, max2))
+
+
+def _number_groups(keys):
+    """Return the sorted unique keys and the group number of every row."""
+    if keys.dtype.kind in "iu" and len(keys):
+        # Small integer ranges are numbered by counting instead of sorting
+        low = int(keys.min())
+        span = int(keys.max()) - low + 1
+        if span <= 4 * len(keys):
+            offsets = keys - low
+            present = np.bincount(offsets, minlength=span) > 0
+            numbers = np.cumsum(present) - 1
+            return np.flatnonzero(present).astype(keys.dtype) + low, numbers[offsets]
+    unique, groups = np.unique(keys, return_inverse=True)
+    return unique, groups.ravel()
+
+
+def fit_grouped(keys, x, y, chunk_size=None, workers=None):
+    """
+    Fit an independent line y = a*x + b for every group in one pass.
+
+    The rows are numbered by group with np.unique, and the per-group sums
+    are segmented reductions with np.bincount: first the means, then the
+    centered co-moments, so the result is as accurate as fitting every
+    group on its own. With chunk_size the rows are processed in blocks
+    (in parallel with workers > 1) whose statistics are merged.
+
+    Parameters:
+    -----------
+    keys : array_like, shape (n,)
+        Group of every row; any sortable values
+    x, y : array_like, shape (n,)
+        The data
+    chunk_size : int, optional
+        Rows per block (default: all rows at once)
+    workers : int, optional
+        Number of processes for the blocks (default: one, no pool)
+
+    Returns:
+    --------
+    GroupedFit(keys, a_best, b_best, counts)
+        Arrays ordered by the sorted unique keys. Groups whose x values
+        are all equal have no unique slope; they get a_best = b_best = nan.
+    """
+    unique, groups = _number_groups(np.asarray(keys).ravel())
+    x = np.asarray(x, dtype=np.float64).ravel()
+    y = np.asarray(y, dtype=np.float64).ravel()
+    n_groups = len(unique)
+
+    chunk_size = chunk_size or max(len(x), 1)
+    tasks = [(groups[start:start + chunk_size], x[start:start + chunk_size],
+              y[start:start + chunk_size], n_groups)
+             for start in range(0, len(x), chunk_size)]
+
+    if workers is not None and workers > 1 and len(tasks) > 1:
+        with Pool(workers) as pool:
+            parts = pool.map(_group_moments, tasks)
+    else:
+        parts = map(_group_moments, tasks)
+
+    moments = (np.zeros(n_groups),) * 5 + (np.full(n_groups, np.inf),
+                                           np.full(n_groups, -np.inf))
+    for part in parts:
+        moments = _merge_moments(moments, part)
+    counts, x_bar, y_bar, sxx, sxy, x_min, x_max = moments
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        a_best = np.where((x_max > x_min) & (sxx > 0), sxy / sxx, np.nan)
+    b_best = y_bar - a_best * x_bar
+    return GroupedFit(unique, a_best, b_best, counts.astype(np.int64))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", help="CSV file, or .bin file of float64 (x, y) pairs")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    parser.add_argument("--skip-header", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.path.endswith(".bin"):
+        accumulator = fit_binary_parallel(args.path, args.workers, args.chunk_size)
+    else:
+        accumulator = fit_chunks(read_csv_chunks(args.path, args.chunk_size,
+                                                 skip_header=args.skip_header))
+
+    a_best, b_best = accumulator.result()
+    print(f"Points: {accumulator.n}")
+    print(f"  a_best = {a_best:.4f}")
+    print(f"  b_best = {b_best:.4f}")
+    print(f"  loss   = {accumulator.loss():.4f}")
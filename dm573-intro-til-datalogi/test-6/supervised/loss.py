@@ -1,3 +1,5 @@
+import numpy as np
+
 
 def calculate_loss(a, b, S):
     """
@@ -9,8 +11,9 @@ def calculate_loss(a, b, S):
         Slope of the linear model
     b : float
         Intercept of the linear model
-    S : list of tuples
-        Dataset containing (x, y) pairs
+    S : list of tuples or Dataset
+        Dataset containing (x, y) pairs; a memory-mapped Dataset is read
+        in blocks, with x and y its first two columns
 
     Returns:
     --------
@@ -18,6 +21,13 @@ def calculate_loss(a, b, S):
         The calculated loss value
     """
     n = len(S)
+
+    if hasattr(S, "iter_blocks"):
+        total_error = 0.0
+        for block in S.iter_blocks(columns=S.columns[:2]):
+            error = a * block[:, 0] + b - block[:, 1]
+            total_error += error @ error
+        return total_error / n
     total_error = 0
 
     for x_i, y_i in S:
@@ -32,6 +42,78 @@ def calculate_loss(a, b, S):
     loss = total_error / n
     return loss
 
+
+def loss_grid(as_, bs, X, Y, loss=None, block_size=2**22):
+    """
+    Evaluate the loss of a linear model on a whole grid of parameters.
+
+    For the squared loss of calculate_loss the data only enter through a
+    few sums. With c = a*x̄ + b - ȳ the loss is
+
+        L(a, b) = a²·Var(x) - 2a·Cov(x, y) + Var(y) + c²
+
+    so after one pass over the data every grid point costs O(1). The
+    (co)variances are computed from centered data to avoid cancellation.
+    Any other loss is evaluated by broadcasting the residuals of a block
+    of grid points against a block of the data at a time, so memory stays
+    bounded by block_size.
+
+    Parameters:
+    -----------
+    as_ : array_like, shape (p,)
+        Slopes to evaluate
+    bs : array_like, shape (q,)
+        Intercepts to evaluate
+    X : array_like, shape (n,)
+        x values of the dataset
+    Y : array_like, shape (n,)
+        y values of the dataset
+    loss : callable, optional
+        Elementwise function of the residuals a*x + b - y, e.g. np.abs.
+        The mean over the dataset is returned. Default: squared error.
+    block_size : int
+        Maximum number of residuals held in memory at once (fallback only)
+
+    Returns:
+    --------
+    ndarray, shape (p, q)
+        grid[i, j] is the loss of (as_[i], bs[j])
+    """
+    a = np.asarray(as_, dtype=np.float64).reshape(-1, 1)
+    b = np.asarray(bs, dtype=np.float64).reshape(1, -1)
+    X = np.asarray(X, dtype=np.float64).ravel()
+    Y = np.asarray(Y, dtype=np.float64).ravel()
+    n = len(X)
+    if n == 0:
+        raise ValueError("Dataset cannot be empty")
+
+    if loss is None:
+        x_bar = X.mean()
+        y_bar = Y.mean()
+        dx = X - x_bar
+        dy = Y - y_bar
+        var_x = dx @ dx / n
+        var_y = dy @ dy / n
+        cov_xy = dx @ dy / n
+        c = a * x_bar + b - y_bar
+        return a * (a * var_x - 2 * cov_xy) + var_y + c * c
+
+    # Fallback: blocks of grid points times blocks of data points
+    A, B = np.broadcast_arrays(a, b)
+    A = A.ravel()
+    B = B.ravel()
+    data_block = min(n, block_size)
+    grid_block = max(1, block_size // data_block)
+
+    total = np.zeros(len(A))
+    for start in range(0, n, data_block):
+        x = X[start:start + data_block]
+        y = Y[start:start + data_block]
+        for g in range(0, len(A), grid_block):
+            residuals = (A[g:g + grid_block, None] * x + B[g:g + grid_block, None]) - y
+            total[g:g + grid_block] += loss(residuals).sum(axis=1)
+    return (total / n).reshape(a.shape[0], b.shape[1])
+
 if __name__ == "__main__":
     # Define the dataset
     S = [(2, 3), (4, 8), (6, 7)]
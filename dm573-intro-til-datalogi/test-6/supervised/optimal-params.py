@@ -1,3 +1,5 @@
+from least_squares import LeastSquaresAccumulator
+
 
 def find_optimal_parameters(S):
     """
@@ -9,14 +11,21 @@ def find_optimal_parameters(S):
 
     Parameters:
     -----------
-    S : list of tuples
-        Dataset containing (x, y) pairs
+    S : list of tuples or Dataset
+        Dataset containing (x, y) pairs; a memory-mapped Dataset is read
+        in blocks, with x and y its first two columns
 
     Returns:
     --------
     tuple (a_best, b_best)
         The optimal slope and intercept values
     """
+    if hasattr(S, "iter_blocks"):
+        accumulator = LeastSquaresAccumulator()
+        for block in S.iter_blocks(columns=S.columns[:2]):
+            accumulator.update_batch(block)
+        return accumulator.result()
+
     n = len(S)
 
     # Calculate center of mass (mean of x and y)
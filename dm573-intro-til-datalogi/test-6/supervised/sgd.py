@@ -0,0 +1,272 @@
+"""
+Mini-batch SGD and Adam for linear models that do not fit in memory.
+
+The model is y ≈ X·w + b with any number of features, trained on the same
+mean squared error as calculate_loss, optionally plus an L2 penalty
+l2·‖w‖². Batches are streamed from disk, so memory use is bounded by the
+batch size. Training stops early when the loss on a held-out stream stops
+improving.
+
+Example:
+    python sgd.py train.bin --features 8 --validation valid.bin
+"""
+
+import argparse
+import math
+import os
+import time
+from collections import namedtuple
+
+import numpy as np
+
+TrainResult = namedtuple(
+    "TrainResult", ["weights", "bias", "epochs", "history", "stopped_early"])
+
+Progress = namedtuple(
+    "Progress", ["epoch", "batch", "rows", "rows_per_second", "train_loss",
+                 "validation_loss"])
+
+
+def binary_batches(path, n_features, batch_size=4096, start=0, stop=None):
+    """
+    Read a binary file of float64 rows (x_1, ..., x_d, y) in batches.
+
+    Parameters:
+    -----------
+    path : str
+        File with n_features + 1 float64 values per row
+    n_features : int
+        Number of x columns d
+    batch_size : int
+        Rows per batch
+    start, stop : int
+        Range of rows to read (default: the whole file)
+
+    Yields:
+    -------
+    tuple (X, y) with X of shape (rows, d) and y of shape (rows,)
+    """
+    width = n_features + 1
+    rows = os.path.getsize(path) // (8 * width)
+    stop = rows if stop is None else min(stop, rows)
+    with open(path, "rb") as file:
+        file.seek(start * 8 * width)
+        for row in range(start, stop, batch_size):
+            count = min(batch_size, stop - row)
+            block = np.fromfile(file, dtype=np.float64, count=count * width)
+            block = block.reshape(count, width)
+            yield block[:, :-1], block[:, -1]
+
+
+def mse_gradient(weights, bias, X, y, l2=0.0):
+    """
+    Mean squared error of a batch and its gradient.
+
+    Returns:
+    --------
+    tuple (loss, grad_weights, grad_bias)
+        loss is the mean of (X·w + b - y)², as in calculate_loss,
+        plus l2·‖w‖²
+    """
+    residuals = X @ weights + bias - y
+    n = len(y)
+    loss = residuals @ residuals / n + l2 * (weights @ weights)
+    grad_weights = (2 / n) * (X.T @ residuals) + (2 * l2) * weights
+    grad_bias = (2 / n) * residuals.sum()
+    return loss, grad_weights, grad_bias
+
+
+def stream_loss(weights, bias, batches):
+    """Mean squared error over a whole stream of (X, y) batches."""
+    total = 0.0
+    n = 0
+    for X, y in batches:
+        residuals = X @ weights + bias - y
+        total += residuals @ residuals
+        n += len(y)
+    return total / n if n else math.nan
+
+
+class SGD:
+    """Plain gradient steps, with optional momentum."""
+
+    def __init__(self, learning_rate=0.01, momentum=0.0):
+        self.learning_rate = learning_rate
+        self.momentum = momentum
+        self.velocity = None
+
+    def step(self, params, grads):
+        if self.velocity is None:
+            self.velocity = [np.zeros_like(p) for p in params]
+        for p, g, v in zip(params, grads, self.velocity):
+            v *= self.momentum
+            v -= self.learning_rate * g
+            p += v
+
+
+class Adam:
+    """Adam (Kingma and Ba) with bias-corrected moment estimates."""
+
+    def __init__(self, learning_rate=0.001, beta1=0.9, beta2=0.999, eps=1e-8):
+        self.learning_rate = learning_rate
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.eps = eps
+        self.t = 0
+        self.moments = None
+
+    def step(self, params, grads):
+        if self.moments is None:
+            self.moments = [(np.zeros_like(p), np.zeros_like(p)) for p in params]
+        self.t += 1
+        correction1 = 1 - self.beta1 ** self.t
+        correction2 = 1 - self.beta2 ** self.t
+        for p, g, (m, v) in zip(params, grads, self.moments):
+            m *= self.beta1
+            m += (1 - self.beta1) * g
+            v *= self.beta2
+            v += (1 - self.beta2) * g * g
+            p -= self.learning_rate * (m / correction1) / (np.sqrt(v / correction2) + self.eps)
+
+
+OPTIMIZERS = {"sgd": SGD, "adam": Adam}
+
+
+def _progress(epoch, batch, rows, started, epoch_loss, epoch_rows, validation_loss=None):
+    # The clock can read the same time twice on the first, tiny batches
+    elapsed = time.perf_counter() - started
+    return Progress(epoch, batch, rows, rows / elapsed if elapsed else math.inf,
+                    epoch_loss / epoch_rows if epoch_rows else math.nan,
+                    validation_loss)
+
+
+def train(batches, n_features, optimizer="adam", learning_rate=None, epochs=10,
+          l2=0.0, validation=None, patience=3, min_delta=0.0, callback=None,
+          report_every=100):
+    """
+    Train a linear model with mini-batch gradient descent.
+
+    Parameters:
+    -----------
+    batches : callable
+        Returns a fresh iterable of (X, y) training batches for each epoch,
+        e.g. lambda: binary_batches("train.bin", d)
+    n_features : int
+        Number of x columns d
+    optimizer : str or object
+        "sgd", "adam", or an object with a step(params, grads) method
+    learning_rate : float, optional
+        Passed to the named optimizer (default: its own default)
+    epochs : int
+        Maximum number of passes over the training stream
+    l2 : float
+        Weight of the L2 penalty on the slopes
+    validation : callable, optional
+        Returns a fresh iterable of held-out (X, y) batches. The loss on it
+        is computed after every epoch and used for early stopping.
+    patience : int
+        Epochs without an improvement of more than min_delta before stopping
+    callback : callable, optional
+        Called with a Progress tuple every report_every batches and at the
+        end of every epoch (then validation_loss is set)
+
+    Returns:
+    --------
+    TrainResult(weights, bias, epochs, history, stopped_early)
+        The parameters with the best validation loss (the last ones
+        without validation); history holds one Progress per epoch
+    """
+    if isinstance(optimizer, str):
+        kwargs = {} if learning_rate is None else {"learning_rate": learning_rate}
+        optimizer = OPTIMIZERS[optimizer](**kwargs)
+
+    weights = np.zeros(n_features)
+    bias = np.zeros(1)
+    best = (math.inf, weights.copy(), bias.copy())
+    history = []
+    stale = 0
+    stopped_early = False
+
+    rows = 0
+    started = time.perf_counter()
+    epoch = 0
+    for epoch in range(1, epochs + 1):
+        epoch_loss = 0.0
+        epoch_rows = 0
+        for batch, (X, y) in enumerate(batches(), 1):
+            X = np.asarray(X, dtype=np.float64).reshape(len(y), n_features)
+            loss, grad_weights, grad_bias = mse_gradient(weights, bias[0], X, y, l2)
+            optimizer.step([weights, bias], [grad_weights, np.array([grad_bias])])
+
+            epoch_loss += loss * len(y)
+            epoch_rows += len(y)
+            rows += len(y)
+            if callback is not None and batch % report_every == 0:
+                callback(_progress(epoch, batch, rows, started, epoch_loss, epoch_rows))
+
+        validation_loss = None
+        if validation is not None:
+            validation_loss = stream_loss(weights, bias[0], validation())
+
+        progress = _progress(epoch, None, rows, started, epoch_loss, epoch_rows,
+                             validation_loss)
+        history.append(progress)
+        if callback is not None:
+            callback(progress)
+
+        if validation_loss is None:
+            continue
+        if validation_loss < best[0] - min_delta:
+            best = (validation_loss, weights.copy(), bias.copy())
+            stale = 0
+        else:
+            stale += 1
+            if stale >= patience:
+                stopped_early = True
+                break
+
+    if validation is not None and best[0] < math.inf:
+        _, weights, bias = best
+    return TrainResult(weights, float(bias[0]), epoch, history, stopped_early)
+
+
+def print_progress(progress):
+    """Callback that prints a line per report."""
+    where = f"epoch {progress.epoch}"
+    if progress.batch is not None:
+        where += f" batch {progress.batch}"
+    line = (f"{where}: {progress.rows} rows, {progress.rows_per_second:,.0f} rows/s, "
+            f"train loss {progress.train_loss:.6g}")
+    if progress.validation_loss is not None:
+        line += f", validation loss {progress.validation_loss:.6g}"
+    print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", help="binary file of float64 rows (x_1, ..., x_d, y)")
+    parser.add_argument("--features", type=int, required=True)
+    parser.add_argument("--validation", default=None, help="held-out file, same format")
+    parser.add_argument("--optimizer", choices=list(OPTIMIZERS), default="adam")
+    parser.add_argument("--learning-rate", type=float, default=None)
+    parser.add_argument("--batch-size", type=int, default=4096)
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--l2", type=float, default=0.0)
+    parser.add_argument("--patience", type=int, default=3)
+    args = parser.parse_args()
+
+    def training():
+        return binary_batches(args.path, args.features, args.batch_size)
+
+    validation = None
+    if args.validation:
+        def validation():
+            return binary_batches(args.validation, args.features, args.batch_size)
+
+    result = train(training, args.features, args.optimizer, args.learning_rate,
+                   args.epochs, args.l2, validation, args.patience,
+                   callback=print_progress, report_every=1000)
+
+    print(f"Weights: {result.weights}")
+    print(f"Bias: {result.bias:.6g}")
+    print(f"Epochs: {result.epochs}" + (" (stopped early)" if result.stopped_early else ""))
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from cross_validation import k_fold, leave_one_out
+
+
+def refit(x, y, folds, k):
+    # Fit on everything but the fold and score on the fold, the slow way
+    losses, sizes = [], []
+    for fold in range(k):
+        test = folds == fold
+        a, b = np.polyfit(x[~test], y[~test], 1)
+        sizes.append(test.sum())
+        if sizes[-1]:
+            losses.append(np.mean((a * x[test] + b - y[test]) ** 2))
+        else:
+            losses.append(np.nan)
+    return np.array(losses), np.array(sizes)
+
+
+def make_data(n=40, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(0, 10, n)
+    return x, 3.0 * x + 1.0 + rng.normal(size=n)
+
+
+@pytest.mark.parametrize("k", [2, 3, 7, 40])
+def test_k_fold_matches_refit(k):
+    x, y = make_data()
+    result = k_fold(x, y, k=k, shuffle=True, seed=1)
+    folds = np.random.default_rng(1).permutation(np.arange(len(x)) * k // len(x))
+    losses, sizes = refit(x, y, folds, k)
+    assert result.loss == pytest.approx(losses, rel=1e-9)
+    assert list(result.sizes) == list(sizes)
+    assert result.mean_loss == pytest.approx(np.average(losses, weights=sizes))
+
+
+def test_leave_one_out_matches_k_fold():
+    x, y = make_data()
+    loo = leave_one_out(x, y)
+    kf = k_fold(x, y, k=len(x))
+    assert loo.loss == pytest.approx(kf.loss, rel=1e-9)
+    assert loo.a_best == pytest.approx(kf.a_best)
+    assert loo.mean_loss == pytest.approx(kf.mean_loss)
+
+
+def test_k_out_of_range():
+    x, y = make_data(5)
+    for k in (1, 6):
+        with pytest.raises(ValueError):
+            k_fold(x, y, k=k)
+
+
+def test_empty_explicit_fold():
+    x, y = make_data(10)
+    folds = np.array([0, 2] * 5)
+    result = k_fold(x, y, folds=folds)
+    assert result.sizes[1] == 0
+    losses, _ = refit(x, y, folds, 3)
+    assert result.mean_loss == pytest.approx((losses[0] + losses[2]) / 2)
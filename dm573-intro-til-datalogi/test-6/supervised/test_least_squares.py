@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from least_squares import (LeastSquaresAccumulator, fit_chunks, fit_grouped,
+                           read_binary_chunks, read_csv_chunks)
+
+
+def make_data(n=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(1e6, 3.0, n)
+    y = 2.5 * x - 4.0 + rng.normal(size=n)
+    return x, y
+
+
+def test_matches_polyfit():
+    x, y = make_data()
+    accumulator = LeastSquaresAccumulator()
+    accumulator.update_batch(x, y)
+    a_best, b_best = accumulator.result()
+    a_ref, b_ref = np.polyfit(x - 1e6, y, 1)
+    assert a_best == pytest.approx(a_ref, rel=1e-9)
+    assert b_best == pytest.approx(b_ref - a_ref * 1e6, rel=1e-6)
+    residuals = y - (a_best * x + b_best)
+    assert accumulator.loss() == pytest.approx(np.mean(residuals ** 2), rel=1e-6)
+
+
+def test_merge_of_parts_equals_whole():
+    x, y = make_data()
+    whole = LeastSquaresAccumulator()
+    whole.update_batch(x, y)
+
+    parts = [LeastSquaresAccumulator() for _ in range(3)]
+    for part, (xs, ys) in zip(parts, zip(np.array_split(x, 3), np.array_split(y, 3))):
+        part.update_batch(xs, ys)
+    merged = LeastSquaresAccumulator()
+    for part in parts:
+        merged.merge(part)
+    merged.merge(LeastSquaresAccumulator())
+
+    single = LeastSquaresAccumulator()
+    for xi, yi in zip(x[:50], y[:50]):
+        single.update(xi, yi)
+    head = LeastSquaresAccumulator()
+    head.update_batch(x[:50], y[:50])
+
+    assert merged.result() == pytest.approx(whole.result(), rel=1e-9)
+    assert single.result() == pytest.approx(head.result(), rel=1e-9)
+
+
+def test_degenerate():
+    accumulator = LeastSquaresAccumulator()
+    with pytest.raises(ValueError):
+        accumulator.result()
+    accumulator.update_batch(np.ones(3), np.arange(3.0))
+    with pytest.raises(ValueError):
+        accumulator.result()
+
+
+def test_equal_x_not_exactly_representable():
+    # The mean of three 0.1s is not 0.1, so Σ(x - x̄)² is not exactly zero
+    batch = LeastSquaresAccumulator().update_batch([0.1] * 3, [1.0, 2.0, 3.0])
+    single = LeastSquaresAccumulator()
+    for y in [1.0, 2.0, 3.0]:
+        single.update(0.1, y)
+    merged = LeastSquaresAccumulator().merge(batch).update_batch([0.1], [4.0])
+    for accumulator in (batch, single, merged):
+        with pytest.raises(ValueError):
+            accumulator.result()
+
+
+@pytest.mark.filterwarnings("error")
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 4, 5])
+def test_csv_chunks(tmp_path, chunk_size):
+    path = tmp_path / "data.csv"
+    path.write_text("x,y\n1,2\n2,4\n3,7\n4,8\n\n")
+    chunks = list(read_csv_chunks(path, chunk_size, skip_header=1))
+    assert sum(len(x) for x, _ in chunks) == 4
+    assert fit_chunks(chunks).result() == pytest.approx((2.1, 0.0))
+
+
+def test_binary_chunks(tmp_path):
+    x, y = make_data(101)
+    path = tmp_path / "data.bin"
+    np.column_stack([x, y]).tofile(path)
+    chunks = list(read_binary_chunks(path, 10, start=5, stop=95))
+    assert np.array_equal(np.concatenate([c[0] for c in chunks]), x[5:95])
+    assert np.array_equal(np.concatenate([c[1] for c in chunks]), y[5:95])
+
+
+@pytest.mark.parametrize("chunk_size, workers", [(None, None), (97, None), (250, 2)])
+def test_fit_grouped_matches_per_group_fits(chunk_size, workers):
+    rng = np.random.default_rng(3)
+    n = 1000
+    keys = rng.integers(0, 20, n) * 3 + 100
+    x = rng.normal(50.0, 5.0, n)
+    y = (keys / 100) * x + keys + rng.normal(size=n)
+    result = fit_grouped(keys, x, y, chunk_size, workers)
+    assert list(result.keys) == sorted(set(keys.tolist()))
+    for k, a_best, b_best, count in zip(*result):
+        group = keys == k
+        a_ref, b_ref = np.polyfit(x[group], y[group], 1)
+        assert count == group.sum()
+        assert a_best == pytest.approx(a_ref, rel=1e-9)
+        assert b_best == pytest.approx(b_ref, rel=1e-9)
+
+
+def test_fit_grouped_string_keys_and_degenerate_groups():
+    keys = ["b", "a", "b", "a", "c", "c"]
+    x = [1.0, 1.0, 2.0, 3.0, 5.0, 5.0]
+    y = [2.0, 1.0, 4.0, 5.0, 1.0, 2.0]
+    result = fit_grouped(keys, x, y)
+    assert list(result.keys) == ["a", "b", "c"]
+    assert list(result.counts) == [2, 2, 2]
+    assert result.a_best[:2] == pytest.approx([2.0, 2.0])
+    assert result.b_best[:2] == pytest.approx([-1.0, 0.0])
+    assert np.isnan(result.a_best[2]) and np.isnan(result.b_best[2])
+
+
+@pytest.mark.parametrize("chunk_size", [None, 2])
+def test_fit_grouped_equal_x_not_exactly_representable(chunk_size):
+    result = fit_grouped([0, 0, 0, 1, 1], [0.1] * 3 + [0.1, 0.3], [1.3, 2.9, 4.1, 1.0, 2.0],
+                         chunk_size)
+    assert np.isnan(result.a_best[0]) and np.isnan(result.b_best[0])
+    assert result.a_best[1] == pytest.approx(5.0)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from loss import calculate_loss, loss_grid
+
+
+def make_data(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(1e4, 2.0, n)
+    return x, 1.5 * x - 3.0 + rng.normal(size=n)
+
+
+def test_closed_form_matches_calculate_loss():
+    x, y = make_data()
+    as_ = np.linspace(1.0, 2.0, 7)
+    bs = np.linspace(-10.0, 5.0, 5)
+    grid = loss_grid(as_, bs, x, y)
+    S = list(zip(x, y))
+    for i, a in enumerate(as_):
+        for j, b in enumerate(bs):
+            assert grid[i, j] == pytest.approx(calculate_loss(a, b, S), rel=1e-9)
+
+
+def test_fallback_matches_direct():
+    x, y = make_data(97)
+    as_ = np.linspace(1.0, 2.0, 11)
+    bs = np.linspace(-10.0, 5.0, 3)
+    # A tiny block size forces many blocks of grid points and data
+    grid = loss_grid(as_, bs, x, y, loss=np.abs, block_size=40)
+    expected = np.abs(as_[:, None, None] * x + bs[None, :, None] - y).mean(axis=2)
+    assert grid == pytest.approx(expected, rel=1e-12)
+
+
+def test_fallback_squared_matches_closed_form():
+    x, y = make_data(50)
+    as_, bs = [1.4, 1.5, 1.6], [-4.0, -3.0]
+    assert loss_grid(as_, bs, x, y, loss=np.square) == pytest.approx(
+        loss_grid(as_, bs, x, y), rel=1e-7)
+
+
+def test_empty():
+    with pytest.raises(ValueError):
+        loss_grid([1.0], [0.0], [], [])
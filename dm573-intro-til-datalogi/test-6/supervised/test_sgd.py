@@ -0,0 +1,69 @@
+import math
+
+import numpy as np
+import pytest
+
+import sgd
+from sgd import binary_batches, mse_gradient, stream_loss, train
+
+
+def make_data(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 3))
+    y = X @ np.array([2.0, -1.0, 0.5]) + 0.25 + 0.1 * rng.normal(size=n)
+    return X, y
+
+
+def in_batches(X, y, size=100):
+    return lambda: ((X[i:i + size], y[i:i + size]) for i in range(0, len(y), size))
+
+
+def test_gradient_matches_finite_differences():
+    X, y = make_data(50)
+    weights = np.array([0.3, -0.2, 0.1])
+    loss, grad_weights, grad_bias = mse_gradient(weights, 0.4, X, y, l2=0.1)
+    eps = 1e-6
+    for j in range(3):
+        step = np.zeros(3)
+        step[j] = eps
+        up = mse_gradient(weights + step, 0.4, X, y, 0.1)[0]
+        down = mse_gradient(weights - step, 0.4, X, y, 0.1)[0]
+        assert grad_weights[j] == pytest.approx((up - down) / (2 * eps), rel=1e-5)
+    up = mse_gradient(weights, 0.4 + eps, X, y, 0.1)[0]
+    assert grad_bias == pytest.approx((up - loss) / eps, rel=1e-4)
+
+
+@pytest.mark.parametrize("optimizer, learning_rate", [("adam", 0.05), ("sgd", 0.05)])
+def test_converges_to_least_squares(optimizer, learning_rate):
+    X, y = make_data()
+    result = train(in_batches(X, y), 3, optimizer, learning_rate, epochs=40)
+    solution, *_ = np.linalg.lstsq(np.column_stack([X, np.ones(len(y))]), y, rcond=None)
+    assert result.weights == pytest.approx(solution[:3], abs=0.02)
+    assert result.bias == pytest.approx(solution[3], abs=0.02)
+
+
+def test_early_stopping_keeps_best():
+    X, y = make_data()
+    result = train(in_batches(X[:1500], y[:1500]), 3, "adam", 0.05, epochs=200,
+                   validation=in_batches(X[1500:], y[1500:]), patience=2, min_delta=1e-6)
+    assert result.stopped_early
+    best = min(p.validation_loss for p in result.history)
+    assert stream_loss(result.weights, result.bias, in_batches(X[1500:], y[1500:])()) == best
+
+
+def test_progress_with_a_frozen_clock(monkeypatch):
+    monkeypatch.setattr(sgd.time, "perf_counter", lambda: 0.0)
+    X, y = make_data(500)
+    reports = []
+    train(in_batches(X, y, 50), 3, epochs=1, callback=reports.append, report_every=2)
+    assert len(reports) == 6
+    assert all(report.rows_per_second == math.inf for report in reports)
+
+
+def test_binary_batches(tmp_path):
+    X, y = make_data(105)
+    path = tmp_path / "data.bin"
+    np.column_stack([X, y]).tofile(path)
+    batches = list(binary_batches(path, 3, batch_size=10, start=3, stop=99))
+    assert np.array_equal(np.vstack([b[0] for b in batches]), X[3:99])
+    assert np.array_equal(np.concatenate([b[1] for b in batches]), y[3:99])
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from dataset import Dataset, convert_csv, encode_labels, from_tuples, write_dataset
+
+S = [(2.0, 3.0, "a"), (4.0, 8.0, "b"), (6.0, 7.0, "a"), (8.0, 10.0, "c")]
+
+
+def test_encode_labels_in_order_of_appearance():
+    codes, vocabulary = encode_labels(["b", "a", "b", "c"])
+    assert codes.tolist() == [0, 1, 0, 2]
+    codes, vocabulary = encode_labels(["c", "d"], vocabulary)
+    assert codes.tolist() == [2, 3]
+    assert list(vocabulary) == ["b", "a", "c", "d"]
+
+
+def test_tuples_round_trip(tmp_path):
+    dataset = from_tuples(tmp_path / "s.dmc", S)
+    assert len(dataset) == 4
+    assert dataset.columns == ["x", "y"]
+    assert list(dataset.rows(block_rows=3)) == S
+    assert dataset.labels(1, 3) == ["b", "a"]
+
+
+def test_blocks_and_columns(tmp_path):
+    points = np.random.default_rng(0).normal(size=(1000, 3))
+    dataset = write_dataset(str(tmp_path / "p.dmc"), points)
+    assert dataset.dimensions == 3
+    assert np.array_equal(dataset.to_array(), points)
+    assert np.array_equal(np.vstack(list(dataset.iter_blocks(128))), points)
+    assert np.array_equal(dataset.column("x2"), points[:, 2])
+    blocks = list(dataset.iter_blocks(999, columns=["y"]))
+    assert [len(b) for b in blocks] == [999, 1]
+    assert dataset.label_codes is None and dataset.labels() is None
+
+
+@pytest.mark.filterwarnings("error")
+@pytest.mark.parametrize("chunk_rows", [1, 2, 4, 10])
+def test_convert_csv(tmp_path, chunk_rows):
+    csv = tmp_path / "s.csv"
+    csv.write_text("x,y,label\n" + "".join(f"{x},{y},{l}\n" for x, y, l in S) + "\n")
+    dataset = convert_csv(str(csv), str(tmp_path / "s.dmc"), label_column="label",
+                          chunk_rows=chunk_rows)
+    assert list(dataset.rows()) == S
+    assert dataset.label_names == ["a", "b", "c"]
+
+
+def test_empty_and_invalid(tmp_path):
+    dataset = write_dataset(str(tmp_path / "e.dmc"), [[], []])
+    assert len(dataset) == 0 and list(dataset.iter_blocks()) == []
+    bad = tmp_path / "bad.dmc"
+    bad.write_bytes(b"not a dataset")
+    with pytest.raises(ValueError):
+        Dataset(str(bad))
+
+
+def test_other_format_version(tmp_path):
+    path = tmp_path / "v.dmc"
+    write_dataset(str(path), [[1.0, 2.0], [3.0, 4.0]])
+    content = path.read_bytes()
+    assert content.count(b'"version": 1') == 1
+    path.write_bytes(content.replace(b'"version": 1', b'"version": 9'))
+    with pytest.raises(ValueError, match="version 9"):
+        Dataset(str(path))
@@ -1,3 +1,5 @@
+import numpy as np
+
 
 def calculate_centroid(C):
     """
@@ -8,9 +10,10 @@ def calculate_centroid(C):
 
     Parameters:
     -----------
-    C : list of tuples or list of lists
+    C : list of tuples or list of lists, or Dataset
         A dataset containing points, where each point is a tuple or list of coordinates
         Example: [(2, 3), (5, 5), (4, 1)]
+        A memory-mapped Dataset is read in blocks, using all its columns
 
     Returns:
     --------
@@ -22,26 +25,153 @@ def calculate_centroid(C):
     >>> calculate_centroid(C)
     (3.6666666666666665, 3.0)
     """
-    if not C:
+    if not len(C):
         raise ValueError("Dataset C cannot be empty")
 
-    # Get the number of points in the cluster
-    cardinality = len(C)
+    # One pass over all dimensions at once
+    return CentroidAccumulator().add_data(C).centroid()
+
+
+def _neumaier_add(total, compensation, value):
+    """Add value to total, keeping the lost low-order bits in compensation."""
+    new_total = total + value
+    big = np.abs(total) >= np.abs(value)
+    compensation += np.where(big, (total - new_total) + value, (value - new_total) + total)
+    return new_total
+
+
+def _compensated_column_sums(block):
+    """
+    Column sums of an (n, d) block and the rounding errors they lost.
+
+    The rows are added pairwise, half the block onto the other half, and
+    the exact error of every addition is found with Knuth's TwoSum. The
+    errors are small, so their plain sum is accurate enough to correct
+    the sums to about the precision of a single rounding.
+
+    Returns:
+    --------
+    tuple (sums, errors) of arrays of length d
+    """
+    errors = np.zeros(block.shape[1])
+    while len(block) > 1:
+        half = len(block) // 2
+        a, b = block[:half], block[half:2 * half]
+        total = a + b
+        b_part = total - a
+        errors += ((a - (total - b_part)) + (b - b_part)).sum(axis=0)
+        if len(block) % 2:
+            total = np.vstack([total, block[-1:]])
+        block = total
+    return block[0], errors
+
+
+class CentroidAccumulator:
+    """
+    Running, mergeable weighted centroid.
+
+    Keeps the weighted sum of the points and the total weight, both with
+    Neumaier's compensated summation, so billions of points can be added
+    block by block without losing precision. Within a block the rows are
+    added with TwoSum (see _compensated_column_sums); only the rounding of
+    a weight times a point is not compensated. Accumulators of parts of a
+    dataset can be merged, and points can be removed again when they move
+    to another cluster.
+
+    Example:
+    --------
+    >>> acc = CentroidAccumulator()
+    >>> acc.add((2, 3)).add((5, 5)).add((4, 1)).centroid()
+    (3.6666666666666665, 3.0)
+    """
+
+    def __init__(self):
+        self.total = None
+        self.compensation = None
+        self.weight = np.zeros(1)
+        self.weight_compensation = np.zeros(1)
+
+    def _add(self, vector_sum, weight_sum):
+        if self.total is None:
+            self.total = np.zeros(len(vector_sum))
+            self.compensation = np.zeros(len(vector_sum))
+        self.total = _neumaier_add(self.total, self.compensation, vector_sum)
+        self.weight = _neumaier_add(self.weight, self.weight_compensation,
+                                    np.array([weight_sum], dtype=np.float64))
+        return self
+
+    def add(self, point, weight=1.0):
+        """Add a single point."""
+        return self._add(weight * np.asarray(point, dtype=np.float64), weight)
+
+    def add_block(self, block, weights=None):
+        """Add an (n, d) array of points, optionally with one weight per point."""
+        block = np.asarray(block, dtype=np.float64)
+        if block.ndim == 1:
+            block = block.reshape(1, -1)
+        if not len(block):
+            return self
+        if weights is None:
+            sums, errors = _compensated_column_sums(block)
+            return self._add(sums, len(block))._add(errors, 0.0)
+        weights = np.asarray(weights, dtype=np.float64)
+        sums, errors = _compensated_column_sums(weights[:, None] * block)
+        weight, weight_error = _compensated_column_sums(weights[:, None])
+        return self._add(sums, weight[0])._add(errors, weight_error[0])
+
+    def add_data(self, data, weights=None, block_rows=1 << 20):
+        """
+        Add a list of points, an array, a memmap or a Dataset, in blocks.
+
+        Only one block is in memory at a time, so a memory-mapped dataset
+        is read sequentially once.
+        """
+        if hasattr(data, "iter_blocks"):
+            blocks = data.iter_blocks(block_rows)
+        elif isinstance(data, np.ndarray):
+            blocks = (data[start:start + block_rows]
+                      for start in range(0, len(data), block_rows))
+        else:
+            blocks = [np.asarray(data, dtype=np.float64)]
+
+        start = 0
+        for block in blocks:
+            block_weights = None
+            if weights is not None:
+                block_weights = weights[start:start + len(block)]
+            self.add_block(block, block_weights)
+            start += len(block)
+        return self
+
+    def remove(self, point, weight=1.0):
+        """Remove a point that was added before."""
+        return self.add(point, -weight)
 
-    # Get the dimensionality (number of coordinates per point)
-    dimensions = len(C[0])
+    def remove_block(self, block, weights=None):
+        """Remove a block of points that were added before."""
+        block = np.asarray(block, dtype=np.float64).reshape(-1, self.total.shape[0])
+        if weights is None:
+            weights = np.ones(len(block))
+        return self.add_block(block, -np.asarray(weights, dtype=np.float64))
 
-    # Initialize centroid coordinates
-    centroid = []
+    def merge(self, other):
+        """Add the points of another accumulator."""
+        if other.total is not None:
+            self._add(other.total, other.weight[0])
+            self._add(other.compensation, other.weight_compensation[0])
+        return self
 
-    # Calculate each dimension of the centroid
-    for dim in range(dimensions):
-        # Sum all values in this dimension
-        dim_sum = sum(point[dim] for point in C)
-        # Divide by cardinality to get the mean
-        centroid.append(dim_sum / cardinality)
+    @property
+    def count(self):
+        """Total weight (the number of points when unweighted)."""
+        return float(self.weight[0] + self.weight_compensation[0])
 
-    return tuple(centroid)
+    def centroid(self):
+        """Return the centroid coordinates as a tuple."""
+        weight = self.count
+        if self.total is None or weight == 0:
+            raise ValueError("Dataset C cannot be empty")
+        return tuple(((self.total + self.compensation) / weight).tolist())
 
 if __name__ == "__main__":
     # Test with the example dataset
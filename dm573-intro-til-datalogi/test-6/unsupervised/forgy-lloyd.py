@@ -1,39 +1,50 @@
+import numpy as np
+
+from kmeans import kmeans, print_iteration
+from seeding import kmeans_restarts
+
+
 def euclidean_distance(p1, p2):
     """Calculate Euclidean distance between two points."""
     return sum((a - b) ** 2 for a, b in zip(p1, p2)) ** 0.5
 
-def forgy_lloyd_kmeans(dataset, K, max_iterations=100, tolerance=1e-6):
+def forgy_lloyd_kmeans(dataset, K, max_iterations=100, tolerance=1e-6, algorithm="auto",
+                       init="labels", n_init=1, seed=None, workers=None, callback=None):
     """
     K-means clustering using Forgy-Lloyd algorithm.
 
+    The iterations run in the vectorized engine of kmeans.py, for points of
+    any dimension; this function keeps the dictionary interface.
+
     Args:
-        dataset: List of tuples (x, y, label) where label is initial cluster assignment
+        dataset: List of tuples (x, y, label) where label is initial cluster assignment,
+            or a memory-mapped Dataset with columns x, y and a label column.
+            Points may have any number of coordinates before the label.
         K: Number of clusters
         max_iterations: Maximum number of iterations
         tolerance: Convergence threshold for centroid movement
+        algorithm: "lloyd", or "hamerly" / "elkan" to skip distances with
+            the triangle inequality, "tree" for a KD-tree over the centroids
+            (same result), or "auto" (default) to pick one by K and the
+            dimension, see kmeans.choose_algorithm
+        init: "labels" to start from the means of the initial label groups,
+            or "k-means++" / "k-means||" for random seeding
+        n_init: With random seeding, the number of runs; the one with the
+            smallest TD² is returned
+        seed: Seed for the random seeding
+        workers: Number of processes for the runs
+        callback: Called with a kmeans.IterationInfo (timings, points moved,
+            centroid shift, TD²) after every iteration
 
     Returns:
         clusters: Dictionary mapping cluster name to list of points
         centroids: Dictionary mapping cluster name to centroid coordinates
         iterations: Number of iterations performed
     """
-    # Extract points and initial labels
-    points = [(x, y) for x, y, _ in dataset]
-    initial_labels = [label for _, _, label in dataset]
+    points, array, codes, label_names = _split_dataset(dataset)
 
-    # Initialize centroids using Forgy method (random selection from data points)
-    # For simplicity, we'll use the first K unique points
-    unique_labels = list(set(initial_labels))
-
-    # Group points by their initial labels
-    label_groups = {}
-    for i, label in enumerate(initial_labels):
-        if label not in label_groups:
-            label_groups[label] = []
-        label_groups[label].append(points[i])
-
-    # Get cluster names (first K unique labels)
-    cluster_names = list(label_groups.keys())[:K]
+    # Cluster names: the first K initial labels in order of appearance
+    cluster_names = label_names[:K]
 
     # If we need more cluster names, generate them
     name_counter = 1
@@ -43,55 +54,54 @@ def forgy_lloyd_kmeans(dataset, K, max_iterations=100, tolerance=1e-6):
             cluster_names.append(new_name)
         name_counter += 1
 
-    # Initialize centroids as means of initial label groups
-    centroids = {}
-    for i, cluster_name in enumerate(cluster_names):
-        if cluster_name in label_groups:
-            group = label_groups[cluster_name]
-            centroid_x = sum(p[0] for p in group) / len(group)
-            centroid_y = sum(p[1] for p in group) / len(group)
-            centroids[cluster_name] = (centroid_x, centroid_y)
-        else:
-            # Use a point from the dataset if no initial group exists
-            centroids[cluster_name] = points[i % len(points)]
-
-    # Lloyd's algorithm iterations
-    clusters = {name: [] for name in cluster_names}
-    iteration = 0
-
-    for iteration in range(max_iterations):
-        # Assignment step: assign each point to nearest centroid
-        clusters = {name: [] for name in cluster_names}
-
-        for point in points:
-            distances = [euclidean_distance(point, centroids[name]) for name in cluster_names]
-            nearest_cluster = cluster_names[distances.index(min(distances))]
-            clusters[nearest_cluster].append(point)
-
-        # Update step: recalculate centroids
-        new_centroids = {}
-        for cluster_name in cluster_names:
-            if clusters[cluster_name]:  # If cluster is not empty
-                centroid_x = sum(p[0] for p in clusters[cluster_name]) / len(clusters[cluster_name])
-                centroid_y = sum(p[1] for p in clusters[cluster_name]) / len(clusters[cluster_name])
-                new_centroids[cluster_name] = (centroid_x, centroid_y)
+    if init == "labels":
+        # Initialize centroids as means of initial label groups
+        initial = np.empty((K, array.shape[1]))
+        counts = np.bincount(codes, minlength=len(label_names))
+        for i in range(K):
+            if i < len(label_names):
+                initial[i] = array[codes == i].sum(axis=0) / counts[i]
             else:
-                # Keep old centroid if cluster is empty
-                new_centroids[cluster_name] = centroids[cluster_name]
+                # Use a point from the dataset if no initial group exists
+                initial[i] = array[i % len(array)]
+        result = kmeans(array, initial, max_iterations, tolerance, algorithm=algorithm,
+                        callback=callback)
+    else:
+        result = kmeans_restarts(array, K, n_init, init, seed, workers,
+                                 max_iterations=max_iterations, tolerance=tolerance,
+                                 algorithm=algorithm, callback=callback).best
 
-        # Check for convergence
-        max_movement = max(euclidean_distance(centroids[name], new_centroids[name])
-                          for name in cluster_names)
+    clusters = {name: [] for name in cluster_names}
+    for point, label in zip(points, result.labels.tolist()):
+        clusters[cluster_names[label]].append(point)
+    centroids = {name: tuple(result.centroids[i].tolist())
+                 for i, name in enumerate(cluster_names)}
 
-        centroids = new_centroids
+    return clusters, centroids, result.iterations
 
-        if max_movement < tolerance:
-            print(f"Converged after {iteration + 1} iterations")
-            break
-    else:
-        print(f"Reached maximum iterations ({max_iterations})")
+def _split_dataset(dataset):
+    """
+    Split the labelled points into coordinates and initial label codes.
 
-    return clusters, centroids, iteration + 1
+    Returns:
+        points: List of point tuples, in dataset order
+        array: The points as an (n, d) array
+        codes: Initial label of every point, numbered by first appearance
+        label_names: Initial labels, in order of first appearance
+    """
+    if hasattr(dataset, "iter_blocks"):
+        array = dataset.to_array()
+        points = list(map(tuple, array.tolist()))
+        if dataset.label_codes is None:
+            return points, array, np.zeros(len(array), dtype=np.int64), []
+        return points, array, np.asarray(dataset.label_codes), list(dataset.label_names)
+
+    points = [tuple(row[:-1]) for row in dataset]
+    codes = {}
+    for row in dataset:
+        codes.setdefault(row[-1], len(codes))
+    array = np.array(points, dtype=np.float64).reshape(len(points), -1)
+    return points, array, np.array([codes[row[-1]] for row in dataset], dtype=np.int64), list(codes)
 
 def calculate_td_squared(clusters, centroids):
     """
@@ -109,8 +119,8 @@ def calculate_td_squared(clusters, centroids):
     for cluster_name, cluster_points in clusters.items():
         centroid = centroids[cluster_name]
         for point in cluster_points:
-            distance = euclidean_distance(point, centroid)
-            td_squared += distance ** 2
+            # Squared distance directly, without a square root to undo
+            td_squared += sum((a - b) ** 2 for a, b in zip(point, centroid))
     return td_squared
 
 # Example usage
@@ -132,7 +142,7 @@ if __name__ == "__main__":
     print("Dataset:", dataset)
     print(f"K = {K}\n")
 
-    clusters, centroids, iterations = forgy_lloyd_kmeans(dataset, K)
+    clusters, centroids, iterations = forgy_lloyd_kmeans(dataset, K, callback=print_iteration)
 
     td_squared = calculate_td_squared(clusters, centroids)
 
@@ -0,0 +1,155 @@
+"""
+Array-backed KD-tree over k-means centroids.
+
+The tree is rebuilt from the centroids in every iteration (O(K log K))
+and answers nearest-centroid queries for a whole block of points at once:
+every point first descends to the leaf that contains it, which gives a
+tight upper bound on its nearest distance, and then the block walks the
+tree together, each node only visiting the points whose bound its
+bounding box can still beat. In low dimension a point looks at about
+log K nodes instead of all K centroids.
+"""
+
+import numpy as np
+
+
+def _distances(rows, centroids):
+    # Same arithmetic as kmeans.point_distances, so ties break the same way
+    diff = rows - centroids
+    return np.sqrt(np.einsum("ij,ij->i", diff, diff))
+
+
+class CentroidTree:
+    """
+    KD-tree with its nodes stored in flat arrays.
+
+    Node k has the bounding box lower[k]..upper[k] of its centroids. An
+    inner node has children left[k] and right[k] and splits on coordinate
+    dim[k] at value split[k]; a leaf (left[k] == -1) holds the centroids
+    order[start[k]:stop[k]], in increasing index.
+    """
+
+    def __init__(self, centroids, leaf_size=8):
+        self.centroids = np.asarray(centroids, dtype=np.float64)
+        K, d = self.centroids.shape
+        self.leaf_size = leaf_size
+        self.order = np.arange(K)
+
+        capacity = 2 * max(1, -(-K // leaf_size)) + 1
+        self.lower = np.empty((capacity, d))
+        self.upper = np.empty((capacity, d))
+        self.left = np.full(capacity, -1, dtype=np.int64)
+        self.right = np.full(capacity, -1, dtype=np.int64)
+        self.dim = np.zeros(capacity, dtype=np.int64)
+        self.split = np.zeros(capacity)
+        self.start = np.zeros(capacity, dtype=np.int64)
+        self.stop = np.zeros(capacity, dtype=np.int64)
+        self.nodes = 0
+        self._build(0, K)
+
+    def _build(self, start, stop):
+        node = self.nodes
+        if node == len(self.left):
+            self._grow()
+        self.nodes += 1
+
+        members = self.centroids[self.order[start:stop]]
+        self.lower[node] = members.min(axis=0)
+        self.upper[node] = members.max(axis=0)
+        self.start[node] = start
+        self.stop[node] = stop
+
+        widths = self.upper[node] - self.lower[node]
+        if stop - start <= self.leaf_size or not widths.any():
+            self.order[start:stop].sort()
+            return node
+
+        # Split at the median of the widest coordinate
+        dim = int(np.argmax(widths))
+        middle = (start + stop) // 2
+        part = np.argpartition(members[:, dim], middle - start)
+        self.order[start:stop] = self.order[start:stop][part]
+        self.dim[node] = dim
+        self.split[node] = self.centroids[self.order[middle], dim]
+        self.left[node] = self._build(start, middle)
+        self.right[node] = self._build(middle, stop)
+        return node
+
+    def _grow(self):
+        extra = len(self.left)
+        self.lower = np.vstack([self.lower, np.empty_like(self.lower)])
+        self.upper = np.vstack([self.upper, np.empty_like(self.upper)])
+        for name in ("left", "right"):
+            setattr(self, name, np.concatenate([getattr(self, name), np.full(extra, -1)]))
+        for name in ("dim", "split", "start", "stop"):
+            array = getattr(self, name)
+            setattr(self, name, np.concatenate([array, np.zeros(extra, dtype=array.dtype)]))
+
+    def _leaf_of(self, points):
+        """The leaf every point falls into when descending by the splits."""
+        node = np.zeros(len(points), dtype=np.int64)
+        inner = np.flatnonzero(self.left[node] >= 0)
+        while len(inner):
+            current = node[inner]
+            goes_left = points[inner, self.dim[current]] < self.split[current]
+            node[inner] = np.where(goes_left, self.left[current], self.right[current])
+            inner = inner[self.left[node[inner]] >= 0]
+        return node
+
+    def _scan_leaf(self, node, points, index, best, labels):
+        """Compare the points `index` with the centroids of a leaf."""
+        ids = self.order[self.start[node]:self.stop[node]]
+        rows = np.repeat(index, len(ids))
+        cols = np.tile(ids, len(index))
+        distances = _distances(points[rows], self.centroids[cols]).reshape(len(index), len(ids))
+        # ids are increasing, so argmin keeps the lowest index of a tie
+        k = np.argmin(distances, axis=1)
+        d = distances[np.arange(len(index)), k]
+        found = ids[k]
+        better = (d < best[index]) | ((d == best[index]) & (found < labels[index]))
+        best[index[better]] = d[better]
+        labels[index[better]] = found[better]
+        return len(rows)
+
+    def query(self, points):
+        """
+        Nearest centroid of every point.
+
+        Ties go to the lowest centroid index, as in the brute-force search.
+
+        Returns:
+            labels: Index of the nearest centroid of every point
+            distances: Distance to it
+            evaluations: Number of point to centroid distances computed
+        """
+        points = np.asarray(points, dtype=np.float64)
+        n = len(points)
+        best = np.full(n, np.inf)
+        labels = np.full(n, len(self.centroids), dtype=np.int64)
+
+        # Start from the leaf of every point for a tight bound
+        evaluations = 0
+        home = self._leaf_of(points)
+        for node in np.unique(home):
+            evaluations += self._scan_leaf(node, points, np.flatnonzero(home == node),
+                                           best, labels)
+
+        # Walk the tree with every point that a node could still improve
+        stack = [(0, np.arange(n))]
+        while stack:
+            node, index = stack.pop()
+            gap = np.maximum(self.lower[node] - points[index], 0.0)
+            gap = np.maximum(gap, points[index] - self.upper[node])
+            box = np.sqrt(np.einsum("ij,ij->i", gap, gap))
+            # A small slack keeps equally distant centroids in the search
+            index = index[box <= best[index] * (1 + 1e-12)]
+            if not len(index):
+                continue
+            if self.left[node] < 0:
+                rest = index[home[index] != node]
+                if len(rest):
+                    evaluations += self._scan_leaf(node, points, rest, best, labels)
+            else:
+                stack.append((self.right[node], index))
+                stack.append((self.left[node], index))
+        return labels, best, evaluations
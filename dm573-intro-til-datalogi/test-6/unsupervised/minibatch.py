@@ -0,0 +1,120 @@
+"""
+Mini-batch k-means for streams and datasets that do not fit in memory.
+
+Every batch is assigned to the nearest centroids, and each centroid then
+moves towards the mean of its new points with its own learning rate
+1 / (number of points it has seen). For one point at a time this is
+Sculley's update; for a whole batch it makes every centroid the running
+mean of all points ever assigned to it. Memory use is bounded by the
+batch size.
+"""
+
+import numpy as np
+
+from kmeans import as_points, cluster_sums, dimensions, iter_blocks, nearest_centroids
+
+
+class MiniBatchKMeans:
+    """
+    Streaming k-means with partial_fit.
+
+    Attributes:
+        centroids: Current centroids, shape (K, d), or None before the first batch
+        seen: Number of points each centroid has absorbed
+        batches: Number of batches seen
+    """
+
+    def __init__(self, K, centroids=None):
+        self.K = K
+        self.centroids = None
+        self.seen = np.zeros(K, dtype=np.int64)
+        self.batches = 0
+        if centroids is not None:
+            self.centroids = np.array(centroids, dtype=np.float64).reshape(K, -1)
+
+    def partial_fit(self, batch):
+        """
+        Update the centroids with one batch of points.
+
+        Before the first batch without initial centroids, the first K
+        points become the centroids.
+
+        Returns:
+            Labels of the batch, with respect to the centroids before the update
+        """
+        batch = np.asarray(batch, dtype=np.float64)
+        if batch.ndim == 1:
+            batch = batch.reshape(-1, 1 if self.centroids is None else self.centroids.shape[1])
+        if self.centroids is None:
+            if len(batch) < self.K:
+                raise ValueError(f"The first batch needs at least K = {self.K} points")
+            self.centroids = batch[:self.K].copy()
+
+        labels, _ = nearest_centroids(batch, self.centroids)
+        counts = np.bincount(labels, minlength=self.K)
+        sums = cluster_sums(batch, labels, self.K)
+
+        # Running mean per centroid: learning rate 1 / points seen so far
+        hit = counts > 0
+        seen = self.seen[hit] + counts[hit]
+        self.centroids[hit] += (sums[hit] - counts[hit, None] * self.centroids[hit]) / seen[:, None]
+        self.seen[hit] = seen
+        self.batches += 1
+        return labels
+
+    def fit(self, data, batch_size=10_000, epochs=1, seed=None):
+        """
+        Run partial_fit over an array, memmap or Dataset.
+
+        With a seed the batches are visited in a random order every epoch;
+        each batch is still a contiguous block of rows, so a memmap is
+        read sequentially within the batch.
+        """
+        points = as_points(data)
+        starts = np.arange(0, len(points), batch_size)
+        rng = np.random.default_rng(seed) if seed is not None else None
+        for _ in range(epochs):
+            if rng is None:
+                for _, block in iter_blocks(points, batch_size):
+                    self.partial_fit(block)
+            else:
+                for start in rng.permutation(starts):
+                    self.partial_fit(_rows(points, start, batch_size))
+        return self
+
+    def fit_stream(self, batches):
+        """Run partial_fit on every batch of an iterable, e.g. a generator."""
+        for batch in batches:
+            self.partial_fit(batch)
+        return self
+
+    def predict(self, data, block_rows=100_000):
+        """Labels of all points, computed in blocks."""
+        points = as_points(data)
+        labels = np.empty(len(points), dtype=np.int64)
+        for start, block in iter_blocks(points, block_rows):
+            labels[start:start + len(block)], _ = nearest_centroids(block, self.centroids)
+        return labels
+
+    def td_squared(self, data, block_rows=100_000):
+        """
+        Optional final pass: TD² of the data with the current centroids.
+
+        Every point counts with its nearest centroid, so this is the
+        k-means objective of the streamed model on the full dataset.
+        """
+        points = as_points(data)
+        if dimensions(points) != self.centroids.shape[1]:
+            raise ValueError("Data and centroids have different dimensions")
+        total = 0.0
+        for _, block in iter_blocks(points, block_rows):
+            _, distances = nearest_centroids(block, self.centroids)
+            total += distances.sum()
+        return total
+
+
+def _rows(points, start, count):
+    if hasattr(points, "iter_blocks"):
+        columns = [points.column(name)[start:start + count] for name in points.columns]
+        return np.column_stack(columns)
+    return np.asarray(points[start:start + count], dtype=np.float64)
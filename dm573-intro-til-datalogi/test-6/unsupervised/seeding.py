@@ -0,0 +1,230 @@
+"""
+Seeding for k-means and parallel restarts that keep the best result.
+
+k-means++ (Arthur and Vassilvitskii) picks every new centroid with
+probability proportional to its squared distance from the centroids
+chosen so far. k-means|| (Bahmani et al.) oversamples in a few rounds,
+each one pass over the data, and then reduces the candidates to K with
+weighted k-means++; it suits data read from disk.
+
+kmeans_restarts() runs n_init seeded runs in a process pool. The data are
+not sent to the workers per run: on platforms that fork, the workers
+inherit them (a memmap stays a memmap), elsewhere every worker receives
+them once.
+"""
+
+import multiprocessing
+import os
+from collections import namedtuple
+from contextlib import contextmanager
+
+import numpy as np
+
+from kmeans import as_points, iter_blocks, kmeans, nearest_centroids
+
+RestartResult = namedtuple("RestartResult", ["best", "td_squared", "all_td_squared"])
+
+
+def take_rows(points, indices):
+    """Rows of an array, memmap or Dataset as an array."""
+    indices = np.asarray(indices)
+    if hasattr(points, "iter_blocks"):
+        return np.column_stack([points.column(name)[indices] for name in points.columns])
+    return np.asarray(points[indices], dtype=np.float64).reshape(len(indices), -1)
+
+
+def _update_distances(points, centroids, closest, block_rows):
+    """closest[i] = min(closest[i], squared distance from point i to the centroids)."""
+    for start, block in iter_blocks(points, block_rows):
+        _, distances = nearest_centroids(block, centroids)
+        part = closest[start:start + len(block)]
+        np.minimum(part, distances, out=part)
+
+
+def kmeans_plusplus(data, K, rng=None, block_rows=1 << 16):
+    """
+    k-means++ seeding.
+
+    Args:
+        data: Points as an (n, d) array, a memmap, or a Dataset
+        K: Number of centroids
+        rng: numpy Generator or seed
+
+    Returns:
+        Initial centroids, shape (K, d)
+    """
+    points = as_points(data)
+    rng = np.random.default_rng(rng)
+    n = len(points)
+    chosen = [int(rng.integers(n))]
+    closest = np.full(n, np.inf)
+    centroids = take_rows(points, chosen)
+
+    for _ in range(1, K):
+        _update_distances(points, centroids[-1:], closest, block_rows)
+        total = closest.sum()
+        if total > 0:
+            index = int(np.searchsorted(np.cumsum(closest), rng.random() * total, side="right"))
+            index = min(index, n - 1)
+        else:
+            # All points coincide with a centroid already
+            index = int(rng.integers(n))
+        centroids = np.vstack([centroids, take_rows(points, [index])])
+    return centroids
+
+
+def _weighted_plusplus(candidates, weights, K, rng):
+    chosen = [int(rng.choice(len(candidates), p=weights / weights.sum()))]
+    closest = np.full(len(candidates), np.inf)
+    for _ in range(1, K):
+        _, distances = nearest_centroids(candidates, candidates[chosen[-1:]])
+        np.minimum(closest, distances, out=closest)
+        mass = closest * weights
+        total = mass.sum()
+        if total > 0:
+            chosen.append(int(rng.choice(len(candidates), p=mass / total)))
+        else:
+            chosen.append(int(rng.integers(len(candidates))))
+    return candidates[chosen]
+
+
+def kmeans_parallel(data, K, rng=None, rounds=5, oversampling=None, block_rows=1 << 16):
+    """
+    k-means|| seeding.
+
+    Every round samples each point independently with probability
+    oversampling · D²(x) / Σ D², so a round is one pass over the data. The
+    candidates are weighted by the number of points closest to them and
+    reduced to K centroids with weighted k-means++.
+
+    Args:
+        data: Points as an (n, d) array, a memmap, or a Dataset
+        K: Number of centroids
+        rng: numpy Generator or seed
+        rounds: Number of sampling rounds
+        oversampling: Expected number of candidates per round (default 2K)
+
+    Returns:
+        Initial centroids, shape (K, d)
+    """
+    points = as_points(data)
+    rng = np.random.default_rng(rng)
+    n = len(points)
+    oversampling = oversampling or 2 * K
+
+    candidates = take_rows(points, [int(rng.integers(n))])
+    closest = np.full(n, np.inf)
+    new = candidates
+    for _ in range(rounds):
+        _update_distances(points, new, closest, block_rows)
+        total = closest.sum()
+        if total == 0:
+            break
+        picked = np.flatnonzero(rng.random(n) < oversampling * closest / total)
+        if not len(picked):
+            continue
+        new = take_rows(points, picked)
+        candidates = np.vstack([candidates, new])
+
+    if len(candidates) < K:
+        extra = rng.choice(n, K - len(candidates), replace=n < K)
+        candidates = np.vstack([candidates, take_rows(points, extra)])
+
+    weights = np.zeros(len(candidates))
+    for _, block in iter_blocks(points, block_rows):
+        labels, _ = nearest_centroids(block, candidates)
+        weights += np.bincount(labels, minlength=len(candidates))
+    return _weighted_plusplus(candidates, weights, K, rng)
+
+
+INITS = {
+    "k-means++": kmeans_plusplus,
+    "k-means||": kmeans_parallel,
+}
+
+# Data shared with the worker processes, set before the pool starts
+_shared = {}
+
+
+def _init_worker(points):
+    if points is not None:
+        _shared["points"] = points
+
+
+def shared_points():
+    """The data of the running shared_pool(), in the parent or a worker."""
+    return _shared["points"]
+
+
+@contextmanager
+def shared_pool(points, workers):
+    """
+    Process pool whose workers can read points through shared_points().
+
+    With fork the workers inherit the data, so nothing is pickled; with
+    other start methods every worker receives a copy once. With at most
+    one worker no pool is started and None is yielded.
+    """
+    _shared["points"] = points
+    try:
+        if workers <= 1:
+            yield None
+        else:
+            forked = multiprocessing.get_start_method() == "fork"
+            with multiprocessing.Pool(workers, _init_worker,
+                                      (None if forked else points,)) as pool:
+                yield pool
+    finally:
+        _shared.clear()
+
+
+def _restart(task):
+    seed, K, init, options = task
+    points = shared_points()
+    centroids = INITS[init](points, K, np.random.default_rng(seed))
+    result = kmeans(points, centroids, **options)
+    return result.td_squared, result
+
+
+def kmeans_restarts(data, K, n_init=10, init="k-means++", seed=None, workers=None,
+                    **options):
+    """
+    Run k-means n_init times from independent seedings and keep the best.
+
+    Args:
+        data: Points as an (n, d) array, a memmap, or a Dataset
+        K: Number of clusters
+        n_init: Number of runs
+        init: "k-means++" or "k-means||"
+        seed: Root seed; every run gets an independent child stream
+        workers: Number of processes (default: CPU count, at most n_init)
+        **options: Passed to kmeans(), e.g. max_iterations or algorithm.
+            With workers, a callback is not sent along but called in this
+            process with the trace of every run, run by run in seed order
+            as the runs finish
+
+    Returns:
+        RestartResult(best, td_squared, all_td_squared): the KMeansResult
+        with the smallest TD² (as calculate_td_squared), that TD², and the
+        TD² of every run
+    """
+    if init not in INITS:
+        raise ValueError(f"Unknown init: {init}")
+    points = as_points(data)
+    seeds = np.random.SeedSequence(seed).spawn(n_init)
+    workers = min(workers or os.cpu_count(), n_init)
+    # A callback in a worker would run on a copy, out of sight
+    callback = options.pop("callback", None) if workers > 1 else None
+    tasks = [(s, K, init, options) for s in seeds]
+
+    results = []
+    with shared_pool(points, workers) as pool:
+        for score, result in (pool.imap if pool else map)(_restart, tasks):
+            if callback is not None:
+                for info in result.trace:
+                    callback(info)
+            results.append((score, result))
+
+    scores = [score for score, _ in results]
+    best = int(np.argmin(scores))
+    return RestartResult(results[best][1], scores[best], scores)
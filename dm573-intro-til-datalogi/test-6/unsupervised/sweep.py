@@ -0,0 +1,226 @@
+"""
+Sweep the number of clusters K for the elbow and silhouette plots.
+
+The values of K are cut into contiguous segments, one per worker
+process. Inside a segment every K is warm-started from the centroids of
+the previous one: the cluster with the largest sum of squared distances
+is split in two along its principal axis, so only a few Lloyd iterations
+are needed. The first K of a segment, and any K that cannot be reached
+by splits, is seeded with k-means++ instead. The silhouette is estimated on a random sample of points,
+with the pairwise distances computed in blocks.
+"""
+
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from kmeans import as_points, iter_blocks, kmeans
+from seeding import kmeans_plusplus, shared_points, shared_pool, take_rows
+
+SweepResult = namedtuple(
+    "SweepResult",
+    ["ks", "td_squared", "silhouette", "centroids", "iterations", "warm_started"])
+
+# Fewest values of K per worker by default; every worker seeds its first
+# K from scratch, which takes more Lloyd iterations than a warm start
+MIN_SEGMENT = 4
+
+
+def cluster_scatter(points, labels, centroids, block_rows=1 << 16):
+    """Sum of squared distances to the centroid, per cluster."""
+    K = len(centroids)
+    scatter = np.zeros(K)
+    for start, block in iter_blocks(points, block_rows):
+        block_labels = labels[start:start + len(block)]
+        diff = block - centroids[block_labels]
+        scatter += np.bincount(block_labels, np.einsum("ij,ij->i", diff, diff), K)
+    return scatter
+
+
+def split_cluster(points, labels, centroids, cluster, block_rows=1 << 16):
+    """
+    Replace one centroid by two, one standard deviation either side of
+    the centroid along the principal axis of its points.
+
+    Returns:
+        The new centroids, or None if the cluster has fewer than two
+        distinct points
+    """
+    centroid = centroids[cluster]
+    d = len(centroid)
+    covariance = np.zeros((d, d))
+    count = 0
+    for start, block in iter_blocks(points, block_rows):
+        members = block[labels[start:start + len(block)] == cluster] - centroid
+        covariance += members.T @ members
+        count += len(members)
+    if count < 2:
+        return None
+    values, vectors = np.linalg.eigh(covariance / count)
+    if values[-1] <= 0:
+        return None
+    offset = np.sqrt(max(values[-1], 0.0)) * vectors[:, -1]
+    return np.vstack([np.delete(centroids, cluster, axis=0),
+                      centroid - offset, centroid + offset])
+
+
+def grow(points, result, K, block_rows=1 << 16):
+    """
+    Centroids for K clusters from a result with fewer, by repeated splits.
+
+    The points of a split cluster go to the nearer half, and the halves
+    can be split again in the same step if their scatter is the largest.
+
+    Raises:
+        ValueError: If there are too few distinct points to split
+    """
+    centroids = result.centroids
+    labels = result.labels
+    scatter = cluster_scatter(points, labels, centroids, block_rows)
+    while len(centroids) < K:
+        cluster = int(np.argmax(scatter))
+        if scatter[cluster] <= 0:
+            raise ValueError(f"No cluster left to split on the way to K = {K}")
+        split = split_cluster(points, labels, centroids, cluster, block_rows)
+        if split is None:
+            scatter[cluster] = -1.0
+            continue
+        centroids = split
+        inside = labels == cluster
+        labels = labels - (labels > cluster)
+        halves = np.zeros(2)
+        low, high = centroids[-2], centroids[-1]
+        for start, block in iter_blocks(points, block_rows):
+            rows = np.flatnonzero(inside[start:start + len(block)])
+            members = block[rows]
+            side = ((members - 0.5 * (low + high)) @ (high - low) > 0).astype(np.int64)
+            diff = members - centroids[len(centroids) - 2 + side]
+            halves += np.bincount(side, np.einsum("ij,ij->i", diff, diff), 2)
+            labels[start + rows] = len(centroids) - 2 + side
+        scatter = np.append(np.delete(scatter, cluster), halves)
+    return centroids
+
+
+def sampled_silhouette(sample, labels, K, block_rows=1024):
+    """
+    Mean silhouette of the sampled points, within the sample.
+
+    The distances from a block of sample points to all sample points are
+    summed per cluster with one matrix product against the cluster
+    indicator matrix.
+
+    Returns:
+        The mean silhouette; points alone in their cluster count as 0
+    """
+    m = len(sample)
+    members = np.zeros((m, K))
+    members[np.arange(m), labels] = 1.0
+    sizes = members.sum(axis=0)
+    norms = np.einsum("ij,ij->i", sample, sample)
+
+    total = 0.0
+    for start in range(0, m, block_rows):
+        block = sample[start:start + block_rows]
+        own = labels[start:start + block_rows]
+        squared = norms[start:start + block_rows, None] - 2.0 * (block @ sample.T) + norms
+        distances = np.sqrt(np.maximum(squared, 0.0))
+        sums = distances @ members
+
+        rows = np.arange(len(block))
+        own_size = sizes[own] - 1
+        a = np.divide(sums[rows, own], own_size, out=np.zeros(len(block)),
+                      where=own_size > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            other = sums / sizes
+        other[rows, own] = np.inf
+        other[:, sizes == 0] = np.inf
+        b = other.min(axis=1)
+        with np.errstate(invalid="ignore"):
+            # No other cluster (b infinite) gives nan here, replaced by 0
+            scores = np.where((own_size > 0) & np.isfinite(b),
+                              (b - a) / np.maximum(np.maximum(a, b), 1e-300), 0.0)
+        total += scores.sum()
+    return total / m
+
+
+def _sweep_segment(task):
+    ks, seed, sample_index, options = task
+    points = shared_points()
+    rng = np.random.default_rng(seed)
+    sample = take_rows(points, sample_index)
+
+    rows = []
+    result = None
+    for K in ks:
+        centroids = None
+        if result is not None and len(result.centroids) <= K:
+            try:
+                centroids = grow(points, result, K)
+            except ValueError:
+                # Too few distinct points to split; seeded from scratch and
+                # reported through warm_started
+                pass
+        warm = centroids is not None
+        if not warm:
+            centroids = kmeans_plusplus(points, K, rng)
+        result = kmeans(points, centroids, **options)
+        silhouette = sampled_silhouette(sample, result.labels[sample_index], K)
+        rows.append((K, result.td_squared, silhouette, result.centroids,
+                     result.iterations, warm))
+    return rows
+
+
+def sweep_k(data, ks, sample_size=2000, seed=None, workers=None, **options):
+    """
+    Run k-means for every K in ks, warm-starting each K from the one before.
+
+    Args:
+        data: Points as an (n, d) array, a memmap, or a Dataset
+        ks: Values of K
+        sample_size: Number of points for the silhouette estimate
+        seed: Root seed for the seeding and the sample
+        workers: Number of processes, each taking a contiguous run of the
+            sorted ks. Only the first K of a run is seeded from scratch, so
+            fewer workers means more warm starts; the default is the CPU
+            count, but with at least MIN_SEGMENT values of K per worker
+        **options: Passed to kmeans(), e.g. max_iterations or algorithm
+
+    Returns:
+        SweepResult(ks, td_squared, silhouette, centroids, iterations,
+        warm_started) with one entry per K, in increasing order of K;
+        warm_started is False for the K seeded from scratch
+    """
+    points = as_points(data)
+    ks = sorted(set(ks))
+    workers = workers or min(os.cpu_count(), len(ks) // MIN_SEGMENT)
+    workers = max(1, min(workers, len(ks)))
+    root = np.random.SeedSequence(seed)
+    sample_rng, *segment_seeds = [np.random.default_rng(s) for s in root.spawn(workers + 1)]
+    sample_index = np.sort(sample_rng.choice(len(points), min(sample_size, len(points)),
+                                             replace=False))
+
+    tasks = [(list(segment), segment_seed, sample_index, options)
+             for segment, segment_seed in zip(np.array_split(ks, workers), segment_seeds)]
+    with shared_pool(points, workers) as pool:
+        segments = list((pool.map if pool else map)(_sweep_segment, tasks))
+
+    rows = [row for segment in segments for row in segment]
+    return SweepResult(np.array([row[0] for row in rows]),
+                       np.array([row[1] for row in rows]),
+                       np.array([row[2] for row in rows]),
+                       [row[3] for row in rows],
+                       np.array([row[4] for row in rows]),
+                       np.array([row[5] for row in rows]))
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    centers = rng.normal(0, 10, (6, 2))
+    points = centers[rng.integers(0, 6, 5000)] + rng.normal(size=(5000, 2))
+
+    result = sweep_k(points, range(2, 11), seed=1)
+    print(" K        TD²  silhouette  iterations")
+    for K, td, silhouette, iterations in zip(result.ks, result.td_squared,
+                                             result.silhouette, result.iterations):
+        print(f"{K:2d} {td:10.1f} {silhouette:11.3f} {iterations:11d}")
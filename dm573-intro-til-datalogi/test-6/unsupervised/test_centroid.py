@@ -0,0 +1,93 @@
+import math
+
+import numpy as np
+import pytest
+
+from centroid import CentroidAccumulator, calculate_centroid
+
+
+def exact_centroid(points, weights=None):
+    # Correctly rounded sums per coordinate
+    points = np.asarray(points, dtype=np.float64)
+    if weights is None:
+        weights = np.ones(len(points))
+    total = math.fsum(weights)
+    return tuple(math.fsum(weights * points[:, j]) / total for j in range(points.shape[1]))
+
+
+def test_example():
+    assert calculate_centroid([(2, 3), (5, 5), (4, 1)]) == pytest.approx((11 / 3, 3.0))
+    with pytest.raises(ValueError):
+        calculate_centroid([])
+    with pytest.raises(ValueError):
+        CentroidAccumulator().centroid()
+
+
+def test_compensated_sum_of_large_offsets():
+    # Plain summation loses the small part of every point
+    rng = np.random.default_rng(0)
+    points = 1e12 + rng.uniform(0, 1, (100_000, 2))
+    centroid = CentroidAccumulator().add_data(points, block_rows=997).centroid()
+    # Within two units in the last place of 1e12
+    assert centroid == pytest.approx(exact_centroid(points), rel=0, abs=2.5e-4)
+
+
+def test_compensated_within_one_block():
+    # Plain summation of the block gives 0 for the first coordinate
+    block = np.array([[1e16, 1.0], [1.0, 2.0], [-1e16, 3.0]])
+    assert CentroidAccumulator().add_block(block).centroid() == (1 / 3, 2.0)
+    weighted = CentroidAccumulator().add_block(block, [1.0, 2.0, 1.0])
+    assert weighted.centroid() == (0.5, 2.0)
+
+    rng = np.random.default_rng(5)
+    points = 1e12 + rng.uniform(0, 1, (100_001, 2))
+    centroid = CentroidAccumulator().add_block(points).centroid()
+    assert centroid == pytest.approx(exact_centroid(points), rel=0, abs=2.5e-4)
+
+
+def test_weighted_blocks():
+    rng = np.random.default_rng(1)
+    points = rng.normal(size=(1000, 3))
+    weights = rng.uniform(0, 2, len(points))
+    accumulator = CentroidAccumulator().add_data(points, weights, block_rows=128)
+    assert accumulator.count == pytest.approx(weights.sum())
+    assert accumulator.centroid() == pytest.approx(exact_centroid(points, weights))
+
+
+def test_merge_of_parts_equals_whole():
+    rng = np.random.default_rng(2)
+    points = rng.normal(5.0, 1.0, (1000, 2))
+    merged = CentroidAccumulator()
+    for part in np.array_split(points, 7):
+        merged.merge(CentroidAccumulator().add_block(part))
+    merged.merge(CentroidAccumulator())
+    single = CentroidAccumulator()
+    for point in points:
+        single.add(point)
+    assert merged.count == single.count == len(points)
+    assert merged.centroid() == pytest.approx(exact_centroid(points))
+    assert single.centroid() == pytest.approx(exact_centroid(points))
+
+
+def test_remove_undoes_add():
+    rng = np.random.default_rng(3)
+    kept = rng.normal(size=(500, 2))
+    moved = rng.normal(100.0, 1.0, (200, 2))
+    accumulator = CentroidAccumulator().add_block(kept).add_block(moved)
+    accumulator.remove_block(moved[:150])
+    for point in moved[150:]:
+        accumulator.remove(point)
+    assert accumulator.count == len(kept)
+    assert accumulator.centroid() == pytest.approx(exact_centroid(kept))
+
+    weights = rng.uniform(1, 2, len(moved))
+    accumulator.add_block(moved, weights).remove_block(moved, weights)
+    assert accumulator.centroid() == pytest.approx(exact_centroid(kept))
+
+
+def test_memmap_input(tmp_path):
+    points = np.random.default_rng(4).normal(size=(300, 4))
+    path = tmp_path / "points.bin"
+    points.tofile(path)
+    mapped = np.memmap(path, dtype=np.float64, mode="r", shape=points.shape)
+    assert calculate_centroid(mapped) == pytest.approx(exact_centroid(points))
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from kdtree import CentroidTree
+from kmeans import choose_algorithm, kmeans
+
+
+def brute_force(points, centroids):
+    diff = points[:, None, :] - centroids[None, :, :]
+    distances = np.sqrt((diff ** 2).sum(axis=2))
+    labels = distances.argmin(axis=1)
+    return labels, distances[np.arange(len(points)), labels]
+
+
+@pytest.mark.parametrize("K, d, leaf_size", [(1, 2, 8), (7, 1, 1), (300, 2, 8),
+                                             (200, 3, 4), (50, 5, 8)])
+def test_query_matches_brute_force(K, d, leaf_size):
+    rng = np.random.default_rng(K + d)
+    centroids = rng.uniform(-1, 1, (K, d))
+    points = rng.uniform(-1.5, 1.5, (2000, d))
+    labels, distances, evaluations = CentroidTree(centroids, leaf_size).query(points)
+    expected_labels, expected_distances = brute_force(points, centroids)
+    assert np.array_equal(labels, expected_labels)
+    assert np.allclose(distances, expected_distances)
+    assert 0 < evaluations <= len(points) * K
+
+
+def test_ties_go_to_the_lowest_index():
+    # Duplicated centroids and grid points halfway between centroids
+    centroids = np.array([[0.0, 0.0], [2.0, 0.0], [0.0, 0.0], [2.0, 2.0], [0.0, 2.0]] * 4)
+    points = np.array([[x, y] for x in range(-1, 4) for y in range(-1, 4)], dtype=float)
+    labels, _, _ = CentroidTree(centroids, leaf_size=2).query(points)
+    assert np.array_equal(labels, brute_force(points, centroids)[0])
+
+
+def test_tree_matches_lloyd():
+    rng = np.random.default_rng(9)
+    points = rng.normal(size=(5000, 2)) * [3.0, 1.0]
+    initial = points[rng.choice(len(points), 300, replace=False)]
+    # The same blocks, so the cluster sums are added in the same order
+    options = dict(max_iterations=10, tolerance=0.0, block_rows=1000)
+    plain = kmeans(points, initial, algorithm="lloyd", **options)
+    tree = kmeans(points, initial, algorithm="tree", **options)
+    assert np.array_equal(tree.labels, plain.labels)
+    assert np.array_equal(tree.centroids, plain.centroids)
+    assert tree.distances_avoided > 0
+    # Two dimensions and 300 centroids: the default picks the tree
+    default = kmeans(points, initial, **options)
+    assert default.distances_avoided == tree.distances_avoided
+    assert np.array_equal(default.centroids, tree.centroids)
+
+
+def test_auto_choice():
+    assert choose_algorithm("auto", 10_000, 512, 2) == "tree"
+    assert choose_algorithm("auto", 10_000, 512, 8) == "hamerly"
+    assert choose_algorithm("auto", 10_000, 8, 2) == "hamerly"
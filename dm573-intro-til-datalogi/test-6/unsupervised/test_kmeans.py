@@ -0,0 +1,137 @@
+import numpy as np
+import pytest
+
+import kmeans as kmeans_module
+from kmeans import kmeans, nearest_centroids, td_squared
+
+
+def naive_lloyd(points, centroids, iterations):
+    # Every distance computed directly; empty clusters keep their centroid
+    centroids = centroids.copy()
+    for _ in range(iterations):
+        distances = ((points[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+        labels = distances.argmin(axis=1)
+        for k in range(len(centroids)):
+            if np.any(labels == k):
+                centroids[k] = points[labels == k].mean(axis=0)
+    return labels, centroids
+
+
+def blobs(n=600, K=5, d=3, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(-10, 10, (K, d))
+    points = centers[rng.integers(0, K, n)] + rng.normal(size=(n, d))
+    return points, points[rng.choice(n, K, replace=False)]
+
+
+@pytest.mark.parametrize("block_rows", [None, 1, 37])
+def test_matches_naive_lloyd(block_rows):
+    points, initial = blobs()
+    result = kmeans(points, initial, max_iterations=5, tolerance=0.0,
+                    block_rows=block_rows)
+    labels, centroids = naive_lloyd(points, initial, 5)
+    assert result.iterations == 5
+    assert np.array_equal(result.labels, labels)
+    assert np.allclose(result.centroids, centroids)
+    assert list(result.counts) == list(np.bincount(labels, minlength=len(initial)))
+
+
+def test_converges_and_reports_td_squared():
+    points, initial = blobs(seed=1)
+    result = kmeans(points, initial)
+    assert result.converged
+    expected = ((points - result.centroids[result.labels]) ** 2).sum()
+    assert result.td_squared == pytest.approx(expected)
+    assert td_squared(points, result.labels, result.centroids, block_rows=50) == \
+        pytest.approx(expected)
+
+
+def test_nearest_centroids():
+    points, initial = blobs(n=200, seed=2)
+    labels, distances = nearest_centroids(points, initial)
+    exact = ((points[:, None, :] - initial[None, :, :]) ** 2).sum(axis=2)
+    assert np.array_equal(labels, exact.argmin(axis=1))
+    assert np.allclose(distances, exact.min(axis=1))
+
+
+def test_empty_cluster_keeps_centroid():
+    points = np.array([[0.0], [1.0], [10.0], [11.0]])
+    result = kmeans(points, [[0.0], [10.0], [100.0]])
+    assert list(result.counts) == [2, 2, 0]
+    assert result.centroids.ravel() == pytest.approx([0.5, 10.5, 100.0])
+
+
+def test_memmap_and_one_dimensional_input(tmp_path):
+    points, initial = blobs(n=300, d=1, seed=3)
+    path = tmp_path / "points.bin"
+    points.tofile(path)
+    mapped = np.memmap(path, dtype=np.float64, mode="r", shape=points.shape)
+    in_memory = kmeans(points.ravel(), initial.ravel(), block_rows=64)
+    from_disk = kmeans(mapped, initial, block_rows=64)
+    assert np.array_equal(in_memory.labels, from_disk.labels)
+    assert np.array_equal(in_memory.centroids, from_disk.centroids)
+
+
+def test_unknown_algorithm():
+    points, initial = blobs(n=50)
+    with pytest.raises(ValueError):
+        kmeans(points, initial, algorithm="fast")
+
+
+@pytest.mark.parametrize("algorithm", ["hamerly", "elkan"])
+@pytest.mark.parametrize("seed, block_rows", [(4, None), (5, 29)])
+def test_accelerated_matches_lloyd(algorithm, seed, block_rows):
+    points, initial = blobs(n=800, K=8, d=4, seed=seed)
+    plain = kmeans(points, initial, block_rows=block_rows, algorithm="lloyd")
+    fast = kmeans(points, initial, block_rows=block_rows, algorithm=algorithm)
+    assert fast.iterations == plain.iterations
+    assert np.array_equal(fast.labels, plain.labels)
+    assert np.array_equal(fast.centroids, plain.centroids)
+    assert fast.td_squared == pytest.approx(plain.td_squared)
+    assert plain.distances_avoided == 0
+    assert fast.distances_avoided > 0
+
+
+@pytest.mark.parametrize("pair_cost", [0, 1, 10**9])
+def test_elkan_pair_and_row_measurements(monkeypatch, pair_cost):
+    # 0 measures every open pair on its own, 10**9 every unsettled row in full
+    monkeypatch.setattr(kmeans_module, "ELKAN_PAIR_COST", pair_cost)
+    points, initial = blobs(n=1000, K=40, d=3, seed=8)
+    plain = kmeans(points, initial, block_rows=128, algorithm="lloyd")
+    fast = kmeans(points, initial, block_rows=128, algorithm="elkan")
+    assert np.array_equal(fast.labels, plain.labels)
+    assert np.array_equal(fast.centroids, plain.centroids)
+    assert fast.distances_avoided > 0
+
+
+@pytest.mark.parametrize("algorithm", ["hamerly", "elkan"])
+def test_accelerated_with_ties(algorithm):
+    # Integer points on a grid put many points at equal distances
+    rng = np.random.default_rng(6)
+    points = rng.integers(0, 6, (400, 2)).astype(float)
+    initial = points[rng.choice(len(points), 6, replace=False)]
+    plain = kmeans(points, initial, algorithm="lloyd")
+    fast = kmeans(points, initial, algorithm=algorithm)
+    assert np.array_equal(fast.labels, plain.labels)
+    assert np.array_equal(fast.centroids, plain.centroids)
+
+
+@pytest.mark.parametrize("algorithm", ["lloyd", "hamerly", "elkan", "tree"])
+def test_fused_td_squared_and_trace(algorithm):
+    points, initial = blobs(n=500, K=6, d=2, seed=7)
+    seen = []
+    result = kmeans(points, initial, max_iterations=4, tolerance=0.0, block_rows=64,
+                    algorithm=algorithm, callback=seen.append)
+    assert seen == result.trace
+    assert [info.iteration for info in result.trace] == [1, 2, 3, 4]
+
+    # The TD² of each iteration belongs to the centroids it produced
+    centroids = initial
+    for info in result.trace:
+        labels, centroids = naive_lloyd(points, centroids, 1)
+        expected = td_squared(points, labels, centroids)
+        assert info.td_squared == pytest.approx(expected)
+        assert 0 <= info.distances <= len(points) * len(initial)
+        assert info.assign_seconds <= info.seconds
+    assert result.td_squared == result.trace[-1].td_squared
+    assert result.trace[0].moved == len(points)
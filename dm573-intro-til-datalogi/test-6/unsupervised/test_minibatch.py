@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from minibatch import MiniBatchKMeans
+
+
+def naive_minibatch(batches, centroids):
+    # Every centroid is the mean of all points ever assigned to it
+    centroids = centroids.copy()
+    assigned = [[] for _ in centroids]
+    for batch in batches:
+        distances = ((batch[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+        for point, k in zip(batch, distances.argmin(axis=1)):
+            assigned[k].append(point)
+        for k, points in enumerate(assigned):
+            if points:
+                centroids[k] = np.mean(points, axis=0)
+    return centroids
+
+
+def make_points(n=1000, d=2, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(-5, 5, (4, d))
+    return centers[rng.integers(0, 4, n)] + rng.normal(size=(n, d))
+
+
+def test_partial_fit_matches_running_means():
+    points = make_points()
+    initial = points[:4].copy()
+    batches = np.array_split(points, 13)
+    model = MiniBatchKMeans(4, initial).fit_stream(batches)
+    assert model.batches == 13
+    assert model.seen.sum() == len(points)
+    assert np.allclose(model.centroids, naive_minibatch(batches, initial))
+
+
+def test_one_batch_is_one_lloyd_step():
+    points = make_points(seed=1)
+    model = MiniBatchKMeans(4)
+    labels = model.partial_fit(points)
+    initial = points[:4]
+    distances = ((points[:, None, :] - initial[None, :, :]) ** 2).sum(axis=2)
+    assert np.array_equal(labels, distances.argmin(axis=1))
+    for k in range(4):
+        assert model.centroids[k] == pytest.approx(points[labels == k].mean(axis=0))
+
+
+def test_fit_in_random_order():
+    points = make_points(seed=2)
+    first = MiniBatchKMeans(4, points[:4]).fit(points, batch_size=64, epochs=2, seed=7)
+    second = MiniBatchKMeans(4, points[:4]).fit(points, batch_size=64, epochs=2, seed=7)
+    assert np.array_equal(first.centroids, second.centroids)
+    assert first.seen.sum() == 2 * len(points)
+
+
+def test_predict_and_td_squared():
+    points = make_points(seed=3)
+    model = MiniBatchKMeans(4).fit(points, batch_size=100)
+    labels = model.predict(points, block_rows=77)
+    distances = ((points[:, None, :] - model.centroids[None, :, :]) ** 2).sum(axis=2)
+    assert np.array_equal(labels, distances.argmin(axis=1))
+    assert model.td_squared(points, block_rows=77) == pytest.approx(distances.min(axis=1).sum())
+    with pytest.raises(ValueError):
+        model.td_squared(points[:, :1])
+
+
+def test_first_batch_too_small():
+    with pytest.raises(ValueError):
+        MiniBatchKMeans(4).partial_fit(np.zeros((3, 2)))
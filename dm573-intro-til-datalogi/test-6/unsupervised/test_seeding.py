@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from kmeans import kmeans, td_squared
+from seeding import kmeans_parallel, kmeans_plusplus, kmeans_restarts
+
+
+def make_points(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(-20, 20, (6, 2))
+    return centers[rng.integers(0, 6, n)] + rng.normal(size=(n, 2))
+
+
+def rows_of(points):
+    return {tuple(row) for row in points}
+
+
+@pytest.mark.parametrize("init", [kmeans_plusplus, kmeans_parallel])
+def test_seeds_are_distinct_data_rows(init):
+    points = make_points()
+    centroids = init(points, 6, np.random.default_rng(1), block_rows=64)
+    assert centroids.shape == (6, 2)
+    assert len(rows_of(centroids)) == 6
+    assert rows_of(centroids) <= rows_of(points)
+
+
+@pytest.mark.parametrize("init", [kmeans_plusplus, kmeans_parallel])
+def test_seeding_is_reproducible(init):
+    points = make_points()
+    assert np.array_equal(init(points, 6, 2), init(points, 6, 2))
+
+
+def test_plusplus_with_coinciding_points():
+    points = np.zeros((10, 2))
+    points[0] = 1.0
+    centroids = kmeans_plusplus(points, 4, 3)
+    assert rows_of(centroids) == {(0.0, 0.0), (1.0, 1.0)}
+
+
+def test_parallel_with_few_candidates():
+    points = make_points(n=20, seed=4)
+    centroids = kmeans_parallel(points, 8, 5, rounds=1, oversampling=1)
+    assert len(centroids) == 8
+    assert rows_of(centroids) <= rows_of(points)
+
+
+@pytest.mark.parametrize("init", ["k-means++", "k-means||"])
+def test_restarts_keep_the_best_run(init):
+    points = make_points(seed=6)
+    result = kmeans_restarts(points, 6, n_init=4, init=init, seed=7, workers=1)
+    assert len(result.all_td_squared) == 4
+    assert result.td_squared == min(result.all_td_squared)
+    best = result.best
+    assert result.td_squared == best.td_squared
+    assert td_squared(points, best.labels, best.centroids) == pytest.approx(best.td_squared)
+
+
+def test_restarts_are_reproducible_in_parallel():
+    points = make_points(seed=8)
+    serial = kmeans_restarts(points, 6, n_init=4, seed=9, workers=1, algorithm="hamerly")
+    parallel = kmeans_restarts(points, 6, n_init=4, seed=9, workers=2, algorithm="hamerly")
+    assert serial.all_td_squared == parallel.all_td_squared
+    assert np.array_equal(serial.best.labels, parallel.best.labels)
+    # Every run is an ordinary k-means run from its own seeding
+    rng = np.random.default_rng(np.random.SeedSequence(9).spawn(4)[0])
+    first = kmeans(points, kmeans_plusplus(points, 6, rng))
+    assert first.td_squared == serial.all_td_squared[0]
+
+
+def test_callback_sees_every_run_in_parallel():
+    points = make_points(seed=10)
+    seen = {}
+    for workers in (1, 2):
+        calls = []
+        kmeans_restarts(points, 6, n_init=3, seed=11, workers=workers,
+                        callback=calls.append)
+        seen[workers] = [(info.iteration, info.moved, info.td_squared) for info in calls]
+    assert seen[1] == seen[2]
+    assert sum(iteration == 1 for iteration, _, _ in seen[2]) == 3
+
+
+def test_unknown_init():
+    with pytest.raises(ValueError):
+        kmeans_restarts(make_points(), 6, init="random")
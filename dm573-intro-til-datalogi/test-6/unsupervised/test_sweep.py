@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from kmeans import kmeans
+from sweep import grow, sampled_silhouette, sweep_k
+
+
+def naive_silhouette(points, labels):
+    scores = []
+    for i, point in enumerate(points):
+        distances = np.sqrt(((points - point) ** 2).sum(axis=1))
+        own = labels == labels[i]
+        if own.sum() == 1:
+            scores.append(0.0)
+            continue
+        a = distances[own].sum() / (own.sum() - 1)
+        b = min(distances[labels == k].mean() for k in set(labels) - {labels[i]})
+        scores.append((b - a) / max(a, b))
+    return np.mean(scores)
+
+
+def test_sampled_silhouette_matches_naive():
+    rng = np.random.default_rng(0)
+    points = rng.normal(size=(300, 3))
+    labels = rng.integers(0, 4, len(points))
+    assert sampled_silhouette(points, labels, 4, block_rows=64) == pytest.approx(
+        naive_silhouette(points, labels))
+
+
+def test_grow_skips_clusters_that_cannot_split():
+    points = np.array([[0.0], [5.0], [6.0], [0.0]])
+    result = kmeans(points, np.array([[0.0], [5.5]]))
+    assert sorted(grow(points, result, 3).ravel()) == [0.0, 5.0, 6.0]
+
+
+def test_grow_raises_without_distinct_points():
+    points = np.array([[0.0], [5.0], [5.0]])
+    result = kmeans(points, np.array([[0.0], [5.0]]))
+    with pytest.raises(ValueError):
+        grow(points, result, 3)
+
+
+def test_sweep_k():
+    rng = np.random.default_rng(1)
+    centers = rng.normal(0, 10, (4, 2))
+    points = centers[rng.integers(0, 4, 2000)] + rng.normal(size=(2000, 2))
+    result = sweep_k(points, [5, 2, 3, 4], sample_size=500, seed=2, workers=1)
+    assert list(result.ks) == [2, 3, 4, 5]
+    assert [len(c) for c in result.centroids] == [2, 3, 4, 5]
+    assert int(np.argmax(result.silhouette)) == 2
+    assert list(result.warm_started) == [False, True, True, True]
+
+    # K above the number of distinct points falls back to seeding
+    small = sweep_k(np.array([[0.0], [5.0], [5.0]]), [1, 2, 3], seed=0, workers=1)
+    assert small.td_squared[1] == 0.0
+    assert list(small.warm_started) == [False, True, False]
+
+
+def test_sweep_k_in_large_steps_keeps_warm_starts():
+    # Every step splits several clusters, including halves of earlier splits
+    rng = np.random.default_rng(3)
+    centers = rng.uniform(-50, 50, (60, 2))
+    points = centers[rng.integers(0, 60, 3000)] + rng.normal(size=(3000, 2))
+    result = sweep_k(points, range(2, 51, 5), sample_size=300, seed=4, workers=1,
+                     max_iterations=5)
+    assert list(result.warm_started) == [False] + [True] * 9
+    assert [len(c) for c in result.centroids] == list(range(2, 51, 5))
+
+
+def test_grow_splits_the_halves_again():
+    wide = [[0.0], [1.0], [10.0], [11.0], [20.0], [21.0], [30.0], [31.0]]
+    points = np.array(wide + [[100.0], [101.0]])
+    result = kmeans(points, np.array([[15.5], [100.5]]))
+    # The halves of the wide cluster are still wider than the tight one
+    centroids = grow(points, result, 4).ravel()
+    assert np.count_nonzero(centroids < 50) == 3
@@ -4,7 +4,12 @@
 
 from EnigmaView import EnigmaView
 from EnigmaConstants import ALPHABET, ROTOR_PERMUTATIONS, REFLECTOR_PERMUTATION
-from EnigmaRotor import EnigmaRotor, apply_permutation
+from EnigmaRotor import EnigmaRotor
+
+#Letter -> index, for both cases, and the reflector as an integer table
+LETTER_INDEX = {letter: index for index, letter in enumerate(ALPHABET)}
+LETTER_INDEX.update({letter.lower(): index for index, letter in enumerate(ALPHABET)})
+REFLECTOR_TABLE = tuple(LETTER_INDEX[letter] for letter in REFLECTOR_PERMUTATION)
 
 class EnigmaModel:
 
@@ -69,30 +74,59 @@ class EnigmaModel:
             if carry:
                 self._rotors[0].advance()
 
+    def encrypt(self, text):
+        """Encrypts a whole message, stepping the rotors as key_pressed does."""
+        return "".join(self.encrypt_iter(text))
+
+    def encrypt_iter(self, chars):
+        """
+        Encrypts the characters one at a time, as a generator.
+
+        Letters of either case step the rotors and come out as uppercase
+        letters; other characters (spaces, punctuation) are passed through
+        without stepping. The views are not notified.
+        """
+        slow, medium, fast = self._rotors
+        #Slow and medium rotors plus the reflector, as one table.
+        #Only recomputed when the medium rotor moves.
+        middle = None
+        for char in chars:
+            index = LETTER_INDEX.get(char)
+            if index is None:
+                yield char
+                continue
+
+            if fast.advance():
+                middle = None
+                if medium.advance():
+                    slow.advance()
+            if middle is None:
+                middle = self._middle_table()
+
+            index = fast.get_forward_table()[index]
+            index = fast.get_inverse_table()[middle[index]]
+            yield ALPHABET[index]
+
+    def _middle_table(self):
+        slow, medium, _ = self._rotors
+        medium_forward = medium.get_forward_table()
+        slow_forward = slow.get_forward_table()
+        slow_inverse = slow.get_inverse_table()
+        medium_inverse = medium.get_inverse_table()
+        return tuple(medium_inverse[slow_inverse[REFLECTOR_TABLE[slow_forward[medium_forward[index]]]]]
+                     for index in range(26))
+
     def _encrypt_letter(self, letter):
-        index = ALPHABET.index(letter)
-
-        index = apply_permutation(index,
-                                 self._rotors[2].get_permutation(),
-                                 self._rotors[2].get_offset())
-        index = apply_permutation(index,
-                                 self._rotors[1].get_permutation(),
-                                 self._rotors[1].get_offset())
-        index = apply_permutation(index,
-                                 self._rotors[0].get_permutation(),
-                                 self._rotors[0].get_offset())
-
-        index = apply_permutation(index, REFLECTOR_PERMUTATION, 0)
-
-        index = apply_permutation(index,
-                                 self._rotors[0].get_inverse_permutation(),
-                                 self._rotors[0].get_offset())
-        index = apply_permutation(index,
-                                 self._rotors[1].get_inverse_permutation(),
-                                 self._rotors[1].get_offset())
-        index = apply_permutation(index,
-                                 self._rotors[2].get_inverse_permutation(),
-                                 self._rotors[2].get_offset())
+        index = LETTER_INDEX[letter]
+
+        #Fast, medium and slow rotor, then the reflector and back
+        for rotor in reversed(self._rotors):
+            index = rotor.forward(index)
+
+        index = REFLECTOR_TABLE[index]
+
+        for rotor in self._rotors:
+            index = rotor.backward(index)
 
         return ALPHABET[index]
 
@@ -1,9 +1,22 @@
 from EnigmaConstants import ALPHABET
 
+def _to_indices(permutation):
+    return tuple(ALPHABET.index(letter) for letter in permutation)
+
+def _shifted_tables(table):
+    #One table per offset: tables[offset][index] is apply_permutation(index, table, offset)
+    return tuple(tuple((table[(index + offset) % 26] - offset) % 26 for index in range(26))
+                 for offset in range(26))
+
 class EnigmaRotor:
+    __slots__ = ("_permutation", "_inverse_permutation",
+                 "_forward_tables", "_inverse_tables", "_offset")
+
     def __init__(self, permutation):
         self._permutation = permutation
         self._inverse_permutation = self._invert_key(permutation)
+        self._forward_tables = _shifted_tables(_to_indices(permutation))
+        self._inverse_tables = _shifted_tables(_to_indices(self._inverse_permutation))
         self._offset = 0
 
     def get_offset(self):
@@ -15,6 +28,19 @@ class EnigmaRotor:
     def get_inverse_permutation(self):
         return self._inverse_permutation
 
+    #Integer permutation (index -> index) at the current offset
+    def get_forward_table(self):
+        return self._forward_tables[self._offset]
+
+    def get_inverse_table(self):
+        return self._inverse_tables[self._offset]
+
+    def forward(self, index):
+        return self._forward_tables[self._offset][index]
+
+    def backward(self, index):
+        return self._inverse_tables[self._offset][index]
+
     #Returns whether it looped back from Z to A
     #Used by the next rotor, to tell if it should also advance
     def advance(self):
@@ -24,13 +50,13 @@ class EnigmaRotor:
     def _invert_key(self, key):
         inverted = [""] * 26
         for i in range(26):
-            encrypted_letter = key[i]
-            encrypted_index = ALPHABET.index(encrypted_letter)
+            encrypted_index = ord(key[i]) - ord("A")
             inverted[encrypted_index] = ALPHABET[i]
         return "".join(inverted)
 
 def apply_permutation(index, permutation, offset):
     shifted_index = (index + offset) % 26
     encrypted_char = permutation[shifted_index]
-    encrypted_index = ALPHABET.index(encrypted_char)
+    #ALPHABET is A-Z in order, so the index is the distance from "A"
+    encrypted_index = ord(encrypted_char) - ord("A")
     return (encrypted_index - offset) % 26
@@ -0,0 +1,87 @@
+import random
+
+from EnigmaConstants import ALPHABET, REFLECTOR_PERMUTATION, ROTOR_PERMUTATIONS
+from EnigmaModel import EnigmaModel
+from EnigmaRotor import EnigmaRotor, apply_permutation
+
+
+def reference_encrypt(text, offsets=(0, 0, 0)):
+    # Letter by letter with the string permutations, as in the original model
+    offsets = list(offsets)
+    inverses = [EnigmaRotor(p).get_inverse_permutation() for p in ROTOR_PERMUTATIONS]
+    result = []
+    for char in text:
+        if char.upper() not in ALPHABET:
+            result.append(char)
+            continue
+        for r in (2, 1, 0):
+            offsets[r] = (offsets[r] + 1) % 26
+            if offsets[r]:
+                break
+        index = ALPHABET.index(char.upper())
+        for r in (2, 1, 0):
+            index = apply_permutation(index, ROTOR_PERMUTATIONS[r], offsets[r])
+        index = apply_permutation(index, REFLECTOR_PERMUTATION, 0)
+        for r in (0, 1, 2):
+            index = apply_permutation(index, inverses[r], offsets[r])
+        result.append(ALPHABET[index])
+    return "".join(result)
+
+
+def random_text(rng, n):
+    return "".join(rng.choice(ALPHABET + ALPHABET.lower() + " .,") for _ in range(n))
+
+
+def set_rotors(model, offsets):
+    for index, offset in enumerate(offsets):
+        for _ in range(offset):
+            model.rotor_clicked(index)
+
+
+def test_encrypt_matches_letter_by_letter():
+    rng = random.Random(0)
+    for _ in range(20):
+        offsets = tuple(rng.randrange(26) for _ in range(3))
+        text = random_text(rng, 2000)
+        bulk = EnigmaModel()
+        set_rotors(bulk, offsets)
+        single = EnigmaModel()
+        set_rotors(single, offsets)
+
+        expected = []
+        for char in text:
+            if char.upper() in ALPHABET:
+                single._advance_rotors()
+                expected.append(single._encrypt_letter(char))
+            else:
+                expected.append(char)
+        assert bulk.encrypt(text) == "".join(expected) == reference_encrypt(text, offsets)
+        assert [bulk.get_rotor_letter(i) for i in range(3)] == \
+            [single.get_rotor_letter(i) for i in range(3)]
+
+
+def test_encrypt_iter_continues_where_encrypt_stopped():
+    text = random_text(random.Random(1), 1000)
+    model = EnigmaModel()
+    first = model.encrypt(text[:400])
+    rest = "".join(model.encrypt_iter(iter(text[400:])))
+    assert first + rest == EnigmaModel().encrypt(text)
+
+
+def test_encrypting_twice_gives_the_message():
+    message = "ATTACK AT DAWN, HOLD THE BRIDGE. " * 30
+    encrypted = EnigmaModel().encrypt(message)
+    assert EnigmaModel().encrypt(encrypted) == message
+    # The reflector never sends a letter to itself
+    assert all(a != b for a, b in zip(message, encrypted) if a in ALPHABET)
+
+
+def test_key_pressed_lights_the_encrypted_letter():
+    model = EnigmaModel()
+    expected = EnigmaModel().encrypt("HELLO")
+    for letter, lamp in zip("HELLO", expected):
+        model.key_pressed(letter)
+        assert model.is_key_down(letter)
+        assert [c for c in ALPHABET if model.is_lamp_on(c)] == [lamp]
+        model.key_released(letter)
+        assert not model.is_lamp_on(lamp)